@@ -0,0 +1,169 @@
+import asyncio
+from typing import Awaitable, Callable, Optional, Type, TypeVar
+import aiohttp
+from config.env_config import BULK_BATCH_SIZE, BULK_CONCURRENCY
+from utils.handlers.error_handler import handle_errors
+from utils.handlers.api_handler import handle_api_response
+from utils.api_cache import api_cache
+from utils.change_feed import change_feed
+from utils.world_state import world_state
+from config.logger_config import logger
+
+T = TypeVar("T")
+
+# Résultat de la détection des endpoints bulk, par URL d'endpoint
+_bulk_support: dict[str, bool] = {}
+
+
+class BulkUpsertError(Exception):
+    """
+    Échec d'une partie des écritures d'un `bulk_upsert`. `saved` contient, dans l'ordre des
+    entités envoyées, les entités enregistrées et None pour celles en échec ; `error` est
+    la première erreur rencontrée.
+    """
+    def __init__(self, saved: list, error: BaseException):
+        super().__init__(str(error))
+        self.saved = saved
+        self.error = error
+
+
+async def supports_bulk(session: aiohttp.ClientSession, endpoint_url: str) -> bool:
+    """
+    Indique si l'API expose l'endpoint groupé `endpoint_url` (POST/PUT annoncé via l'en-tête Allow d'un OPTIONS).
+    Le résultat est mémorisé pour la durée du processus.
+    """
+    if endpoint_url in _bulk_support:
+        return _bulk_support[endpoint_url]
+    try:
+        async with session.options(endpoint_url) as response:
+            allow = {method.strip().upper() for method in response.headers.get("Allow", "").split(",")}
+            supported = response.status in {200, 204} and bool(allow & {"POST", "PUT"})
+    except aiohttp.ClientError as e:
+        # Ne pas mémoriser une erreur réseau transitoire
+        logger.debug(f"Détection de l'endpoint bulk impossible pour {endpoint_url}: {e}")
+        return False
+
+    _bulk_support[endpoint_url] = supported
+    logger.debug(f"Endpoint bulk {'disponible' if supported else 'indisponible'}: {endpoint_url}")
+    return supported
+
+
+async def post_bulk(session: aiohttp.ClientSession, base_url: str, entity_type: Type[T], batch: list[T]) -> list[T]:
+    """
+    Envoie un lot d'entités à créer ou mettre à jour en une seule requête POST.
+    """
+    @handle_api_response(response_type=list[entity_type])
+    async def send():
+        return await session.post(f"{base_url}/bulk", json=[entity.to_dict() for entity in batch])
+
+    saved = await send()
+    if len(saved) != len(batch):
+        raise Exception(f"Réponse bulk incohérente pour {base_url}: {len(saved)} entités reçues pour {len(batch)} envoyées")
+    return saved
+
+
+@handle_errors
+async def bulk_upsert(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    entity_type: Type[T],
+    entities: list[T],
+    create_func: Callable[[aiohttp.ClientSession, T], Awaitable[T]],
+    update_func: Callable[[aiohttp.ClientSession, T, list[str]], Awaitable[T]],
+    changes: Optional[list[list[str]]] = None,
+    batch_size: int = BULK_BATCH_SIZE,
+    concurrency: int = BULK_CONCURRENCY,
+) -> list[T]:
+    """
+    Crée (sans id) ou met à jour (avec id) une liste d'entités.
+
+    Utilise l'endpoint bulk par lots de `batch_size` si l'API l'annonce, sinon des
+    appels unitaires `create_func` / `update_func` limités à `concurrency` en parallèle.
+    Retourne les entités enregistrées (avec leur id) dans l'ordre de `entities`, publiées dans `change_feed`
+    et reportées dans `world_state` ; les lectures concernées de `api_cache` sont invalidées.
+    Si une écriture échoue, les autres sont menées à terme et `BulkUpsertError` est levée
+    avec les entités enregistrées, pour que l'appelant puisse les prendre en compte.
+    """
+    if not entities:
+        return []
+    changes = changes or [[] for _ in entities]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    if await supports_bulk(session, f"{base_url}/bulk"):
+        async def send_batch(start: int) -> list[T]:
+            async with semaphore:
+                return await post_bulk(session, base_url, entity_type, entities[start:start + batch_size])
+
+        starts = range(0, len(entities), batch_size)
+        batches = await asyncio.gather(*(send_batch(start) for start in starts), return_exceptions=True)
+        saved = []
+        for start, batch in zip(starts, batches):
+            saved.extend([None] * len(entities[start:start + batch_size]) if isinstance(batch, BaseException) else batch)
+        for sent, entity, entity_changes in zip(entities, saved, changes):
+            if entity is None:
+                continue
+            if entity_changes:
+                logger.info(f"{entity_type.__name__} (ID: {entity.id}) mis à jour avec les changements suivants: {', '.join(entity_changes)}")
+            change_feed.publish(entity_type.__name__.lower(), "updated" if sent.id else "created", entity, entity_changes)
+            world_state.put(entity_type.__name__.lower(), entity)
+            api_cache.invalidate(entity_type.__name__.lower(), entity)
+        logger.debug(f"{sum(entity is not None for entity in saved)} {entity_type.__name__} enregistrés via {len(batches)} requête(s) bulk")
+        return raise_partial_failure(saved, batches)
+
+    async def upsert_one(entity: T, entity_changes: list[str]) -> T:
+        async with semaphore:
+            if entity.id:
+                return await update_func(session, entity, entity_changes)
+            return await create_func(session, entity)
+
+    results = await asyncio.gather(*(upsert_one(entity, c) for entity, c in zip(entities, changes)), return_exceptions=True)
+    return raise_partial_failure([None if isinstance(result, BaseException) else result for result in results], results)
+
+
+def raise_partial_failure(saved: list, results: list) -> list:
+    """
+    Retourne `saved`, ou lève `BulkUpsertError` si l'un des `results` est une erreur.
+    """
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise BulkUpsertError(saved, errors[0]) from errors[0]
+    return saved
+
+
+@handle_errors
+async def bulk_deactivate(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    ids: list[int],
+    deactivate_func: Callable[[aiohttp.ClientSession, int], Awaitable[None]],
+    concurrency: int = BULK_CONCURRENCY,
+) -> list[Optional[Exception]]:
+    """
+    Désactive une liste d'entités par leur id.
+
+    Utilise `PUT {base_url}/bulk/deactivate` en une seule requête si l'API l'annonce,
+    sinon des appels unitaires `deactivate_func` limités à `concurrency` en parallèle.
+    Retourne, pour chaque id, l'exception rencontrée ou None en cas de succès.
+    """
+    if not ids:
+        return []
+
+    endpoint_url = f"{base_url}/bulk/deactivate"
+    if await supports_bulk(session, endpoint_url):
+        @handle_api_response(response_type=None, idempotent=True)
+        async def send():
+            return await session.put(endpoint_url, json=ids)
+
+        try:
+            await send()
+            return [None for _ in ids]
+        except Exception as e:
+            return [e for _ in ids]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def deactivate_one(entity_id: int) -> None:
+        async with semaphore:
+            await deactivate_func(session, entity_id)
+
+    return list(await asyncio.gather(*(deactivate_one(entity_id) for entity_id in ids), return_exceptions=True))
@@ -3,18 +3,25 @@ from datetime import datetime
 from typing import Optional
 from config.env_config import MATCH_API_URL
 from models.match import Match, MatchStatus
+from api.bulk_api import bulk_deactivate, bulk_upsert
 from utils.handlers.error_handler import handle_errors
 from utils.handlers.api_handler import handle_api_response
+from utils.handlers.cache_handler import cached_response
+from utils.handlers.change_handler import publish_changes
+from utils.api_cache import api_cache
+from utils.world_state import world_state
 from config.logger_config import logger
 
 @handle_errors
-@handle_api_response(response_type=Match)
+@cached_response("match")
+@handle_api_response(response_type=Match, idempotent=True)
 async def get_match_by_league_and_code(session: aiohttp.ClientSession, league_code: str, match_code: str) -> Optional[Match]:
     return await session.get(f"{MATCH_API_URL}/{league_code}/{match_code}")
 
 
 @handle_errors
-@handle_api_response(response_type=list[Match])
+@cached_response("match")
+@handle_api_response(response_type=list[Match], idempotent=True)
 async def get_active_matches_by_pool_id(session: aiohttp.ClientSession, pool_id: int) -> Optional[list[Match]]:
     """
     Récupère les matchs actifs pour une pool donnée.
@@ -23,7 +30,8 @@ async def get_active_matches_by_pool_id(session: aiohttp.ClientSession, pool_id:
 
 
 @handle_errors
-@handle_api_response(response_type=list[Match])
+@cached_response("match")
+@handle_api_response(response_type=list[Match], idempotent=True)
 async def get_matches_by_pool(session: aiohttp.ClientSession, pool_id: int) -> list[Match]:
     """
     Récupère tous les matchs d'une poule via une seule requête.
@@ -32,6 +40,7 @@ async def get_matches_by_pool(session: aiohttp.ClientSession, pool_id: int) -> l
 
 
 @handle_errors
+@publish_changes("match", "created")
 @handle_api_response(response_type=Match)
 async def create_match(session: aiohttp.ClientSession, match: Match) -> Match:
     """
@@ -44,7 +53,8 @@ async def create_match(session: aiohttp.ClientSession, match: Match) -> Match:
 
 
 @handle_errors
-@handle_api_response(response_type=Match)
+@publish_changes("match", "updated")
+@handle_api_response(response_type=Match, idempotent=True)
 async def update_match(session: aiohttp.ClientSession, match: Match, changes: list[str] = []) -> Match:
     """
     Envoie une requête PUT pour mettre à jour un match existant.
@@ -57,17 +67,17 @@ async def update_match(session: aiohttp.ClientSession, match: Match, changes: li
 
 
 @handle_errors
-@handle_api_response(response_type=None)
+@handle_api_response(response_type=None, idempotent=True)
 async def deactivate_match(session: aiohttp.ClientSession, match_id: int) -> None:
     """
     Désactive un match en envoyant une requête PUT à une route dédiée.
     """
-    await session.put(f"{MATCH_API_URL}/{match_id}/deactivate")
-    logger.info(f"Match {match_id} désactivé avec succès.")
+    logger.debug(f"Requête envoyée pour désactiver le match {match_id}.")
+    return await session.put(f"{MATCH_API_URL}/{match_id}/deactivate")
 
 
 @handle_errors
-@handle_api_response(response_type=list[Match])
+@handle_api_response(response_type=list[Match], idempotent=True)
 async def get_started_matches(session: aiohttp.ClientSession, status: MatchStatus, active: bool, current_time: str) -> Optional[list[Match]]:
     """
     Récupère les matchs qui ont commencé via l'API.
@@ -81,7 +91,8 @@ async def get_started_matches(session: aiohttp.ClientSession, status: MatchStatu
 
 
 @handle_errors
-@handle_api_response(response_type=Match)
+@cached_response("match")
+@handle_api_response(response_type=Match, idempotent=True)
 async def get_match_by_pool_teams_date(
     session: aiohttp.ClientSession,
     pool_id: int,
@@ -98,4 +109,23 @@ async def get_match_by_pool_teams_date(
         'team_id_b': team_id_b,
         'match_date': match_date.isoformat()
     }
-    return await session.get(f"{MATCH_API_URL}/search", params=params)
\ No newline at end of file
+    return await session.get(f"{MATCH_API_URL}/search", params=params)
+
+
+async def bulk_upsert_matches(session: aiohttp.ClientSession, matches: list[Match], changes: Optional[list[list[str]]] = None) -> list[Match]:
+    """
+    Crée ou met à jour des matchs par lots (endpoint bulk si disponible, sinon appels unitaires en parallèle).
+    Retourne les matchs enregistrés, avec leur id, dans l'ordre de la liste fournie.
+    """
+    return await bulk_upsert(session, MATCH_API_URL, Match, matches, create_match, update_match, changes)
+
+
+async def bulk_deactivate_matches(session: aiohttp.ClientSession, match_ids: list[int]) -> list[Optional[Exception]]:
+    """
+    Désactive des matchs par lot (endpoint bulk si disponible, sinon appels unitaires en parallèle).
+    Retourne, pour chaque id, l'exception rencontrée ou None en cas de succès.
+    """
+    errors = await bulk_deactivate(session, MATCH_API_URL, match_ids, deactivate_match)
+    world_state.deactivate("match", match_ids, errors)
+    api_cache.invalidate("match")
+    return errors
\ No newline at end of file
@@ -1,13 +1,19 @@
 from typing import Optional
 import aiohttp
 from config.env_config import POOL_API_URL
+from api.bulk_api import bulk_deactivate, bulk_upsert
 from utils.handlers.error_handler import handle_errors
 from utils.handlers.api_handler import handle_api_response
+from utils.handlers.cache_handler import cached_response
+from utils.handlers.change_handler import publish_changes
+from utils.api_cache import api_cache
+from utils.world_state import world_state
 from models.pool import Pool
 from config.logger_config import logger
 
 @handle_errors
-@handle_api_response(response_type=Pool)
+@cached_response("pool")
+@handle_api_response(response_type=Pool, idempotent=True)
 async def get_pool_by_code_league_season(
     session: aiohttp.ClientSession, pool_code: str, league_code: str, season: int
 ) -> Optional[Pool]:
@@ -17,7 +23,8 @@ async def get_pool_by_code_league_season(
     return await session.get(f"{POOL_API_URL}/{pool_code}/{league_code}/{season}")
 
 @handle_errors
-@handle_api_response(response_type=list[Pool])
+@cached_response("pool")
+@handle_api_response(response_type=list[Pool], idempotent=True)
 async def get_pools_by_league_and_season(session: aiohttp.ClientSession, league_code: str, season: int) -> list[Pool]:
     """
     Récupère toutes les pools pour un code de ligue et une saison spécifiques.
@@ -25,6 +32,7 @@ async def get_pools_by_league_and_season(session: aiohttp.ClientSession, league_
     return await session.get(f"{POOL_API_URL}/league/{league_code}/season/{season}")
 
 @handle_errors
+@publish_changes("pool", "created")
 @handle_api_response(response_type=Pool)
 async def create_pool(session: aiohttp.ClientSession, pool: Pool) -> Pool:
     """
@@ -37,7 +45,8 @@ async def create_pool(session: aiohttp.ClientSession, pool: Pool) -> Pool:
 
 
 @handle_errors
-@handle_api_response(response_type=Pool)
+@publish_changes("pool", "updated")
+@handle_api_response(response_type=Pool, idempotent=True)
 async def update_pool(session: aiohttp.ClientSession, pool: Pool, changes: list[str] = []) -> Pool:
     """
     Envoie une requête PUT pour mettre à jour une pool existante.
@@ -51,7 +60,8 @@ async def update_pool(session: aiohttp.ClientSession, pool: Pool, changes: list[
 
 
 @handle_errors
-@handle_api_response(response_type=list[Pool])
+@cached_response("pool")
+@handle_api_response(response_type=list[Pool], idempotent=True)
 async def get_active_pools_by_league_code(session: aiohttp.ClientSession, league_code: str) -> Optional[list[Pool]]:
     """
     Récupère les pools actives pour une ligue donnée.
@@ -60,10 +70,29 @@ async def get_active_pools_by_league_code(session: aiohttp.ClientSession, league
 
 
 @handle_errors
-@handle_api_response(response_type=None)
+@handle_api_response(response_type=None, idempotent=True)
 async def deactivate_pool(session: aiohttp.ClientSession, pool_id: int) -> None:
     """
     Désactive une pool en mettant à jour son statut 'active' à False.
     """
-    await session.put(f"{POOL_API_URL}/{pool_id}/deactivate")
-    logger.info(f"Requête envoyée pour désactiver la pool {pool_id}.")
\ No newline at end of file
+    logger.debug(f"Requête envoyée pour désactiver la pool {pool_id}.")
+    return await session.put(f"{POOL_API_URL}/{pool_id}/deactivate")
+
+
+async def bulk_upsert_pools(session: aiohttp.ClientSession, pools: list[Pool], changes: Optional[list[list[str]]] = None) -> list[Pool]:
+    """
+    Crée ou met à jour des pools par lots (endpoint bulk si disponible, sinon appels unitaires en parallèle).
+    Retourne les pools enregistrées, avec leur id, dans l'ordre de la liste fournie.
+    """
+    return await bulk_upsert(session, POOL_API_URL, Pool, pools, create_pool, update_pool, changes)
+
+
+async def bulk_deactivate_pools(session: aiohttp.ClientSession, pool_ids: list[int]) -> list[Optional[Exception]]:
+    """
+    Désactive des pools par lot (endpoint bulk si disponible, sinon appels unitaires en parallèle).
+    Retourne, pour chaque id, l'exception rencontrée ou None en cas de succès.
+    """
+    errors = await bulk_deactivate(session, POOL_API_URL, pool_ids, deactivate_pool)
+    world_state.deactivate("pool", pool_ids, errors)
+    api_cache.invalidate("pool")
+    return errors
\ No newline at end of file
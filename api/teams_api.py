@@ -1,13 +1,19 @@
 from typing import Optional
 import aiohttp
 from config.env_config import TEAM_API_URL
+from api.bulk_api import bulk_deactivate, bulk_upsert
 from utils.handlers.error_handler import handle_errors
 from utils.handlers.api_handler import handle_api_response
+from utils.handlers.cache_handler import cached_response
+from utils.handlers.change_handler import publish_changes
+from utils.api_cache import api_cache
+from utils.world_state import world_state
 from models.team import Team
 from config.logger_config import logger
 
 @handle_errors
-@handle_api_response(response_type=Team)
+@cached_response("team")
+@handle_api_response(response_type=Team, idempotent=True)
 async def get_team_by_pool_and_name(session: aiohttp.ClientSession, pool_id: int, team_name: str) -> Optional[Team]:
     """
     Vérifie si une équipe existe déjà via l'API en utilisant pool_id et team_name.
@@ -17,6 +23,7 @@ async def get_team_by_pool_and_name(session: aiohttp.ClientSession, pool_id: int
 
 
 @handle_errors
+@publish_changes("team", "created")
 @handle_api_response(response_type=Team)
 async def create_team(session: aiohttp.ClientSession, team: Team) -> Team:
     """
@@ -29,7 +36,8 @@ async def create_team(session: aiohttp.ClientSession, team: Team) -> Team:
 
 
 @handle_errors
-@handle_api_response(response_type=Team)
+@publish_changes("team", "updated")
+@handle_api_response(response_type=Team, idempotent=True)
 async def update_team(session: aiohttp.ClientSession, team: Team, changes: list[str] = []) -> Team:
     """
     Envoie une requête PUT pour mettre à jour une équipe existante.
@@ -44,7 +52,8 @@ async def update_team(session: aiohttp.ClientSession, team: Team, changes: list[
 
 
 @handle_errors
-@handle_api_response(response_type=list[Team])
+@cached_response("team")
+@handle_api_response(response_type=list[Team], idempotent=True)
 async def get_teams_by_pool(session: aiohttp.ClientSession, pool_id: int) -> list[Team]:
     """
     Récupère toutes les équipes associées à une poule spécifique via une seule requête.
@@ -53,7 +62,8 @@ async def get_teams_by_pool(session: aiohttp.ClientSession, pool_id: int) -> lis
 
 
 @handle_errors
-@handle_api_response(response_type=list[Team])
+@cached_response("team")
+@handle_api_response(response_type=list[Team], idempotent=True)
 async def get_active_teams_by_pool_id(session: aiohttp.ClientSession, pool_id: int) -> Optional[list[Team]]:
     """
     Récupère les équipes actives pour une pool donnée.
@@ -62,10 +72,29 @@ async def get_active_teams_by_pool_id(session: aiohttp.ClientSession, pool_id: i
 
 
 @handle_errors
-@handle_api_response(response_type=None)
+@handle_api_response(response_type=None, idempotent=True)
 async def deactivate_team(session: aiohttp.ClientSession, team_id: int) -> None:
     """
     Désactive une équipe en mettant à jour son statut 'active' à False.
     """
-    await session.put(f"{TEAM_API_URL}/{team_id}/deactivate")
-    logger.info(f"Équipe {team_id} désactivée avec succès.")
\ No newline at end of file
+    logger.debug(f"Requête envoyée pour désactiver l'équipe {team_id}.")
+    return await session.put(f"{TEAM_API_URL}/{team_id}/deactivate")
+
+
+async def bulk_upsert_teams(session: aiohttp.ClientSession, teams: list[Team], changes: Optional[list[list[str]]] = None) -> list[Team]:
+    """
+    Crée ou met à jour des équipes par lots (endpoint bulk si disponible, sinon appels unitaires en parallèle).
+    Retourne les équipes enregistrées, avec leur id, dans l'ordre de la liste fournie.
+    """
+    return await bulk_upsert(session, TEAM_API_URL, Team, teams, create_team, update_team, changes)
+
+
+async def bulk_deactivate_teams(session: aiohttp.ClientSession, team_ids: list[int]) -> list[Optional[Exception]]:
+    """
+    Désactive des équipes par lot (endpoint bulk si disponible, sinon appels unitaires en parallèle).
+    Retourne, pour chaque id, l'exception rencontrée ou None en cas de succès.
+    """
+    errors = await bulk_deactivate(session, TEAM_API_URL, team_ids, deactivate_team)
+    world_state.deactivate("team", team_ids, errors)
+    api_cache.invalidate("team")
+    return errors
\ No newline at end of file
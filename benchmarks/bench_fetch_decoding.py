@@ -0,0 +1,68 @@
+"""
+Compare le décodage de `Scraper.fetch` avant (chardet sur tout le corps + html.unescape)
+et après (`utils.encoding.decode_body`) sur les pages enregistrées.
+
+Usage: python -m benchmarks.bench_fetch_decoding [fichier] [répétitions]
+
+Le fichier contient des lignes "Contenu brut de l'URL <url> : b'...'" (format de temp.txt).
+"""
+import ast
+import html
+import re
+import sys
+import time
+import chardet
+from utils import encoding
+from utils.encoding import decode_body
+
+SAVED_PAGE = re.compile(r"^Contenu brut de l'URL (\S+) : (b['\"].*['\"])\s*$")
+
+
+def load_pages(path: str) -> list[tuple[str, bytes]]:
+    pages = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            match = SAVED_PAGE.match(line)
+            if match:
+                pages.append((match.group(1), ast.literal_eval(match.group(2))))
+    return pages
+
+
+def old_decode(raw: bytes) -> str:
+    detected_encoding = chardet.detect(raw)['encoding']
+    decoded_content = raw.decode(detected_encoding or 'utf-8', errors='replace')
+    return html.unescape(decoded_content)
+
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(path: str = 'temp.txt', repeat: int = 5) -> None:
+    pages = load_pages(path)
+    print(f"{len(pages)} pages chargées depuis {path}, {repeat} répétitions")
+    print(f"{'page':<50} {'Ko':>6} {'avant ms':>9} {'froid ms':>9} {'chaud ms':>9}  encodage")
+
+    totals = [0.0, 0.0, 0.0]
+    for url, raw in pages:
+        def cold():
+            encoding.host_encodings.clear()
+            return decode_body(url, raw)
+
+        old_ms = timed(lambda: old_decode(raw), repeat)
+        cold_ms = timed(cold, repeat)
+        warm_ms = timed(lambda: decode_body(url, raw), repeat)
+        for i, value in enumerate((old_ms, cold_ms, warm_ms)):
+            totals[i] += value
+
+        resolved = encoding.resolve_encoding(url, raw)
+        print(f"{url[-50:]:<50} {len(raw) // 1024:>6} {old_ms:>9.2f} {cold_ms:>9.2f} {warm_ms:>9.2f}  {resolved}")
+
+    print(f"{'total':<50} {'':>6} {totals[0]:>9.2f} {totals[1]:>9.2f} {totals[2]:>9.2f}")
+
+
+if __name__ == '__main__':
+    main(*(sys.argv[1:2] or ['temp.txt']), *([int(sys.argv[2])] if len(sys.argv) > 2 else []))
@@ -7,6 +7,61 @@ MATCH_API_URL = os.getenv('MATCH_API_URL')
 POOL_API_URL = os.getenv('POOL_API_URL')
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')  # Par défaut : INFO
 PYTHON_DATASOURCE_URL = os.getenv('PYTHON_DATASOURCE_URL')
+HTTP_CACHE_PATH = os.getenv('HTTP_CACHE_PATH', 'cache/http_cache.json')
+CSV_FINGERPRINTS_PATH = os.getenv('CSV_FINGERPRINTS_PATH', 'cache/csv_fingerprints.json')
+XML_FINGERPRINTS_PATH = os.getenv('XML_FINGERPRINTS_PATH', 'cache/xml_fingerprints.json')
+TEAM_NAME_MATCHES_PATH = os.getenv('TEAM_NAME_MATCHES_PATH', 'cache/team_name_matches.json')
+TEAM_FUZZY_THRESHOLD = float(os.getenv('TEAM_FUZZY_THRESHOLD', '0.6'))  # Score minimal (Dice sur trigrammes)
+HTML_PARSER = os.getenv('HTML_PARSER', 'auto')  # 'auto' (lxml si installé), 'lxml' ou 'html.parser'
+HTML_STRAINER = os.getenv('HTML_STRAINER', 'true').lower() == 'true'  # Ne construire que les éléments utiles
+HTML_PARSE_METRICS = os.getenv('HTML_PARSE_METRICS', 'false').lower() == 'true'  # Temps et pic mémoire par page
+PARSING_EXECUTOR = os.getenv('PARSING_EXECUTOR', 'process')  # 'process' ou 'inline' (parsing sur la boucle, pour le débogage)
+PARSING_WORKERS = int(os.getenv('PARSING_WORKERS', str(os.cpu_count() or 1)))  # Processus de parsing
+HTTP_LIMIT = int(os.getenv('HTTP_LIMIT', '100'))  # Connexions simultanées de la session partagée
+HTTP_LIMIT_PER_HOST = int(os.getenv('HTTP_LIMIT_PER_HOST', '20'))  # Connexions simultanées par hôte
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '75'))  # Conservation des connexions inactives (s), au-delà d'un tick
+HTTP_DNS_TTL = int(os.getenv('HTTP_DNS_TTL', '600'))  # Durée du cache DNS (s)
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '10'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+HTTP_TOTAL_TIMEOUT = float(os.getenv('HTTP_TOTAL_TIMEOUT', '60'))
+RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', '3'))  # Tentatives par appel sortant
+RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', '1'))  # Délai avant le 2e essai (s), doublé ensuite
+RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '30'))  # Délai maximal entre deux essais (s), Retry-After compris
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))  # Échecs consécutifs avant ouverture du circuit d'un hôte
+CIRCUIT_COOLDOWN = float(os.getenv('CIRCUIT_COOLDOWN', '60'))  # Durée d'ouverture du circuit (s) avant un essai
+POOL_SCHEDULE_PATH = os.getenv('POOL_SCHEDULE_PATH', 'cache/pool_schedule.json')
+WORLD_STATE_PATH = os.getenv('WORLD_STATE_PATH', 'cache/world_state.sqlite')  # Instantané de l'état résident
+WORLD_STATE_RECONCILE_INTERVAL = int(os.getenv('WORLD_STATE_RECONCILE_INTERVAL', '3600'))  # Rechargement depuis l'API
+SCRAPER_INTERVALS = os.getenv('SCRAPER_INTERVALS', 'pro=30,national=60,regional=120')  # Intervalle (s) du job de chaque scraper
+JOB_MISFIRE_GRACE = int(os.getenv('JOB_MISFIRE_GRACE', '30'))  # Retard (s) au-delà duquel un déclenchement est compté comme manqué
+POOL_DISCOVERY_INTERVAL = int(os.getenv('POOL_DISCOVERY_INTERVAL', '3600'))  # Découverte des pools (pages FFVB, pools LNV) (s)
+POOL_FORGET_AFTER = int(os.getenv('POOL_FORGET_AFTER', '86400'))  # Pool retirée du planning si non redécouverte depuis (s)
+POLL_LIVE_INTERVAL = int(os.getenv('POLL_LIVE_INTERVAL', '60'))  # Pool avec un match en cours (s)
+POLL_RECENT_INTERVAL = int(os.getenv('POLL_RECENT_INTERVAL', '300'))  # Pool avec un match dans les dernières 24 h (s)
+POLL_IDLE_INTERVAL = int(os.getenv('POLL_IDLE_INTERVAL', '10800'))  # Pool sans match proche (s)
+POLL_FINISHED_INTERVAL = int(os.getenv('POLL_FINISHED_INTERVAL', '86400'))  # Pool sans match à venir (saison terminée) (s)
+MATCH_WINDOW_BEFORE = int(os.getenv('MATCH_WINDOW_BEFORE', '1800'))  # Début de la fenêtre de match avant l'heure prévue (s)
+MATCH_WINDOW_AFTER = int(os.getenv('MATCH_WINDOW_AFTER', '10800'))  # Fin de la fenêtre de match après l'heure prévue (s)
+LIVE_SCORE_ENABLED = os.getenv('LIVE_SCORE_ENABLED', 'true').lower() == 'true'  # Scores en direct des matchs pro (SignalR)
+SIGNALR_URL = os.getenv('SIGNALR_URL', 'https://dataprojectservicesignalr.azurewebsites.net/signalr')
+SIGNALR_HUB = os.getenv('SIGNALR_HUB', 'signalrlivehubfederations')
+LIVE_SCORE_FEDERATION = os.getenv('LIVE_SCORE_FEDERATION', 'lnv')
+LIVE_SCORE_REFRESH = int(os.getenv('LIVE_SCORE_REFRESH', '60'))  # Mise à jour des matchs suivis en direct (s)
+LIVE_SCORE_DEBOUNCE = float(os.getenv('LIVE_SCORE_DEBOUNCE', '3'))  # Regroupement des points successifs avant écriture (s)
+LIVE_SCORE_READ_TIMEOUT = float(os.getenv('LIVE_SCORE_READ_TIMEOUT', '60'))  # Flux silencieux considéré coupé (s)
+PUSH_FEED_ENABLED = os.getenv('PUSH_FEED_ENABLED', 'false').lower() == 'true'  # Flux SSE/WebSocket des changements
+PUSH_FEED_HOST = os.getenv('PUSH_FEED_HOST', '127.0.0.1')  # 0.0.0.0 dans un conteneur, pour l'exposer via ses ports
+PUSH_FEED_PORT = int(os.getenv('PUSH_FEED_PORT', '8090'))
+PUSH_REPLAY_SIZE = int(os.getenv('PUSH_REPLAY_SIZE', '1000'))  # Événements conservés pour la reprise (Last-Event-ID)
+PUSH_CLIENT_QUEUE = int(os.getenv('PUSH_CLIENT_QUEUE', '1000'))  # Événements en attente par client avant déconnexion
+OUTBOX_READ_LIMIT = int(os.getenv('OUTBOX_READ_LIMIT', '500'))  # Changements retournés par lecture de l'outbox
+API_CACHE_TTL = float(os.getenv('API_CACHE_TTL', '300'))  # Durée de vie max d'une lecture API mise en cache pendant un job
+# Limites par hôte au format "requêtes par seconde/requêtes simultanées" (0 requête/s = pas de limite de débit)
+RATE_LIMIT_DEFAULT = os.getenv('RATE_LIMIT_DEFAULT', '10/10')
+RATE_LIMIT_API = os.getenv('RATE_LIMIT_API', '50/20')  # Hôtes de TEAM_API_URL, MATCH_API_URL et POOL_API_URL
+RATE_LIMITS = os.getenv('RATE_LIMITS', 'ffvb.org=5/5,ffvbbeach.org=5/10,lnv.fr=2/3,dataproject.com=2/3')  # Par suffixe d'hôte
+BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', '100'))  # Entités par requête bulk
+BULK_CONCURRENCY = int(os.getenv('BULK_CONCURRENCY', '10'))  # Appels unitaires simultanés sans endpoint bulk
 
 # Debugging pour vérifier les valeurs chargées
 if __name__ == "__main__":
@@ -17,5 +72,59 @@ if __name__ == "__main__":
         "POOL_API_URL",
         "LOG_LEVEL",
         "PYTHON_DATASOURCE_URL",
+        "HTTP_CACHE_PATH",
+        "CSV_FINGERPRINTS_PATH",
+        "XML_FINGERPRINTS_PATH",
+        "TEAM_NAME_MATCHES_PATH",
+        "TEAM_FUZZY_THRESHOLD",
+        "HTML_PARSER",
+        "HTML_STRAINER",
+        "HTML_PARSE_METRICS",
+        "PARSING_EXECUTOR",
+        "PARSING_WORKERS",
+        "HTTP_LIMIT",
+        "HTTP_LIMIT_PER_HOST",
+        "HTTP_KEEPALIVE_TIMEOUT",
+        "HTTP_DNS_TTL",
+        "HTTP_CONNECT_TIMEOUT",
+        "HTTP_READ_TIMEOUT",
+        "HTTP_TOTAL_TIMEOUT",
+        "RETRY_MAX_ATTEMPTS",
+        "RETRY_BASE_DELAY",
+        "RETRY_MAX_DELAY",
+        "CIRCUIT_FAILURE_THRESHOLD",
+        "CIRCUIT_COOLDOWN",
+        "POOL_SCHEDULE_PATH",
+        "WORLD_STATE_PATH",
+        "WORLD_STATE_RECONCILE_INTERVAL",
+        "SCRAPER_INTERVALS",
+        "JOB_MISFIRE_GRACE",
+        "POOL_DISCOVERY_INTERVAL",
+        "POOL_FORGET_AFTER",
+        "POLL_LIVE_INTERVAL",
+        "POLL_RECENT_INTERVAL",
+        "POLL_IDLE_INTERVAL",
+        "POLL_FINISHED_INTERVAL",
+        "MATCH_WINDOW_BEFORE",
+        "MATCH_WINDOW_AFTER",
+        "LIVE_SCORE_ENABLED",
+        "SIGNALR_URL",
+        "SIGNALR_HUB",
+        "LIVE_SCORE_FEDERATION",
+        "LIVE_SCORE_REFRESH",
+        "LIVE_SCORE_DEBOUNCE",
+        "LIVE_SCORE_READ_TIMEOUT",
+        "PUSH_FEED_ENABLED",
+        "PUSH_FEED_HOST",
+        "PUSH_FEED_PORT",
+        "PUSH_REPLAY_SIZE",
+        "PUSH_CLIENT_QUEUE",
+        "OUTBOX_READ_LIMIT",
+        "API_CACHE_TTL",
+        "RATE_LIMIT_DEFAULT",
+        "RATE_LIMIT_API",
+        "RATE_LIMITS",
+        "BULK_BATCH_SIZE",
+        "BULK_CONCURRENCY",
     ]:
         print(f"{key}: {os.getenv(key)}")
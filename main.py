@@ -1,71 +1,172 @@
 import asyncio
-import aiohttp
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime, timezone
 from db import create_tables
 from models.accumulating_handler import AccumulatingHandler
 from scrapers.scraper_factory import ScraperFactory
 from services.execution_logs_service import log_execution
+from services.live_score_service import live_score_service
+from services.push_server import start_push_server, stop_push_server
 from session_manager import get_db_session
+from utils.api_cache import api_cache
+from utils.change_outbox import change_outbox
+from utils.csv_fingerprints import csv_fingerprints
+from utils.fingerprint_store import xml_fingerprints
+from utils.http_cache import http_cache
+from utils.http_client import close_session, get_session, report_connection_stats, start_connection_stats, warm_up
+from utils.job_monitor import JOB_EVENTS, has_lost_runs, job_intervals, on_job_event, report_job_stats
+from utils.parsing_executor import report_parsing_stats, shutdown_parsing_executor
+from utils.pool_scheduler import pool_scheduler
+from utils.rate_limiter import rate_limiter
+from utils.team_utils import team_name_matches
+from utils.world_state import world_state
+from utils.utils import report_unknown_divisions
+from config.env_config import JOB_MISFIRE_GRACE, LIVE_SCORE_ENABLED, LIVE_SCORE_REFRESH, PUSH_FEED_ENABLED
 from config.logger_config import logger
 
-lock = asyncio.Lock()
 accumulating_handler = AccumulatingHandler()
 logger.addHandler(accumulating_handler)
 
-async def main():
+def save_changes():
     """
-    Fonction principale exécutant le scraping pour les pools nationales, régionales, et pro.
+    Écrit dans leur propre transaction les changements en attente de l'exécution courante.
+    """
+    with get_db_session() as db_session:
+        change_outbox.save(db_session)
+
+live_score_service.save_changes = save_changes
+
+async def main(scraper_type: str):
+    """
+    Job de scraping d'un type de pools (pro, nationales ou régionales).
+
+    La découverte des pools n'a lieu que toutes les POOL_DISCOVERY_INTERVAL secondes ;
+    à chaque exécution, seules les pools du scraper arrivées à échéance dans
+    `pool_scheduler` sont traitées. Une exécution sans travail n'est pas journalisée,
+    sauf si des déclenchements du job ont été ignorés ou manqués.
     """
     start_time = datetime.now(timezone.utc)
+    # Logs propres au job : les jobs des différents scrapers s'exécutent en parallèle
+    accumulating_handler.start_job()
+    change_outbox.start_run()
+    api_cache.start_run()
+    start_connection_stats()
+    discovery_due = pool_scheduler.discovery_due(scraper_type)
+    if not discovery_due and not pool_scheduler.due_pools(scraper_type) and not has_lost_runs(scraper_type):
+        return
+    report_job_stats(scraper_type)
+
     with get_db_session() as db_session:
-        async with lock:  
-            try:
-                logger.debug("Début du scraping...")
-                create_tables()  # Crée les tables dans la base si elles n'existent pas
-
-                async with aiohttp.ClientSession() as session:
-                    scraper_types = ['pro', 'national', 'regional']
-                    tasks = []
-
-                    for scraper_type in scraper_types:
-                        scraper = ScraperFactory.create_scraper(scraper_type, session)
-                        tasks.append(scraper.scrape())
-
-                    await asyncio.gather(*tasks)
-                
-                # Capturer l'heure de fin et calculer la durée de l'exécution
-                end_time = datetime.now(timezone.utc)
-                duration = int((end_time - start_time).total_seconds())  # Calculer la durée en secondes
-                
-                # Enregistrer un log de succès dans la base de données
-                log_execution(db_session, start_time, duration, "Success", accumulating_handler.get_logs())
-                
-                logger.debug(f"Scraping terminé. Durée de l'exécution: {duration} secondes.")
+        try:
+            logger.debug(f"Début du scraping {scraper_type}...")
+            create_tables()  # Crée les tables dans la base si elles n'existent pas
+
+            # Session partagée entre les exécutions, connexions préchauffées avant chaque tick
+            session = await get_session()
+            await warm_up(session, ScraperFactory.create_scraper(scraper_type, session).warmup_urls)
+
+            if discovery_due:
+                await ScraperFactory.create_scraper(scraper_type, session).scrape()
+                pool_scheduler.discovery_done(scraper_type)
+                report_unknown_divisions()
+
+            async def process_pool(pool_id: int, entry: dict) -> None:
+                await ScraperFactory.create_scraper(scraper_type, session).process_pool(pool_id, entry['params'])
+
+            await pool_scheduler.run_due(scraper_type, process_pool)
+
+            report_parsing_stats()
+            rate_limiter.report()
+            api_cache.report()
+            report_connection_stats()
+            
+            # Capturer l'heure de fin et calculer la durée de l'exécution
+            end_time = datetime.now(timezone.utc)
+            duration = int((end_time - start_time).total_seconds())  # Calculer la durée en secondes
             
-            except Exception as e:
-                logger.error(f"Erreur lors du scraping: {e}")
-                # Enregistrer un log d'échec dans la base de données
-                log_execution(db_session, start_time, 0, "Failed", accumulating_handler.get_logs())
+            # Enregistrer un log de succès dans la base de données
+            log_execution(db_session, start_time, duration, "Success", accumulating_handler.get_logs())
             
-            finally:
-                accumulating_handler.clear_logs()
-                #await log_started_matches()
+            logger.debug(f"Scraping {scraper_type} terminé. Durée de l'exécution: {duration} secondes.")
+        
+        except Exception as e:
+            logger.error(f"Erreur lors du scraping {scraper_type}: {e}")
+            # Enregistrer un log d'échec dans la base de données
+            log_execution(db_session, start_time, 0, "Failed", accumulating_handler.get_logs())
+        
+        finally:
+            # Changements des entités, y compris ceux enregistrés avant un échec
+            change_outbox.save(db_session)
+            http_cache.save()
+            csv_fingerprints.save()
+            xml_fingerprints.save()
+            team_name_matches.save()
+            pool_scheduler.save()
+            await world_state.save()
+            accumulating_handler.clear_logs()
+            #await log_started_matches()
+
+async def refresh_live_scores():
+    """
+    Job de suivi des scores en direct. Ses logs sont enregistrés dans un log d'exécution
+    lorsqu'il en a produit ; ceux de la connexion au hub, en tâche de fond, ne sont pas accumulés.
+    """
+    start_time = datetime.now(timezone.utc)
+    accumulating_handler.start_job()
+    status = "Success"
+    try:
+        await live_score_service.refresh()
+    except Exception as e:
+        logger.error(f"Erreur lors du suivi des scores en direct: {e}")
+        status = "Failed"
+    logs = accumulating_handler.get_logs()
+    if logs:
+        duration = int((datetime.now(timezone.utc) - start_time).total_seconds())
+        with get_db_session() as db_session:
+            log_execution(db_session, start_time, duration, status, logs)
+    accumulating_handler.clear_logs()
 
 def schedule_scraper():
     """
-    Planifie l'exécution du scraping toutes les 10 minutes à l'aide d'APScheduler.
+    Planifie un job APScheduler par scraper, à l'intervalle défini dans SCRAPER_INTERVALS.
+
+    Chaque job n'a qu'une instance à la fois (`max_instances=1`) : un déclenchement pendant
+    une exécution en cours est ignoré et compté, les déclenchements en retard sont regroupés
+    (`coalesce`), et ceux manqués au-delà de JOB_MISFIRE_GRACE secondes sont comptés.
+    Ces compteurs et le retard de démarrage figurent dans le log d'exécution du job.
+
+    Le job `live_scores` met à jour les matchs pro suivis en direct (`live_score_service`).
     """
     scheduler = AsyncIOScheduler()
-    scheduler.add_job(main, 'interval', minutes=1, next_run_time=datetime.now(timezone.utc))
+    scheduler.add_listener(on_job_event, JOB_EVENTS)
+    for scraper_type, interval in job_intervals.items():
+        scheduler.add_job(
+            main, 'interval', args=[scraper_type], id=scraper_type, seconds=interval,
+            max_instances=1, coalesce=True, misfire_grace_time=JOB_MISFIRE_GRACE,
+            next_run_time=datetime.now(timezone.utc),
+        )
+    if LIVE_SCORE_ENABLED:
+        scheduler.add_job(
+            refresh_live_scores, 'interval', id='live_scores', seconds=LIVE_SCORE_REFRESH,
+            max_instances=1, coalesce=True, misfire_grace_time=JOB_MISFIRE_GRACE,
+        )
     scheduler.start()
 
 if __name__ == "__main__":
     # Planifie le scraping avec APScheduler
     schedule_scraper()
 
+    # Flux SSE/WebSocket des changements enregistrés par le scraper
+    if PUSH_FEED_ENABLED:
+        asyncio.get_event_loop().run_until_complete(start_push_server())
+
     # Bloque le script pour éviter qu'il ne se termine
     try:
         asyncio.get_event_loop().run_forever()
     except (KeyboardInterrupt, SystemExit):
-        pass
\ No newline at end of file
+        pass
+    finally:
+        asyncio.get_event_loop().run_until_complete(live_score_service.stop())
+        asyncio.get_event_loop().run_until_complete(stop_push_server())
+        asyncio.get_event_loop().run_until_complete(close_session())
+        shutdown_parsing_executor()
\ No newline at end of file
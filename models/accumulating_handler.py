@@ -1,27 +1,41 @@
 import logging
+from contextvars import ContextVar
 
 class AccumulatingHandler(logging.Handler):
     """
     Handler qui accumule les logs dans une liste.
+
+    Après `start_job`, les logs émis par la tâche courante (et les tâches qu'elle crée)
+    sont accumulés dans une liste propre, pour que des jobs concurrents ne mélangent
+    pas leurs logs d'exécution. Les logs émis en dehors d'un job ne sont pas accumulés :
+    aucun log d'exécution ne les reprendrait.
     """
     def __init__(self, level=logging.INFO):
         super().__init__(level=level)
-        self.log_records = []
+        self.job_records: ContextVar[list | None] = ContextVar('job_records', default=None)
 
     def emit(self, record):
-        # Formater le message de log
-        log_entry = self.format(record)
-        # Ajouter le log formatté à la liste des logs
-        self.log_records.append(log_entry)
+        job_records = self.job_records.get()
+        if job_records is None:
+            return
+        # Ajouter le log formatté à la liste des logs du job
+        job_records.append(self.format(record))
+
+    def start_job(self):
+        """
+        Démarre l'accumulation des logs propres à la tâche courante.
+        """
+        self.job_records.set([])
 
     def get_logs(self):
         """
-        Retourner tous les logs accumulés.
+        Retourner tous les logs accumulés par le job courant.
         """
-        return self.log_records
+        return self.job_records.get() or []
     
     def clear_logs(self):
         """
         Réinitialiser la liste des logs accumulés.
         """
-        self.log_records = []
\ No newline at end of file
+        if self.job_records.get() is not None:
+            self.job_records.set([])
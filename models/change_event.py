@@ -0,0 +1,19 @@
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    Changement d'une entité (match, équipe ou pool) enregistré par le scraper,
+    diffusé aux consommateurs du flux de changements.
+    """
+    seq: int                 # Numéro croissant, utilisé comme identifiant d'événement (Last-Event-ID)
+    type: str                # "<entité>.<action>" : "match.updated", "team.created", ...
+    entity_id: Optional[int]
+    changes: list[str]
+    data: dict               # Entité enregistrée (`to_dict`)
+    topics: list[str] = field(default_factory=list)  # "pool:<id>", "league:<code>", "team:<id>"
+    timestamp: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
@@ -0,0 +1,30 @@
+from sqlalchemy import JSON, Column, DateTime, Integer, String
+from .base import Base
+
+class ChangeRecord(Base):
+    __tablename__ = 'change_outbox'
+    __table_args__ = {'sqlite_autoincrement': True}  # Identifiants jamais réutilisés
+
+    id = Column(Integer, primary_key=True, index=True)  # Curseur de lecture, croissant
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=True)
+    action = Column(String, nullable=False)
+    changes = Column(JSON, nullable=False)  # {champ: [ancienne valeur, nouvelle valeur]}
+    source = Column(String, nullable=False)
+    run_id = Column(String, nullable=True, index=True)
+    created_at = Column(DateTime, nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "cursor": self.id,
+            "entity_type": self.entity_type,
+            "entity_id": self.entity_id,
+            "action": self.action,
+            "changes": self.changes,
+            "source": self.source,
+            "run_id": self.run_id,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    def __repr__(self):
+        return f"<ChangeRecord(id={self.id}, entity_type={self.entity_type}, entity_id={self.entity_id}, action={self.action})>"
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+@dataclass(frozen=True)
+class LiveMatch:
+    """
+    Match extrait d'une page CompetitionMatches de dataproject, avant rapprochement
+    avec les matchs existants.
+    """
+    mID: str
+    home_team_name: str
+    guest_team_name: str
+    match_date: datetime
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True)
+class LiveScore:
+    """
+    Score en direct d'un match reçu du hub SignalR de dataproject, identifié par son
+    `live_code` (mID dataproject, voir `LiveMatch`).
+    """
+    live_code: int
+    set: str                      # Sets gagnés, au format de `Match.set` ("2-1")
+    score: Optional[str] = None   # Points par set, au format de `Match.score` ("25-20,23-25,25-18")
@@ -1,40 +1,75 @@
-import html
 from typing import Optional
 import aiohttp
 from abc import ABC, abstractmethod
-import chardet
 from config.logger_config import logger
+from utils.encoding import decode_body
 from utils.handlers.error_handler import handle_errors
+from utils.http_cache import http_cache
+from utils.retry_policy import with_retry
+from utils.scraper_logic import handle_csv_download_and_parse
 
 class Scraper(ABC):
+    # Hôtes sollicités par le scraper, préchauffés avant chacune de ses exécutions (CSV des pools)
+    warmup_urls: tuple[str, ...] = ("http://www.ffvbbeach.org/",)
+
     def __init__(self, session: aiohttp.ClientSession):
         self.session = session        
     
     @handle_errors
-    async def fetch(self, url: str) -> str:
+    async def fetch(self, url: str, skip_unchanged: bool = False) -> Optional[str]:
         """
-        Récupère le contenu d'une URL en gérant les problèmes d'encodage.
+        Récupère le contenu d'une URL décodé selon `decode_body` (en-tête, déclaration, détection).
+
+        Avec `skip_unchanged`, la requête est conditionnelle (ETag / Last-Modified) et
+        None est retourné si le serveur répond 304 ou si le corps est identique au
+        dernier contenu traité. L'appelant valide le nouveau contenu avec
+        `http_cache.commit(url)` une fois son traitement terminé.
+
+        Les erreurs transitoires (réseau, timeout, 429/502/503/504) sont retentées via `with_retry`.
         """
+        headers = {
+            "User-Agent": "Mozilla/5.0"
+        }
+        if skip_unchanged:
+            headers.update(http_cache.conditional_headers(url))
+
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0"
-            }
-
-            async with self.session.get(url, headers=headers, ssl=False) as response:
-                response.raise_for_status()
-                raw_content = await response.content.read()
-                detected_encoding = chardet.detect(raw_content)['encoding']
-                encoding = detected_encoding or 'utf-8'
-                decoded_content = raw_content.decode(encoding, errors='replace')
-                decoded_content = html.unescape(decoded_content)
-
-                return decoded_content
+            return await with_retry(lambda: self.fetch_once(url, headers, skip_unchanged), f"l'URL '{url}'")
         except Exception as e:
             logger.error(f"Erreur lors de la récupération de l'URL '{url}' : {e}")
             raise
 
+    async def fetch_once(self, url: str, headers: dict, skip_unchanged: bool) -> Optional[str]:
+        """
+        Une tentative de `fetch`.
+        """
+        async with self.session.get(url, headers=headers, ssl=False) as response:
+            if skip_unchanged and response.status == 304:
+                logger.debug(f"Contenu non modifié (304) pour l'URL '{url}'")
+                return None
+            response.raise_for_status()
+            raw_content = await response.content.read()
+            if skip_unchanged:
+                body_hash = http_cache.body_hash(raw_content)
+                if http_cache.is_unchanged(url, body_hash):
+                    logger.debug(f"Contenu identique au dernier traitement pour l'URL '{url}'")
+                    return None
+                http_cache.stage(url, response.headers, body_hash)
+            return decode_body(url, raw_content, response.charset)
+
     @abstractmethod
     @handle_errors
     async def scrape(self):
-        """Méthode principale de scraping à implémenter par les sous-classes."""
-        pass
\ No newline at end of file
+        """
+        Découverte des pools, à implémenter par les sous-classes : chaque pool est enregistrée
+        dans `pool_scheduler` avec les paramètres attendus par `process_pool`.
+        """
+        pass
+
+    async def process_pool(self, pool_id: int, params: dict) -> None:
+        """
+        Traitement d'une pool arrivée à échéance : téléchargement et intégration de son CSV.
+        """
+        await handle_csv_download_and_parse(
+            self.session, pool_id, params['league_code'], params['pool_code'], params['season']
+        )
\ No newline at end of file
@@ -1,20 +1,21 @@
-import asyncio
-from bs4 import BeautifulSoup
 from config.logger_config import logger
 from api.pools_api import get_pools_by_league_and_season
 from models.pool import Pool, PoolDivisionCode
 from models.scraper import Scraper
 from services.pools_service import add_or_update_pool, deactivate_pools
-from utils.file_utils import create_output_directory, delete_output_directory
-from utils.scraper_logic import handle_csv_download_and_parse
+from utils.html_extraction import extract_national_pool_links
+from utils.parsing_executor import run_parser
+from utils.pool_scheduler import pool_scheduler
 from utils.utils import extract_national_division, extract_season_from_url, parse_season, standardize_division_name
+from utils.world_state import world_state
 
 
 class NationalScraper(Scraper):
+    warmup_urls = ("http://www.ffvb.org/", *Scraper.warmup_urls)
+
     def __init__(self, session):
         super().__init__(session)
         self.national_url = "http://www.ffvb.org/119-37-1-Championnats-Nationaux"
-        self.folder = create_output_directory("National")
         self.league_code = "ABCCS"
         self.league_name = "NATIONAL"
 
@@ -27,28 +28,24 @@ class NationalScraper(Scraper):
                 logger.error("Échec de la récupération du contenu HTML pour les pools nationales.")
                 return
 
-            soup = BeautifulSoup(html_content, 'html.parser')
-            tasks = []
+            pool_links = await run_parser("nationales", extract_national_pool_links, html_content)
             scraped_pool_codes = set()
-            raw_season = None
-            for a_tag in soup.find_all('a', href=lambda href: href and href.endswith('.htm')):
-                href = a_tag['href']
-                raw_season = extract_season_from_url(href)
-                break
+            raw_season = extract_season_from_url(pool_links[0][0]) if pool_links else None
                         
             if not raw_season:
-                logger.warning(f"Aucune saison trouvée pour l'URL: {href}")
+                logger.warning(f"Aucune saison trouvée pour l'URL: {self.national_url}")
                 raise ValueError("Saison non trouvée.")
             
             parsed_season = parse_season(raw_season)
             
-            existing_pools = await get_pools_by_league_and_season(self.session, self.league_code, parsed_season)
+            existing_pools = await world_state.pools(
+                self.league_code, parsed_season,
+                lambda: get_pools_by_league_and_season(self.session, self.league_code, parsed_season),
+            )
             existing_pools_dict = {(pool.pool_code, pool.league_code, pool.season): pool for pool in existing_pools}
 
-            for a_tag in soup.find_all('a', href=lambda href: href and href.endswith('.htm')):
+            for href, pool_name in pool_links:
                 try:
-                    href = a_tag['href']
-                    pool_name = a_tag.get_text(strip=True)
                     pool_code = href.split('_')[-1].replace('.htm', '').upper()
 
 
@@ -76,17 +73,14 @@ class NationalScraper(Scraper):
                     # Ajout ou mise à jour de la pool
                     new_pool = await add_or_update_pool(self.session, pool, existing_pool)
                     if new_pool:
-                        task = handle_csv_download_and_parse(
-                            self.session, new_pool.id, new_pool.league_code, new_pool.pool_code, raw_season, self.folder
-                        )
-                        tasks.append(task)
+                        # Le CSV de la pool est traité à son échéance (`pool_scheduler.run_due`)
+                        pool_scheduler.register(new_pool.id, 'national', {
+                            "league_code": new_pool.league_code, "pool_code": new_pool.pool_code, "season": raw_season,
+                        })
 
                 except Exception as e:
                     logger.error(f"Erreur lors du traitement de la pool {pool_name} (URL: {href}): {e}")
 
-            # Exécution des tâches de téléchargement CSV
-            await asyncio.gather(*tasks)
-
             # Désactivation des pools non scrapées
             await deactivate_pools(self.session, self.league_code, scraped_pool_codes)
 
@@ -94,5 +88,4 @@ class NationalScraper(Scraper):
         except Exception as e:
             logger.error(f"Erreur critique lors du scraping des poules nationales : {e}")
         finally:
-            delete_output_directory(self.folder)
             logger.debug("Fin du scraping des poules nationales.")
\ No newline at end of file
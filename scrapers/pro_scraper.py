@@ -1,28 +1,40 @@
 import asyncio
+from collections import defaultdict
 from dataclasses import replace
 from datetime import datetime
-import re
-from typing import Optional, Tuple
-from bs4 import BeautifulSoup
-from api.matches_api import get_active_matches_by_pool_id, get_match_by_pool_teams_date, update_match
+from typing import Iterator, Optional
+from api.bulk_api import BulkUpsertError
+from api.matches_api import bulk_upsert_matches, get_matches_by_pool
 from api.pools_api import get_pools_by_league_and_season
-from api.teams_api import get_team_by_pool_and_name
+from api.teams_api import get_teams_by_pool
+from models.live_match import LiveMatch
 from models.match import Match, MatchStatus
 from models.pool import Pool, PoolDivisionCode, PoolGender
 from models.scraper import Scraper
 from services.pools_service import add_or_update_pool
-from utils.file_utils import create_output_directory, delete_output_directory
+from utils.change_outbox import change_outbox
+from utils.fingerprint_store import xml_fingerprints
+from utils.html_extraction import extract_dataproject_matches
+from utils.http_cache import http_cache
+from utils.parsing_executor import run_parser
+from utils.pool_scheduler import pool_scheduler
 from utils.scraper_logic import handle_csv_download_and_parse
 from utils.team_utils import get_full_team_name
 from utils.utils import parse_season
+from utils.world_state import world_state
 import xml.etree.ElementTree as ET
 from config.logger_config import logger
 
+XML_FEED_SIZE = 64 * 1024  # Taille des morceaux transmis au parser XML incrémental
+OUTBOX_SOURCE = "pro_scraper"
+MATCHES_FINGERPRINT = "matchs"  # Clé de l'empreinte des matchs de la pool, à côté de celles des journées
+
 
 class ProScraper(Scraper):
+    warmup_urls = ("https://www.lnv.fr/", "http://lnv-web.dataproject.com/", *Scraper.warmup_urls)
+
     def __init__(self, session):
         super().__init__(session)
-        self.folder = create_output_directory("Pro")
         self.raw_season = "2024/2025" 
         self.parsed_season = parse_season(self.raw_season)
         self.league_code = "AALNV"
@@ -38,12 +50,14 @@ class ProScraper(Scraper):
         if self.session is None:
             raise ValueError("La session aiohttp est non initialisée ou fermée.")
 
-        tasks = []
         logger.debug("Début du scraping des poules professionnelles.")
 
         try:
             
-            existing_pools = await get_pools_by_league_and_season(self.session, self.league_code, self.parsed_season)
+            existing_pools = await world_state.pools(
+                self.league_code, self.parsed_season,
+                lambda: get_pools_by_league_and_season(self.session, self.league_code, self.parsed_season),
+            )
             existing_pools_dict = {(pool.pool_code, pool.league_code, pool.season): pool for pool in existing_pools}
             
             for pool_json in self.pools_json:
@@ -65,26 +79,32 @@ class ProScraper(Scraper):
                     
                     new_pool = await add_or_update_pool(self.session, pool, existing_pool)
                     if new_pool:
-                        tasks.append(self.execute_task_chain(
-                            new_pool.id, new_pool.pool_code, self.raw_season,
-                            new_pool.gender, self.folder, pool_json['lnv_url'], pool_json['lnv_xml_url']
-                        ))
+                        # La pool est traitée à son échéance (`pool_scheduler.run_due`, `process_pool`)
+                        pool_scheduler.register(new_pool.id, 'pro', {
+                            "league_code": self.league_code, "pool_code": new_pool.pool_code, "season": self.raw_season,
+                            "gender": pool_json['gender'], "lnv_url": pool_json['lnv_url'],
+                            "lnv_xml_url": pool_json['lnv_xml_url'],
+                        })
                 except Exception as e:
                     logger.error(f"Erreur lors du traitement de la pool {pool_json['pool_name']}: {e}")
 
-            # Exécute les tâches asynchrones (ex. téléchargement de CSV, parsing XML)
-            await asyncio.gather(*tasks)
-
         except Exception as e:
             logger.error(f"Erreur critique lors du scraping des poules professionnelles : {e}")
         finally:
-            # Nettoyer le dossier, même en cas d'échec
-            delete_output_directory(self.folder)
             logger.debug("Fin du scraping des poules professionnelles.")
             
             
-    async def execute_task_chain(self, pool_id, pool_code, season, gender, folder, lnv_url, lnv_xml_url):
-        await handle_csv_download_and_parse(self.session, pool_id, self.league_code, pool_code, season, folder)
+    async def process_pool(self, pool_id: int, params: dict) -> None:
+        """
+        Traitement d'une pool LNV : CSV FFVB, flux XML LNV puis codes live.
+        """
+        await self.execute_task_chain(
+            pool_id, params['pool_code'], params['season'], params['gender'],
+            params['lnv_url'], params['lnv_xml_url']
+        )
+
+    async def execute_task_chain(self, pool_id, pool_code, season, gender, lnv_url, lnv_xml_url):
+        await handle_csv_download_and_parse(self.session, pool_id, self.league_code, pool_code, season)
         await self.parse_and_update_matches(lnv_xml_url, pool_id)
         await self.add_match_live_code(lnv_url, pool_id, gender)
         
@@ -92,33 +112,113 @@ class ProScraper(Scraper):
     async def parse_and_update_matches(self, xml_url, pool_id):
         """
         Parse le flux XML des matchs et met à jour les informations des matchs dans la base.
+
+        Les matchs du flux sont regroupés par journée : une journée dont l'empreinte
+        est identique à celle du dernier traitement réussi est ignorée. Les autres sont
+        rapprochées des matchs existants par code, et les matchs modifiés sont
+        enregistrés ensemble via `bulk_upsert_matches`.
+
+        Les matchs de la pool ont pu être modifiés depuis le dernier traitement (CSV, API) :
+        le flux inchangé et les empreintes des journées ne sont utilisés que si les champs
+        des matchs repris du flux sont eux aussi inchangés.
         """
-        xml_content = await self.fetch(xml_url)
+        matches = await world_state.matches(pool_id, lambda: get_matches_by_pool(self.session, pool_id))
+        existing_matches = [match for match in matches if match.active is not False]
+        existing_matches_dict = {match.match_code: match for match in existing_matches}
+        previous_fingerprints = xml_fingerprints.get(pool_id)
+        if previous_fingerprints.get(MATCHES_FINGERPRINT) != self.matches_fingerprint(existing_matches):
+            previous_fingerprints = {}
+
+        xml_content = await self.fetch(xml_url, skip_unchanged=bool(previous_fingerprints))
+        if xml_content is None:
+            logger.debug(f"Flux XML inchangé, parsing ignoré: {xml_url}")
+            return
         if not xml_content:
             logger.error("Erreur lors de la récupération du flux XML.")
             return
 
-        root = ET.fromstring(xml_content)  # Décoder le contenu XML
-        existing_matches = await get_active_matches_by_pool_id(self.session, pool_id)
-        for match in root.findall(".//Match"):
-            await self.process_xml_match(match, existing_matches)
+        journees = defaultdict(list)
+        for xml_match in self.iter_xml_matches(xml_content):
+            journees[xml_match['journee']].append(xml_match)
+
+        fingerprints = {}
+        matches_to_update, changes, previous_matches = [], [], []
+        for journee, xml_matches in journees.items():
+            fingerprint = xml_fingerprints.fingerprint(xml_matches)
+            if previous_fingerprints.get(journee) == fingerprint:
+                fingerprints[journee] = fingerprint
+                continue
+
+            all_known = True
+            for xml_match in xml_matches:
+                existing_match = existing_matches_dict.get(xml_match['code'])
+                if not existing_match:
+                    all_known = False
+                    continue
+                match_datetime = datetime.strptime(xml_match['date'], "%d-%m-%Y %H:%M:%S")
+                updated_match = self.prepare_updated_match(existing_match, match_datetime, xml_match['set'])
+                match_changes = self.get_match_updates(existing_match, updated_match)
+                if match_changes:
+                    matches_to_update.append(updated_match)
+                    changes.append(match_changes)
+                    previous_matches.append(existing_match)
+            # Une journée contenant des matchs pas encore créés sera réexaminée
+            if all_known:
+                fingerprints[journee] = fingerprint
 
-
-    async def process_xml_match(self, match, existing_matches : Optional[list[Match]]):
-        code_match = match.find("CodeMatch").text
-        match_date = match.find("Date").text + " " + match.find("Heure").text
-        set = match.find("Score").text # Set fait reference au champ csv, attention à la confusion avec Score
-
-        # Conversion de la date et de l'heure en format datetime
-        match_datetime = datetime.strptime(match_date, "%d-%m-%Y %H:%M:%S")
-        existing_match = next((match for match in existing_matches if match.match_code == code_match), None)
-
-        if existing_match:
-            updated_match = self.prepare_updated_match(existing_match, match_datetime, set)
-            await self.apply_match_updates(existing_match, updated_match)
+        try:
+            saved = await bulk_upsert_matches(self.session, matches_to_update, changes)
+        except BulkUpsertError as e:
+            # Écritures réussies enregistrées avant de remonter l'échec
+            change_outbox.record_all("match", previous_matches, e.saved, OUTBOX_SOURCE)
+            raise e.error
+        change_outbox.record_all("match", previous_matches, saved, OUTBOX_SOURCE)
+        logger.debug(f"Flux XML {xml_url}: {len(journees)} journées, {len(matches_to_update)} matchs mis à jour")
+
+        # Un match non enregistré fera réexaminer toutes les journées au prochain passage
+        if saved is not None and all(saved):
+            saved_matches = {match.id: match for match in saved}
+            fingerprints[MATCHES_FINGERPRINT] = self.matches_fingerprint(
+                [saved_matches.get(match.id, match) for match in existing_matches]
+            )
+        xml_fingerprints.stage(pool_id, fingerprints)
+        xml_fingerprints.commit(pool_id)
+        http_cache.commit(xml_url)
+
+    @staticmethod
+    def matches_fingerprint(matches: list[Match]) -> str:
+        """
+        Empreinte des champs des matchs repris du flux XML.
+        """
+        return xml_fingerprints.fingerprint(sorted(
+            (match.id, match.match_code, match.match_date, match.set, match.status) for match in matches
+        ))
 
 
-    async def apply_match_updates(self, existing_match: Match, updated_match: Match):
+    @staticmethod
+    def iter_xml_matches(xml_content: str) -> Iterator[dict]:
+        """
+        Parse le flux XML de manière incrémentale et génère chaque <Match>.
+        Les éléments traités sont libérés au fur et à mesure.
+        """
+        parser = ET.XMLPullParser(events=("end",))
+        for start in range(0, len(xml_content), XML_FEED_SIZE):
+            parser.feed(xml_content[start:start + XML_FEED_SIZE])
+            for _, element in parser.read_events():
+                if element.tag != "Match":
+                    continue
+                yield {
+                    'code': element.findtext("CodeMatch"),
+                    'journee': element.findtext("Journee") or "",
+                    'date': f"{element.findtext('Date')} {element.findtext('Heure')}",
+                    # Set fait reference au champ csv, attention à la confusion avec Score
+                    'set': element.findtext("Score"),
+                }
+                element.clear()
+        parser.close()
+
+
+    def get_match_updates(self, existing_match: Match, updated_match: Match) -> list[str]:
         changes = []
         formated_existing_date = existing_match.match_date.isoformat()
         formated_updated_date = updated_match.match_date.isoformat()
@@ -126,8 +226,7 @@ class ProScraper(Scraper):
             changes.append(f"match_date: {formated_existing_date} -> {formated_updated_date}")
         if existing_match.set != updated_match.set:
             changes.append(f"set: '{existing_match.set}' -> '{updated_match.set}'")
-        if changes:
-            await update_match(self.session, updated_match, changes)
+        return changes
 
 
     def prepare_updated_match(self, existing_match: Match, match_datetime: datetime, set: set) -> Match:
@@ -140,92 +239,79 @@ class ProScraper(Scraper):
         return updated_match
 
 
-    async def extract_main_id(self, soup: BeautifulSoup) -> Optional[str]:
-        span = soup.find("span", id=re.compile(r"Content_Main_(\d+)_userControl_lbl_title"))
-        if span:
-            match = re.search(r"Content_Main_(\d+)_userControl_lbl_title", span["id"])
-            return match.group(1) if match else None
-        return None
-
-
     async def add_match_live_code(self, url, pool_id, gender):
         html_content = await self.fetch(url)
         if not html_content:
             return
 
-        soup = BeautifulSoup(html_content, 'html.parser')
-        main_id = await self.extract_main_id(soup)
+        main_id, live_matches = await run_parser("dataproject", extract_dataproject_matches, html_content)
         if not main_id:
             logger.error("Impossible de trouver l'identifiant principal.")
             return
         logger.debug(f"Identifiant principal trouvé: {main_id}")
 
-        await self.process_all_days(soup, main_id, pool_id, gender)
-
-
-    async def process_all_days(self, soup: BeautifulSoup, main_id: str, pool_id: int, gender: str):
-        total_days = 0
-        while True:
-            day_block = soup.find(id=f"ctl00_Content_Main_{main_id}_userControl_RADLIST_Legs_ctrl{total_days}_RPL_Leg")
-            if not day_block:
-                break
-            await self.process_matches_in_day(soup, main_id, total_days, pool_id, gender)
-            total_days += 2
-
-
-    async def process_matches_in_day(self, soup: BeautifulSoup, main_id: str, total_days: int, pool_id: int, gender: str):
-        match_count = 0
-        while True:
-            match_block = soup.find(id=f"ctl00_Content_Main_{main_id}_userControl_RADLIST_Legs_ctrl{total_days}_RADLIST_Matches_ctrl{match_count}_RPL_Match")
-            if not match_block:
-                break
-            await self.process_match_block(match_block, pool_id, gender)
-            match_count += 2
-
-
-    async def process_match_block(self, match_block, pool_id: int, gender: str):    
-        mID = self.extract_match_id(match_block)
-        home_team_name, guest_team_name = self.extract_teams(match_block)
-        home_team_full = get_full_team_name(home_team_name, gender)
-        guest_team_full = get_full_team_name(guest_team_name, gender)
+        # Équipes et matchs de la pool chargés une seule fois, puis rapprochés en mémoire
+        teams, matches = await asyncio.gather(
+            world_state.teams(pool_id, lambda: get_teams_by_pool(self.session, pool_id)),
+            world_state.matches(pool_id, lambda: get_matches_by_pool(self.session, pool_id)),
+        )
+        teams_index = {team.team_name: team.id for team in teams or []}
+        # Les matchs actifs sont indexés en dernier pour l'emporter en cas de doublon
+        matches_index = {
+            self.match_key(match.team_id_a, match.team_id_b, match.match_date): match
+            for match in sorted(matches or [], key=lambda match: match.active is not False)
+        }
+
+        updates = []
+        for live_match in live_matches:
+            update = self.prepare_live_code_update(live_match, gender, teams_index, matches_index)
+            if update:
+                updates.append(update)
+        if updates:
+            matches_to_update, changes = zip(*updates)
+            matches_by_id = {match.id: match for match in matches or []}
+            previous_matches = [matches_by_id.get(match.id) for match in matches_to_update]
+            try:
+                saved = await bulk_upsert_matches(self.session, list(matches_to_update), list(changes))
+            except BulkUpsertError as e:
+                change_outbox.record_all("match", previous_matches, e.saved, OUTBOX_SOURCE)
+                raise e.error
+            change_outbox.record_all("match", previous_matches, saved, OUTBOX_SOURCE)
+        logger.debug(f"Pool {pool_id}: {len(live_matches)} matchs lus, {len(updates)} codes live mis à jour")
+
+
+    @staticmethod
+    def match_key(team_id_a: int, team_id_b: int, match_date: datetime) -> tuple[int, int, str]:
+        return team_id_a, team_id_b, match_date.replace(tzinfo=None).isoformat()
+
+
+    def prepare_live_code_update(self, live_match: LiveMatch, gender: str, teams_index: dict, matches_index: dict) -> Optional[tuple[Match, list[str]]]:
+        home_team_full = get_full_team_name(live_match.home_team_name, gender)
+        guest_team_full = get_full_team_name(live_match.guest_team_name, gender)
 
         if not home_team_full:
-            logger.error(f"Nom d'équipe domicile non trouvé dans les alias: {home_team_name}")
+            logger.error(f"Nom d'équipe domicile non trouvé dans les alias: {live_match.home_team_name}")
         if not guest_team_full:
-            logger.error(f"Nom d'équipe visiteur non trouvé dans les alias: {guest_team_name}")
-
-        date_time = match_block.find("span", id=re.compile("LB_DataOra"))
-        if date_time:
-            match_date = date_time.get_text(strip=True)
-            parsed_match_date = datetime.strptime(match_date, "%d/%m/%Y - %H:%M")
-
-            if home_team_full and guest_team_full:
-                await self.update_match_details(pool_id, home_team_full, guest_team_full, parsed_match_date, mID)
-
-
-    def extract_match_id(self, match_block) -> str:
-        onclick_attr = match_block.find("div", onclick=True)
-        mID_match = re.search(r"mID=(\d+)", onclick_attr["onclick"]) if onclick_attr else None
-        return mID_match.group(1) if mID_match else None
-
-
-    def extract_teams(self, match_block) -> Tuple[str, str]:
-        team_home = match_block.find("span", id=re.compile("Label2|Label6"))
-        team_guest = match_block.find("span", id=re.compile("Label4|Label7"))
-        home_team_name = team_home.get_text(strip=True) if team_home else None
-        guest_team_name = team_guest.get_text(strip=True) if team_guest else None
-        return home_team_name, guest_team_name
+            logger.error(f"Nom d'équipe visiteur non trouvé dans les alias: {live_match.guest_team_name}")
 
+        if home_team_full and guest_team_full:
+            return self.resolve_live_code(teams_index, matches_index, home_team_full, guest_team_full, live_match.match_date, live_match.mID)
+        return None
 
-    async def update_match_details(self, pool_id: int, home_team_full: str, guest_team_full: str, match_date: datetime, mID: str):
-        team_a = await get_team_by_pool_and_name(self.session, pool_id, home_team_full)
-        team_b = await get_team_by_pool_and_name(self.session, pool_id, guest_team_full)
 
-        if team_a and team_b:
-            existing_match = await get_match_by_pool_teams_date(self.session, pool_id, team_a.id, team_b.id, match_date)
-            if existing_match:
-                updated_match = replace(existing_match)
-                updated_match.live_code = int(mID)
-                if existing_match.live_code != updated_match.live_code:
-                    changes = [f"live_code: {existing_match.live_code} -> {updated_match.live_code}"]
-                    await update_match(self.session, updated_match, changes)
\ No newline at end of file
+    def resolve_live_code(self, teams_index: dict, matches_index: dict, home_team_full: str, guest_team_full: str, match_date: datetime, mID: str) -> Optional[tuple[Match, list[str]]]:
+        """
+        Rapproche un match de la page dataproject d'un match existant et retourne la mise à jour
+        à appliquer si son code live a changé.
+        """
+        team_a_id = teams_index.get(home_team_full)
+        team_b_id = teams_index.get(guest_team_full)
+        if not (team_a_id and team_b_id and mID):
+            return None
+
+        existing_match = matches_index.get(self.match_key(team_a_id, team_b_id, match_date))
+        if existing_match and existing_match.live_code != int(mID):
+            updated_match = replace(existing_match)
+            updated_match.live_code = int(mID)
+            return updated_match, [f"live_code: {existing_match.live_code} -> {updated_match.live_code}"]
+        return None
@@ -1,21 +1,23 @@
 import asyncio
 import re
-from bs4 import BeautifulSoup
 from api.pools_api import get_pools_by_league_and_season
 from models.pool import Pool, PoolDivisionCode
 from models.scraper import Scraper
 from services.pools_service import add_or_update_pool, deactivate_pools
-from utils.file_utils import create_output_directory, delete_output_directory
-from utils.scraper_logic import handle_csv_download_and_parse
+from utils.html_extraction import extract_league_links, extract_regional_pool_links
+from utils.parsing_executor import run_parser
+from utils.pool_scheduler import pool_scheduler
 from utils.utils import parse_season, standardize_division_name
+from utils.world_state import world_state
 from config.logger_config import logger
 
 
 class RegionalScraper(Scraper):
+    warmup_urls = ("http://www.ffvb.org/", *Scraper.warmup_urls)
+
     def __init__(self, session):
         super().__init__(session)
         self.regional_url = "http://www.ffvb.org/120-37-1-Championnats-Regionaux"
-        self.folder = create_output_directory("Regional")
 
 
     async def scrape(self):
@@ -28,30 +30,21 @@ class RegionalScraper(Scraper):
                 logger.error("Échec de la récupération du contenu HTML pour les pools régionales.")
                 return
 
-            soup = BeautifulSoup(html_content, 'html.parser')
-            league_tables = soup.find_all("table", class_=["tableau_bleu", "tableau_rouge", "tableau_violet"])
             tasks = []
 
-            for table in league_tables:
+            for league_name, league_page_url in await run_parser("régionales", extract_league_links, html_content):
                 try:
-                    league_name_tag = table.find('td', style="text-align: center;")
-                    if not league_name_tag:
+                    league_code_match = re.search(r'codent=([^&]+)', league_page_url)
+                    if not league_code_match:
+                        logger.warning(f"Code de ligue manquant dans l'URL: {league_page_url}")
                         continue
-                    league_name = league_name_tag.get_text(strip=True)
-                    a_tag = table.find('a', href=lambda href: href and 'codent=' in href)
-                    if a_tag:
-                        league_code_match = re.search(r'codent=([^&]+)', a_tag['href'])
-                        if not league_code_match:
-                            logger.warning(f"Code de ligue manquant dans l'URL: {a_tag['href']}")
-                            continue
-                        league_code = league_code_match.group(1)
-                        league_page_url = a_tag['href']
-                        scraped_league_codes.add(league_code)
-
-                        task = self.scrape_pools_from_league(
-                            league_code, league_name, league_page_url
-                        )
-                        tasks.append(task)
+                    league_code = league_code_match.group(1)
+                    scraped_league_codes.add(league_code)
+
+                    task = self.scrape_pools_from_league(
+                        league_code, league_name, league_page_url
+                    )
+                    tasks.append(task)
                 except Exception as e:
                     logger.error(f"Erreur lors du traitement d'une ligue régionale : {e}")
 
@@ -61,7 +54,6 @@ class RegionalScraper(Scraper):
         except Exception as e:
             logger.error(f"Erreur critique lors du scraping des poules régionales : {e}")
         finally:
-            delete_output_directory(self.folder)
             logger.debug("Fin du scraping des poules régionales.")
             
             
@@ -79,14 +71,11 @@ class RegionalScraper(Scraper):
                     logger.error(f"Échec de la récupération du contenu HTML pour la ligue: {league_name}")
                     return
 
-                soup = BeautifulSoup(html_content, 'html.parser')
-                pool_links = soup.select('ul#menu > li > ul > li > ul > li > a[href*="poule="]')
-                tasks = []
+                pool_links = await run_parser("ligue", extract_regional_pool_links, html_content)
                 
                 raw_season = None
                 
-                for a_tag in pool_links:
-                    href = a_tag['href']
+                for href, _, _ in pool_links:
                     season_match = re.search(r'saison=([^&]+)', href)
                     raw_season = season_match.group(1)
                     break
@@ -98,12 +87,14 @@ class RegionalScraper(Scraper):
                 parsed_season = parse_season(raw_season)
 
 
-                existing_pools = await get_pools_by_league_and_season(self.session, league_code, parsed_season)
+                existing_pools = await world_state.pools(
+                    league_code, parsed_season,
+                    lambda: get_pools_by_league_and_season(self.session, league_code, parsed_season),
+                )
                 existing_pools_dict = {(pool.pool_code, pool.league_code, pool.season): pool for pool in existing_pools}
 
-                for a_tag in pool_links:
+                for href, pool_name, raw_division_name in pool_links:
                     try:
-                        href = a_tag['href']
                         pool_code_match = re.search(r'poule=([^&]+)', href)
                         season_match = re.search(r'saison=([^&]+)', href)
                         if not pool_code_match or not season_match:
@@ -111,9 +102,6 @@ class RegionalScraper(Scraper):
                             continue
                         pool_code = pool_code_match.group(1)
                         raw_season = season_match.group(1)
-                        pool_name = a_tag.get_text(strip=True)
-                        raw_division_tag = a_tag.find_parent('ul').find_previous_sibling('a')
-                        raw_division_name = raw_division_tag.get_text(strip=True) if raw_division_tag else ""
                         standardized = standardize_division_name(raw_division_name)
 
                         scraped_pool_codes.add(pool_code)
@@ -136,16 +124,14 @@ class RegionalScraper(Scraper):
 
                         new_pool = await add_or_update_pool(self.session, pool, existing_pool)
                         if new_pool:
-                            task = handle_csv_download_and_parse(
-                                self.session, new_pool.id, new_pool.league_code, new_pool.pool_code, raw_season, self.folder
-                            )
-                            tasks.append(task)
+                            # Le CSV de la pool est traité à son échéance (`pool_scheduler.run_due`)
+                            pool_scheduler.register(new_pool.id, 'regional', {
+                                "league_code": new_pool.league_code, "pool_code": new_pool.pool_code, "season": raw_season,
+                            })
 
                     except Exception as e:
                         logger.error(f"Erreur lors du traitement d'une pool : {e}")
 
-                await asyncio.gather(*tasks)
-
             await deactivate_pools(self.session, league_code, scraped_pool_codes)
             
         except Exception as e:
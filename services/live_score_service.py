@@ -0,0 +1,282 @@
+import asyncio
+import contextvars
+import json
+import time
+from dataclasses import replace
+from typing import Any, Callable, Optional
+import aiohttp
+from api.bulk_api import BulkUpsertError
+from api.matches_api import bulk_upsert_matches, get_matches_by_pool
+from config.env_config import (
+    LIVE_SCORE_DEBOUNCE, LIVE_SCORE_FEDERATION, LIVE_SCORE_READ_TIMEOUT, SIGNALR_HUB, SIGNALR_URL,
+)
+from config.logger_config import logger
+from models.live_score import LiveScore
+from models.match import Match, MatchStatus
+from utils.change_outbox import change_outbox
+from utils.http_client import get_session
+from utils.pool_scheduler import in_match_window, pool_scheduler
+from utils.retry_policy import RetryPolicy
+from utils.signalr_client import SignalRClient, hub_calls
+from utils.world_state import world_state
+
+LIVE_SCORE_METHOD = "getLiveScoreListData_From_ES"
+SIGNALR_HEADERS = {"Origin": "https://lnv-web.dataproject.com"}
+SETS_TO_WIN = 3
+
+# Champs des scores en direct de dataproject (plusieurs noms acceptés selon les versions du flux)
+ID_FIELDS = ("ChampionshipMatchID", "MatchID", "IdMatch", "mID")
+HOME_SETS_FIELDS = ("WonSetHome", "SetHome")
+GUEST_SETS_FIELDS = ("WonSetGuest", "SetGuest")
+SET_POINTS_FIELDS = ("Set{}Home", "Set{}Guest")
+MAX_SETS = 5
+OUTBOX_SOURCE = "live_score_service"
+
+
+def first_field(item: dict, names: tuple[str, ...]) -> Any:
+    for name in names:
+        if item.get(name) not in (None, ""):
+            return item[name]
+    return None
+
+
+def parse_live_score(item: dict) -> Optional[LiveScore]:
+    """
+    Convertit un score en direct du hub en `LiveScore`, ou None si l'élément n'en est pas un.
+    """
+    live_code = first_field(item, ID_FIELDS)
+    home_sets = first_field(item, HOME_SETS_FIELDS)
+    guest_sets = first_field(item, GUEST_SETS_FIELDS)
+    if live_code is None or home_sets is None or guest_sets is None:
+        return None
+
+    try:
+        points = []
+        for number in range(1, MAX_SETS + 1):
+            home = item.get(SET_POINTS_FIELDS[0].format(number))
+            guest = item.get(SET_POINTS_FIELDS[1].format(number))
+            if home in (None, "") or guest in (None, "") or (int(home) == 0 and int(guest) == 0):
+                break
+            points.append(f"{int(home)}-{int(guest)}")
+        return LiveScore(
+            live_code=int(live_code),
+            set=f"{int(home_sets)}-{int(guest_sets)}",
+            score=','.join(points) or None,
+        )
+    except (TypeError, ValueError):
+        logger.debug(f"Score en direct illisible ignoré: {item}")
+        return None
+
+
+def parse_live_scores(data: Any) -> list[LiveScore]:
+    """
+    Extrait les scores en direct d'un résultat d'appel ou des arguments d'un message du hub
+    (objets, listes d'objets, éventuellement sérialisés en JSON).
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return []
+    if isinstance(data, list):
+        return [score for item in data for score in parse_live_scores(item)]
+    if not isinstance(data, dict):
+        return []
+    score = parse_live_score(data)
+    if score is not None:
+        return [score]
+    return [score for value in data.values() if isinstance(value, (list, dict, str)) for score in parse_live_scores(value)]
+
+
+def apply_live_score(match: Match, score: LiveScore) -> tuple[Match, list[str]]:
+    """
+    Applique un score en direct à un match. Le match est terminé dès qu'une équipe a
+    gagné SETS_TO_WIN sets. Retourne le match mis à jour et la liste des changements.
+    """
+    updated_match = replace(match, set=score.set, score=score.score or match.score)
+    if SETS_TO_WIN in (int(sets) for sets in score.set.split('-')):
+        updated_match.status = MatchStatus.FINISHED
+
+    changes = []
+    if match.set != updated_match.set:
+        changes.append(f"set: '{match.set}' -> '{updated_match.set}'")
+    if match.score != updated_match.score:
+        changes.append(f"score: '{match.score}' -> '{updated_match.score}'")
+    if match.status != updated_match.status:
+        changes.append(f"status: {match.status.value} -> {updated_match.status.value}")
+    return updated_match, changes
+
+
+class LiveScoreService:
+    """
+    Suivi en direct des scores des matchs pro via le hub SignalR de dataproject.
+
+    `refresh` (job APScheduler) détermine les matchs à suivre : matchs pro non terminés,
+    dans leur fenêtre et dont le `live_code` est connu. Tant qu'il y en a, une seule
+    connexion au hub est maintenue (reconnexion avec backoff) et chaque match y est
+    abonné. Les scores reçus point par point sont regroupés pendant
+    LIVE_SCORE_DEBOUNCE secondes (le dernier l'emporte), puis les changements de set
+    et de score sont écrits en un lot via `bulk_upsert_matches`.
+
+    Chaque lot est une exécution de `change_outbox` : ses changements sont écrits en base
+    par `save_changes` (fourni par le point d'entrée), dans leur propre transaction.
+    """
+    def __init__(self, debounce: float = LIVE_SCORE_DEBOUNCE, read_timeout: float = LIVE_SCORE_READ_TIMEOUT):
+        self.debounce = debounce
+        self.read_timeout = read_timeout
+        self.policy = RetryPolicy()
+        self.matches: dict[int, Match] = {}  # Matchs suivis, par live_code
+        self.subscribed: set[int] = set()
+        self.client: Optional[SignalRClient] = None
+        self.task: Optional[asyncio.Task] = None
+        self.pending: dict[int, LiveScore] = {}
+        self.flush_task: Optional[asyncio.Task] = None
+        self.save_changes: Optional[Callable[[], None]] = None
+
+    async def refresh(self) -> None:
+        """
+        Met à jour les matchs suivis et démarre, complète ou arrête la connexion au hub.
+        """
+        session = await get_session()
+        pool_ids = pool_scheduler.live_pools('pro')
+        results = await asyncio.gather(*(
+            world_state.matches(pool_id, lambda pool_id=pool_id: get_matches_by_pool(session, pool_id)) for pool_id in pool_ids
+        ))
+        now = time.time()
+        live_matches = {
+            match.live_code: match
+            for matches in results for match in matches or []
+            if match.live_code and match.active is not False and match.status != MatchStatus.FINISHED
+            and match.match_date and in_match_window(match.match_date.timestamp(), now)
+        }
+
+        if not live_matches:
+            await self.stop()
+            self.matches = {}
+            return
+        self.matches = live_matches
+        if self.task is None or self.task.done():
+            logger.info(f"Scores en direct : connexion au hub pour {len(self.matches)} matchs")
+            # Tâches de fond hors du contexte du job : leurs logs ne s'accumulent pas dans celui-ci
+            self.task = asyncio.create_task(self.run(session), context=contextvars.Context())
+        elif self.client is not None:
+            await self.subscribe()
+
+    async def run(self, session: aiohttp.ClientSession) -> None:
+        """
+        Maintient la connexion au hub tant que des matchs sont suivis.
+        """
+        attempt = 0
+        while self.matches:
+            client = SignalRClient(session, SIGNALR_URL, SIGNALR_HUB, SIGNALR_HEADERS)
+            try:
+                async with client.connect(self.read_timeout) as messages:
+                    self.client, self.subscribed = client, set()
+                    await self.subscribe()
+                    attempt = 0
+                    async for message in messages:
+                        for _, args in hub_calls(message):
+                            self.receive(args)
+                logger.warning("Scores en direct : flux fermé par le serveur")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Scores en direct : connexion au hub interrompue ({e!r})")
+            finally:
+                self.client = None
+            attempt += 1
+            await asyncio.sleep(self.policy.delay(attempt))
+
+    async def subscribe(self) -> None:
+        """
+        Abonne la connexion courante aux matchs suivis qui ne le sont pas encore.
+        Le résultat de l'appel contient le score courant du match.
+        """
+        client, subscribed = self.client, self.subscribed
+        if client is None:
+            return
+        for live_code in set(self.matches) - subscribed:
+            # Connexion remplacée ou fermée pendant un appel : la nouvelle s'abonne elle-même
+            if self.client is not client:
+                return
+            # Marqué avant l'appel : un abonnement concurrent ne le redemande pas
+            if live_code in subscribed:
+                continue
+            subscribed.add(live_code)
+            try:
+                result = await client.invoke(LIVE_SCORE_METHOD, str(live_code), LIVE_SCORE_FEDERATION)
+            except Exception:
+                subscribed.discard(live_code)
+                raise
+            self.receive(result)
+
+    def receive(self, data: Any) -> None:
+        """
+        Met en attente les scores reçus pour les matchs suivis jusqu'à la prochaine écriture.
+        """
+        for score in parse_live_scores(data):
+            if score.live_code in self.matches:
+                self.pending[score.live_code] = score
+        if self.pending and self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_after_debounce(), context=contextvars.Context())
+
+    async def flush_after_debounce(self) -> None:
+        await asyncio.sleep(self.debounce)
+        self.flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Écrit en un lot les changements de set et de score en attente.
+        """
+        change_outbox.start_run()
+        pending, self.pending = self.pending, {}
+        updates, changes, previous_matches = [], [], []
+        for live_code, score in pending.items():
+            match = self.matches.get(live_code)
+            if match is None:
+                continue
+            updated_match, match_changes = apply_live_score(match, score)
+            if match_changes:
+                updates.append(updated_match)
+                changes.append(match_changes)
+                previous_matches.append(match)
+        if not updates:
+            return
+
+        # Le prochain score reçu (ou le prochain CSV) reprendra les mises à jour en échec
+        try:
+            saved = await bulk_upsert_matches(await get_session(), updates, changes)
+        except BulkUpsertError as e:
+            saved = e.saved
+            logger.error(f"Scores en direct : échec de l'écriture de {saved.count(None)} matchs sur {len(updates)} : {e}")
+        except Exception as e:
+            logger.error(f"Scores en direct : échec de l'écriture de {len(updates)} matchs : {e}")
+            return
+        change_outbox.record_all("match", previous_matches, saved, OUTBOX_SOURCE)
+        if self.save_changes is not None:
+            self.save_changes()
+        saved = [match for match in saved if match is not None]
+        for match in saved:
+            if match.status == MatchStatus.FINISHED:
+                self.matches.pop(match.live_code, None)
+            else:
+                self.matches[match.live_code] = match
+        logger.info(f"Scores en direct : {len(saved)} matchs mis à jour")
+
+    async def stop(self) -> None:
+        """
+        Ferme la connexion au hub et écrit les scores en attente.
+        """
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            logger.info("Scores en direct : connexion au hub fermée")
+        self.task = None
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+            await self.flush()
+
+
+live_score_service = LiveScoreService()
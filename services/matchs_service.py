@@ -1,62 +1,125 @@
 from typing import Optional, Set, List
 import aiohttp
 from datetime import datetime, timezone
-from api.matches_api import create_match, deactivate_match, get_active_matches_by_pool_id, get_match_by_league_and_code, get_started_matches, update_match
+from api.bulk_api import BulkUpsertError
+from api.matches_api import bulk_deactivate_matches, bulk_upsert_matches, create_match, get_active_matches_by_pool_id, get_match_by_league_and_code, get_started_matches, update_match
 from models.match import Match, MatchStatus
+from utils.change_outbox import change_outbox
 from utils.handlers.error_handler import handle_errors
+from utils.http_client import get_session
 from config.logger_config import logger
 
-@handle_errors
-async def add_or_update_match(session: aiohttp.ClientSession, match: Match, existing_match: Optional[Match]) -> Match:
+OUTBOX_SOURCE = "matchs_service"
+
+def validate_match(match: Match) -> None:
     """
-    Vérifie l'existence d'un match et le met à jour ou le crée selon les besoins.
+    Vérifie la présence des champs obligatoires d'un match.
     """
-    # Vérification des champs requis
     required_fields = ['league_code', 'match_code', 'pool_id', 'team_id_a', 'team_id_b', 'match_date']
     missing_fields = [field for field in required_fields if not getattr(match, field, None)]
     if missing_fields:
         raise ValueError(f"Les champs obligatoires suivants sont manquants : {', '.join(missing_fields)}.")
+
+
+def get_match_changes(match: Match, existing_match: Match) -> list[str]:
+    """
+    Reporte l'id du match existant sur `match` et liste les changements à appliquer.
+    Un match qui n'est plus à venir n'est jamais modifié.
+    """
+    if existing_match.status != MatchStatus.UPCOMING:
+        return []
+
+    changes = []
+    match.id = existing_match.id
+
+    field_mappings = {
+        "active": not existing_match.active,
+        "team_id_a": existing_match.team_id_a != match.team_id_a,
+        "team_id_b": existing_match.team_id_b != match.team_id_b,
+        "match_date": match.league_code != 'AALNV' and existing_match.match_date.isoformat() != match.match_date.isoformat(),
+        "set": existing_match.set != match.set,
+        "score": existing_match.score != match.score,
+        "status": existing_match.status != match.status,
+        "venue": existing_match.venue != match.venue,
+        "referee1": existing_match.referee1 != match.referee1,
+        "referee2": existing_match.referee2 != match.referee2,
+    }
+
+    for field, has_changed in field_mappings.items():
+        if has_changed:
+            changes.append(f"{field}: {getattr(existing_match, field)} -> {getattr(match, field)}")
+    return changes
+
+
+@handle_errors
+async def add_or_update_match(session: aiohttp.ClientSession, match: Match, existing_match: Optional[Match]) -> Match:
+    """
+    Vérifie l'existence d'un match et le met à jour ou le crée selon les besoins.
+    """
+    # Vérification des champs requis
+    validate_match(match)
     
     if existing_match:
         # Cas où le match existe
-        if existing_match.status == MatchStatus.UPCOMING:
-            changes = []
-            match.id = existing_match.id
-
-            field_mappings = {
-                "active": not existing_match.active,
-                "team_id_a": existing_match.team_id_a != match.team_id_a,
-                "team_id_b": existing_match.team_id_b != match.team_id_b,
-                "match_date": match.league_code != 'AALNV' and existing_match.match_date.isoformat() != match.match_date.isoformat(),
-                "set": existing_match.set != match.set,
-                "score": existing_match.score != match.score,
-                "status": existing_match.status != match.status,
-                "venue": existing_match.venue != match.venue,
-                "referee1": existing_match.referee1 != match.referee1,
-                "referee2": existing_match.referee2 != match.referee2,
-            }
-
-            for field, has_changed in field_mappings.items():
-                if has_changed:
-                    changes.append(f"{field}: {getattr(existing_match, field)} -> {getattr(match, field)}")
-
-            if changes:
-                return await update_match(session, match, changes)
-            return existing_match
+        changes = get_match_changes(match, existing_match)
+        if changes:
+            updated_match = await update_match(session, match, changes)
+            change_outbox.record("match", existing_match, updated_match or match, OUTBOX_SOURCE)
+            return updated_match
         return existing_match
 
     # Cas où le match n'existe pas
     new_match = await create_match(session, match)
+    change_outbox.record("match", None, new_match or match, OUTBOX_SOURCE)
     logger.info(f"Match {match.match_code} (pool_id: {match.pool_id}) créé avec succès.")
     return new_match
 
 
 @handle_errors
-async def deactivate_matches(session: aiohttp.ClientSession, pool_id: int, scraped_match_codes: Set[str]) -> None:
+async def add_or_update_matches(session: aiohttp.ClientSession, matches: list[tuple[Match, Optional[Match]]]) -> list[Match]:
+    """
+    Version groupée de `add_or_update_match` pour des couples (match scrapé, match existant).
+    Seuls les matchs à créer ou à modifier sont envoyés, via `bulk_upsert_matches`.
+    Retourne les matchs à jour dans l'ordre de `matches`.
+    """
+    results = []
+    to_write, to_write_changes, to_write_existing, positions = [], [], [], []
+    for match, existing_match in matches:
+        validate_match(match)
+        changes = get_match_changes(match, existing_match) if existing_match else []
+        if existing_match and not changes:
+            results.append(existing_match)
+            continue
+        positions.append(len(results))
+        results.append(None)
+        to_write.append(match)
+        to_write_changes.append(changes)
+        to_write_existing.append(existing_match)
+
+    try:
+        saved = await bulk_upsert_matches(session, to_write, to_write_changes)
+    except BulkUpsertError as e:
+        # Écritures réussies enregistrées avant de remonter l'échec
+        change_outbox.record_all("match", to_write_existing, e.saved, OUTBOX_SOURCE)
+        raise e.error
+    change_outbox.record_all("match", to_write_existing, saved, OUTBOX_SOURCE)
+    for position, match in zip(positions, saved):
+        results[position] = match
+    return results
+
+
+@handle_errors
+async def deactivate_matches(
+    session: aiohttp.ClientSession,
+    pool_id: int,
+    scraped_match_codes: Set[str],
+    active_matches: Optional[List[Match]] = None
+) -> None:
     """
     Désactive les matchs qui existent en base mais n'ont pas été scrapés pour une pool spécifique.
+    `active_matches` permet de réutiliser l'état déjà récupéré par l'appelant plutôt que de le redemander à l'API.
     """
-    matches = await get_active_matches_by_pool_id(session, pool_id)
+    matches = active_matches if active_matches is not None else await get_active_matches_by_pool_id(session, pool_id)
     if not matches:
         return
 
@@ -65,12 +128,13 @@ async def deactivate_matches(session: aiohttp.ClientSession, pool_id: int, scrap
     if not matches_to_deactivate:
         return
 
-    for match in matches_to_deactivate:
-        try:
-            await deactivate_match(session, match.id)
+    errors = await bulk_deactivate_matches(session, [match.id for match in matches_to_deactivate])
+    change_outbox.record_deactivations("match", matches_to_deactivate, errors, OUTBOX_SOURCE)
+    for match, error in zip(matches_to_deactivate, errors):
+        if error:
+            logger.error(f"Erreur lors de la désactivation du match {match.match_code} (ID: {match.id}): {error}")
+        else:
             logger.info(f"Match {match.match_code} (ID: {match.id}) désactivé avec succès.")
-        except Exception as e:
-            logger.error(f"Erreur lors de la désactivation du match {match.match_code} (ID: {match.id}): {e}")
 
 
 @handle_errors
@@ -79,14 +143,14 @@ async def log_started_matches() -> None:
     Logue les matchs qui ont commencé.
     """
     current_time = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
-    async with aiohttp.ClientSession() as session:
-        started_matches = await get_started_matches(session, MatchStatus.UPCOMING, True, current_time)
-
-        if started_matches:
-            logger.info("Matchs en cours :")
-            for match in started_matches:
-                logger.info(f"Match {match.match_code} dans la ligue {match.league_code}: "
-                            f"équipe A ({match.team_id_a}) vs équipe B ({match.team_id_b}) "
-                            f"à {match.match_date} à {match.venue}")
-        else:
-            logger.info("Aucun match en cours trouvé.")
\ No newline at end of file
+    session = await get_session()
+    started_matches = await get_started_matches(session, MatchStatus.UPCOMING, True, current_time)
+
+    if started_matches:
+        logger.info("Matchs en cours :")
+        for match in started_matches:
+            logger.info(f"Match {match.match_code} dans la ligue {match.league_code}: "
+                        f"équipe A ({match.team_id_a}) vs équipe B ({match.team_id_b}) "
+                        f"à {match.match_date} à {match.venue}")
+    else:
+        logger.info("Aucun match en cours trouvé.")
\ No newline at end of file
@@ -1,10 +1,13 @@
 from typing import Optional
 import aiohttp
-from api.pools_api import create_pool, deactivate_pool, get_active_pools_by_league_code, update_pool
+from api.pools_api import bulk_deactivate_pools, create_pool, get_active_pools_by_league_code, update_pool
 from models.pool import Pool
+from utils.change_outbox import change_outbox
 from utils.handlers.error_handler import handle_errors
 from config.logger_config import logger
 
+OUTBOX_SOURCE = "pools_service"
+
 @handle_errors
 async def add_or_update_pool(session: aiohttp.ClientSession, pool: Pool, existing_pool: Optional[Pool]) -> Pool:
     """
@@ -28,27 +31,41 @@ async def add_or_update_pool(session: aiohttp.ClientSession, pool: Pool, existin
             changes.append("Pool réactivée.")
 
         if changes:
-            return await update_pool(session, pool, changes)
+            updated_pool = await update_pool(session, pool, changes)
+            change_outbox.record("pool", existing_pool, updated_pool or pool, OUTBOX_SOURCE)
+            return updated_pool
         return existing_pool
     else:
         new_pool = await create_pool(session, pool)
+        change_outbox.record("pool", None, new_pool or pool, OUTBOX_SOURCE)
         logger.info(f"Pool {pool.pool_code} créée avec succès.")
         return new_pool
 
 
 @handle_errors
-async def deactivate_pools(session: aiohttp.ClientSession, league_code: str, scraped_pool_codes: set) -> None:
+async def deactivate_pools(
+    session: aiohttp.ClientSession,
+    league_code: str,
+    scraped_pool_codes: set,
+    active_pools: Optional[list[Pool]] = None
+) -> None:
     """
     Désactive les pools qui n'ont pas été scrapées pour une ligue spécifique.
+    `active_pools` permet de réutiliser l'état déjà récupéré par l'appelant ; il doit couvrir
+    toutes les saisons de la ligue, comme `get_active_pools_by_league_code`.
     """
-    pools = await get_active_pools_by_league_code(session, league_code)
+    pools = active_pools if active_pools is not None else await get_active_pools_by_league_code(session, league_code)
     if not pools:
         return
 
     pools_to_deactivate = [pool for pool in pools if pool.pool_code not in scraped_pool_codes]
-    for pool in pools_to_deactivate:
-        try:
-            await deactivate_pool(session, pool.id)
-            logger.info(f"Pool {pool.pool_code} (ID: {pool.id}) désactivée avec succès.")
-        except Exception as e:
-            logger.error(f"Erreur lors de la désactivation de la pool {pool.pool_code} (ID: {pool.id}): {e}")
\ No newline at end of file
+    if not pools_to_deactivate:
+        return
+
+    errors = await bulk_deactivate_pools(session, [pool.id for pool in pools_to_deactivate])
+    change_outbox.record_deactivations("pool", pools_to_deactivate, errors, OUTBOX_SOURCE)
+    for pool, error in zip(pools_to_deactivate, errors):
+        if error:
+            logger.error(f"Erreur lors de la désactivation de la pool {pool.pool_code} (ID: {pool.id}): {error}")
+        else:
+            logger.info(f"Pool {pool.pool_code} (ID: {pool.id}) désactivée avec succès.")
\ No newline at end of file
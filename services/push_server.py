@@ -0,0 +1,108 @@
+import asyncio
+import json
+from typing import Optional
+from aiohttp import web
+from config.env_config import PUSH_FEED_HOST, PUSH_FEED_PORT
+from config.logger_config import logger
+from models.change_event import ChangeEvent
+from utils.change_feed import ChangeFeed, Subscription, change_feed
+
+KEEPALIVE_INTERVAL = 15  # Commentaire SSE / ping WebSocket envoyé en l'absence d'événement (s)
+TOPIC_PARAMS = ("pool", "league", "team")
+
+
+def request_topics(request: web.Request) -> set[str]:
+    """
+    Sujets demandés dans la requête : `?pool=12,13&league=ABCCS&team=42` (aucun = tous les événements).
+    """
+    return {
+        f"{param}:{value.strip()}"
+        for param in TOPIC_PARAMS
+        for values in request.query.getall(param, [])
+        for value in values.split(',') if value.strip()
+    }
+
+
+def request_last_seq(request: web.Request) -> Optional[int]:
+    """
+    Dernier événement reçu par le client (en-tête Last-Event-ID ou paramètre `last_event_id`).
+    """
+    value = request.headers.get("Last-Event-ID") or request.query.get("last_event_id")
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def create_push_app(feed: ChangeFeed = change_feed) -> web.Application:
+    """
+    Application aiohttp du flux de changements :
+    - GET /events : Server-Sent Events, reprise via Last-Event-ID ;
+    - GET /ws : WebSocket, un message JSON par événement.
+    L'annulation d'un handler (client parti, arrêt du serveur) retire son abonnement, puis est propagée.
+    """
+    async def next_event(subscription: Subscription) -> Optional[ChangeEvent]:
+        try:
+            return await asyncio.wait_for(subscription.next(), KEEPALIVE_INTERVAL)
+        except asyncio.TimeoutError:
+            return None
+
+    async def events(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        subscription = feed.subscribe(request_topics(request), request_last_seq(request))
+        try:
+            while not subscription.overflowed:
+                event = await next_event(subscription)
+                if event is None:
+                    await response.write(b": keep-alive\n\n")
+                    continue
+                payload = json.dumps(event.to_dict(), ensure_ascii=False)
+                await response.write(f"id: {event.seq}\nevent: {event.type}\ndata: {payload}\n\n".encode("utf-8"))
+        except ConnectionResetError:
+            pass
+        finally:
+            feed.unsubscribe(subscription)
+        return response
+
+    async def websocket(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(heartbeat=KEEPALIVE_INTERVAL)
+        await ws.prepare(request)
+        subscription = feed.subscribe(request_topics(request), request_last_seq(request))
+        try:
+            while not ws.closed and not subscription.overflowed:
+                event = await next_event(subscription)
+                if event is not None:
+                    await ws.send_json(event.to_dict())
+        except ConnectionResetError:
+            pass
+        finally:
+            feed.unsubscribe(subscription)
+            await ws.close()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/events", events)
+    app.router.add_get("/ws", websocket)
+    return app
+
+
+_runner: Optional[web.AppRunner] = None
+
+
+async def start_push_server() -> None:
+    """
+    Démarre le serveur du flux de changements sur PUSH_FEED_HOST:PUSH_FEED_PORT.
+    """
+    global _runner
+    _runner = web.AppRunner(create_push_app())
+    await _runner.setup()
+    await web.TCPSite(_runner, PUSH_FEED_HOST, PUSH_FEED_PORT).start()
+    logger.info(f"Flux de changements disponible sur http://{PUSH_FEED_HOST}:{PUSH_FEED_PORT}/events et /ws")
+
+
+async def stop_push_server() -> None:
+    global _runner
+    if _runner is not None:
+        await _runner.cleanup()
+        _runner = None
@@ -1,53 +1,118 @@
 from typing import Optional
 import aiohttp
-from api.teams_api import create_team, deactivate_team, get_active_teams_by_pool_id, update_team
+from api.bulk_api import BulkUpsertError
+from api.teams_api import bulk_deactivate_teams, bulk_upsert_teams, create_team, get_active_teams_by_pool_id, update_team
 from models.team import Team
+from utils.change_outbox import change_outbox
 from utils.handlers.error_handler import handle_errors
 from config.logger_config import logger
 
-@handle_errors
-async def add_or_update_team(session: aiohttp.ClientSession, team: Team, existing_team: Optional[Team]) -> Team:
+OUTBOX_SOURCE = "teams_service"
+
+def validate_team(team: Team) -> None:
     """
-    Vérifie l'existence d'une équipe et la met à jour ou la crée selon les besoins.
+    Vérifie la présence des champs obligatoires d'une équipe.
     """
     required_fields = ['pool_id', 'team_name']
     missing_fields = [field for field in required_fields if not getattr(team, field, None)]
     if missing_fields:
         raise ValueError(f"Les champs obligatoires suivants sont manquants : {', '.join(missing_fields)}.")
 
+
+def get_team_changes(team: Team, existing_team: Team) -> list[str]:
+    """
+    Reporte l'id de l'équipe existante sur `team` et liste les changements à appliquer.
+    """
+    team.id = existing_team.id
+    changes = []
+    if existing_team.club_id != team.club_id:
+        changes.append(f"club_id: {existing_team.club_id} -> {team.club_id}")
+    if not existing_team.active:
+        team.active = True
+        changes.append("Équipe réactivée")
+    return changes
+
+
+@handle_errors
+async def add_or_update_team(session: aiohttp.ClientSession, team: Team, existing_team: Optional[Team]) -> Team:
+    """
+    Vérifie l'existence d'une équipe et la met à jour ou la crée selon les besoins.
+    """
+    validate_team(team)
+
     if existing_team:
-        team.id = existing_team.id
-        changes = []
-        if existing_team.club_id != team.club_id:
-            changes.append(f"club_id: {existing_team.club_id} -> {team.club_id}")
-        if not existing_team.active:
-            team.active = True
-            changes.append("Équipe réactivée")
+        changes = get_team_changes(team, existing_team)
         if changes:
-            return await update_team(session, team, changes)
+            updated_team = await update_team(session, team, changes)
+            change_outbox.record("team", existing_team, updated_team or team, OUTBOX_SOURCE)
+            return updated_team
         return existing_team
     else:
         new_team = await create_team(session, team)
+        change_outbox.record("team", None, new_team or team, OUTBOX_SOURCE)
         logger.info(f"Équipe {team.team_name} créée avec succès.")
         return new_team
 
 
 @handle_errors
-async def deactivate_teams(session: aiohttp.ClientSession, pool_id: int, scraped_team_names: set) -> None:
+async def add_or_update_teams(session: aiohttp.ClientSession, teams: list[tuple[Team, Optional[Team]]]) -> list[Team]:
+    """
+    Version groupée de `add_or_update_team` pour des couples (équipe scrapée, équipe existante).
+    Seules les équipes à créer ou à modifier sont envoyées, via `bulk_upsert_teams`.
+    Retourne les équipes à jour dans l'ordre de `teams`.
+    """
+    results = []
+    to_write, to_write_changes, to_write_existing, positions = [], [], [], []
+    for team, existing_team in teams:
+        validate_team(team)
+        changes = get_team_changes(team, existing_team) if existing_team else []
+        if existing_team and not changes:
+            results.append(existing_team)
+            continue
+        positions.append(len(results))
+        results.append(None)
+        to_write.append(team)
+        to_write_changes.append(changes)
+        to_write_existing.append(existing_team)
+
+    try:
+        saved = await bulk_upsert_teams(session, to_write, to_write_changes)
+    except BulkUpsertError as e:
+        # Écritures réussies enregistrées avant de remonter l'échec
+        change_outbox.record_all("team", to_write_existing, e.saved, OUTBOX_SOURCE)
+        raise e.error
+    change_outbox.record_all("team", to_write_existing, saved, OUTBOX_SOURCE)
+    for position, team in zip(positions, saved):
+        results[position] = team
+    return results
+
+
+@handle_errors
+async def deactivate_teams(
+    session: aiohttp.ClientSession,
+    pool_id: int,
+    scraped_team_names: set,
+    active_teams: Optional[list[Team]] = None
+) -> None:
     """
     Désactive les équipes qui existent en base mais n'ont pas été scrapées pour une pool spécifique.
+    `active_teams` permet de réutiliser l'état déjà récupéré par l'appelant plutôt que de le redemander à l'API.
     """
     if not isinstance(pool_id, int) or pool_id <= 0:
         raise ValueError(f"pool_id invalide : {pool_id}")
 
-    teams = await get_active_teams_by_pool_id(session, pool_id)
+    teams = active_teams if active_teams is not None else await get_active_teams_by_pool_id(session, pool_id)
     if not teams:
         return
 
     teams_to_deactivate = [team for team in teams if team.team_name not in scraped_team_names]
-    for team in teams_to_deactivate:
-        try:
-            await deactivate_team(session, team.id)
-            logger.info(f"Équipe {team.team_name} (ID: {team.id}) désactivée avec succès.")
-        except Exception as e:
-            logger.error(f"Erreur lors de la désactivation de l'équipe {team.team_name} (ID: {team.id}): {e}")
\ No newline at end of file
+    if not teams_to_deactivate:
+        return
+
+    errors = await bulk_deactivate_teams(session, [team.id for team in teams_to_deactivate])
+    change_outbox.record_deactivations("team", teams_to_deactivate, errors, OUTBOX_SOURCE)
+    for team, error in zip(teams_to_deactivate, errors):
+        if error:
+            logger.error(f"Erreur lors de la désactivation de l'équipe {team.team_name} (ID: {team.id}): {error}")
+        else:
+            logger.info(f"Équipe {team.team_name} (ID: {team.id}) désactivée avec succès.")
\ No newline at end of file
@@ -0,0 +1,129 @@
+from dataclasses import replace
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+from api import bulk_api
+from api.bulk_api import BulkUpsertError
+from api.matches_api import bulk_deactivate_matches, bulk_upsert_matches, create_match, update_match
+from models.match import Match, MatchStatus
+from services.matchs_service import add_or_update_matches
+from tests.utils.fake_match_factory import FakeMatchFactory
+from utils.change_outbox import change_outbox
+from utils.world_state import world_state
+
+MATCH_API_URL = 'http://localhost:8083/api/matches'
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+@pytest.fixture
+def mocked_aioresponses():
+    bulk_api._bulk_support.clear()
+    with aioresponses(strict=True) as m:
+        yield m
+    bulk_api._bulk_support.clear()
+    world_state.clear()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_matches_uses_bulk_endpoint(session, mocked_aioresponses):
+    factory = FakeMatchFactory()
+    matches = [factory.create() for _ in range(3)]
+
+    mocked_aioresponses.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=204, headers={"Allow": "POST, OPTIONS"})
+    mocked_aioresponses.post(f"{MATCH_API_URL}/bulk", payload=[match.to_dict() for match in matches])
+
+    result = await bulk_upsert_matches(session, matches)
+
+    assert [match.id for match in result] == [match.id for match in matches]
+    assert [match.match_code for match in result] == [match.match_code for match in matches]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_matches_falls_back_to_single_calls(session, mocked_aioresponses):
+    factory = FakeMatchFactory()
+    existing_match = factory.create()
+    new_match = factory.create()
+    new_match.id = None
+    created_match = factory.create()
+    created_match.match_code = new_match.match_code
+
+    mocked_aioresponses.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=404)
+    mocked_aioresponses.put(f"{MATCH_API_URL}/{existing_match.id}", payload=existing_match.to_dict())
+    mocked_aioresponses.post(MATCH_API_URL, payload=created_match.to_dict())
+
+    result = await bulk_upsert_matches(session, [existing_match, new_match])
+
+    assert result[0].id == existing_match.id
+    assert result[1].id == created_match.id
+    assert result[1].match_code == new_match.match_code
+
+
+@pytest.mark.asyncio
+async def test_bulk_deactivate_matches_falls_back_to_single_calls(session, mocked_aioresponses):
+    mocked_aioresponses.add(f"{MATCH_API_URL}/bulk/deactivate", method="OPTIONS", status=404)
+    mocked_aioresponses.put(f"{MATCH_API_URL}/1/deactivate", status=204)
+    mocked_aioresponses.put(f"{MATCH_API_URL}/2/deactivate", status=404, payload={"message": "Match introuvable"})
+
+    errors = await bulk_deactivate_matches(session, [1, 2])
+
+    assert errors[0] is None
+    assert "Erreur API 404: Match introuvable" in str(errors[1])
+
+
+
+@pytest.mark.asyncio
+async def test_failed_single_call_keeps_the_other_writes(session, mocked_aioresponses):
+    factory = FakeMatchFactory()
+    existing_match = factory.create()
+    new_match = factory.create()
+    new_match.id = None
+
+    mocked_aioresponses.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=404)
+    mocked_aioresponses.put(f"{MATCH_API_URL}/{existing_match.id}", payload=existing_match.to_dict())
+    mocked_aioresponses.post(MATCH_API_URL, status=400, payload={"message": "Match invalide"})
+
+    with pytest.raises(BulkUpsertError, match="Erreur API 400: Match invalide") as error:
+        await bulk_upsert_matches(session, [existing_match, new_match])
+
+    assert [match.id if match else None for match in error.value.saved] == [existing_match.id, None]
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_batch_keeps_the_other_batches(session, mocked_aioresponses):
+    factory = FakeMatchFactory()
+    matches = [factory.create() for _ in range(2)]
+
+    mocked_aioresponses.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=204, headers={"Allow": "POST, OPTIONS"})
+    mocked_aioresponses.post(f"{MATCH_API_URL}/bulk", payload=[matches[0].to_dict()])
+    mocked_aioresponses.post(f"{MATCH_API_URL}/bulk", status=400, payload={"message": "Lot invalide"})
+
+    with pytest.raises(BulkUpsertError) as error:
+        await bulk_api.bulk_upsert(
+            session, MATCH_API_URL, Match, matches, create_match, update_match, batch_size=1
+        )
+
+    assert [match.id if match else None for match in error.value.saved] == [matches[0].id, None]
+    assert world_state.entities["match"].get(matches[0].id) is not None
+
+
+@pytest.mark.asyncio
+async def test_add_or_update_matches_records_the_successful_writes(session, mocked_aioresponses):
+    factory = FakeMatchFactory()
+    existing_match = factory.create(MatchStatus.UPCOMING)
+    updated_match = replace(existing_match, venue="Nouveau gymnase")
+    new_match = replace(factory.create(), id=None)
+
+    mocked_aioresponses.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=404)
+    mocked_aioresponses.put(f"{MATCH_API_URL}/{existing_match.id}", payload=updated_match.to_dict())
+    mocked_aioresponses.post(MATCH_API_URL, status=400, payload={"message": "Match invalide"})
+    change_outbox.start_run()
+
+    with pytest.raises(Exception, match="Erreur API 400: Match invalide"):
+        await add_or_update_matches(session, [(updated_match, existing_match), (new_match, None)])
+
+    assert [(record.entity_id, record.action) for record in change_outbox.pending.get()] == [(existing_match.id, "updated")]
@@ -0,0 +1,181 @@
+from dataclasses import replace
+from datetime import datetime
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+from api import bulk_api
+from models import scraper as scraper_module
+from models.live_match import LiveMatch
+from models.match import Match, MatchStatus
+from scrapers import pro_scraper
+from scrapers.pro_scraper import ProScraper
+from utils.fingerprint_store import FingerprintStore
+from utils.html_extraction import extract_dataproject_matches
+from utils.http_cache import HttpCache
+from utils.world_state import world_state
+
+MATCH_API_URL = "http://localhost:8083/api/matches"
+XML_URL = "https://www.lnv.fr/xml/calendrier-TEST.xml"
+POOL_ID = 12
+
+
+def make_xml(score_j2: str) -> str:
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<Calendrier>
+  <Match><Journee>1</Journee><CodeMatch>LAM001</CodeMatch><Date>05-10-2024</Date><Heure>20:00:00</Heure><Score>3-1</Score></Match>
+  <Match><Journee>2</Journee><CodeMatch>LAM002</CodeMatch><Date>12-10-2024</Date><Heure>20:00:00</Heure><Score>{score_j2}</Score></Match>
+</Calendrier>"""
+
+
+def make_match(match_id: int, code: str, match_date: datetime, set: str = None) -> dict:
+    return Match(
+        match_code=code, league_code="AALNV", pool_id=POOL_ID, team_id_a=1, team_id_b=2,
+        match_date=match_date, status=MatchStatus.UPCOMING, id=match_id, set=set,
+    ).to_dict()
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def stores(tmp_path, monkeypatch):
+    cache = HttpCache(str(tmp_path / "http_cache.json"))
+    monkeypatch.setattr(scraper_module, "http_cache", cache)
+    monkeypatch.setattr(pro_scraper, "http_cache", cache)
+    monkeypatch.setattr(pro_scraper, "xml_fingerprints", FingerprintStore(str(tmp_path / "xml_fingerprints.json")))
+    bulk_api._bulk_support.clear()
+    world_state.clear()
+    yield
+    bulk_api._bulk_support.clear()
+    world_state.clear()
+
+
+def put_calls(mocked):
+    return sorted(
+        str(url) for (method, url), calls in mocked.requests.items() if method == "PUT" for _ in calls
+    )
+
+
+@pytest.mark.asyncio
+async def test_parse_and_update_matches_skips_unchanged_journees(session):
+    existing = [
+        make_match(1, "LAM001", datetime(2024, 10, 5, 20, 0)),
+        make_match(2, "LAM002", datetime(2024, 10, 12, 20, 0)),
+    ]
+    scraper = ProScraper(session)
+
+    with aioresponses() as mocked:
+        mocked.get(XML_URL, body=make_xml("0-0"))
+        mocked.get(f"{MATCH_API_URL}/pool/{POOL_ID}", payload=existing)
+        mocked.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=404)
+        mocked.put(f"{MATCH_API_URL}/1", payload=existing[0])
+
+        await scraper.parse_and_update_matches(XML_URL, POOL_ID)
+        # Seul le match de la journée 1 a un set à reporter
+        assert put_calls(mocked) == [f"{MATCH_API_URL}/1"]
+
+    # Les matchs de la pool sont lus dans l'état résident, mis à jour par l'écriture précédente
+    with aioresponses() as mocked:
+        mocked.get(XML_URL, body=make_xml("3-0"))
+        mocked.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=404)
+        mocked.put(f"{MATCH_API_URL}/2", payload=existing[1])
+
+        await scraper.parse_and_update_matches(XML_URL, POOL_ID)
+        # La journée 1 est inchangée et n'est pas réexaminée
+        assert put_calls(mocked) == [f"{MATCH_API_URL}/2"]
+
+
+
+@pytest.mark.asyncio
+async def test_parse_and_update_matches_reexamines_matches_modified_since(session):
+    existing = [
+        make_match(1, "LAM001", datetime(2024, 10, 5, 20, 0), set="3-1"),
+        make_match(2, "LAM002", datetime(2024, 10, 12, 20, 0)),
+    ]
+    scraper = ProScraper(session)
+
+    with aioresponses() as mocked:
+        mocked.get(XML_URL, body=make_xml("0-0"))
+        mocked.get(f"{MATCH_API_URL}/pool/{POOL_ID}", payload=existing)
+
+        await scraper.parse_and_update_matches(XML_URL, POOL_ID)
+        assert put_calls(mocked) == []
+
+    # Le CSV a modifié le score du match de la journée 1 : le flux identique est réexaminé
+    world_state.put("match", replace(world_state.entities["match"][1], set="2-3"))
+    with aioresponses() as mocked:
+        mocked.get(XML_URL, body=make_xml("0-0"))
+        mocked.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=404)
+        mocked.put(f"{MATCH_API_URL}/1", payload=existing[0])
+
+        await scraper.parse_and_update_matches(XML_URL, POOL_ID)
+        assert put_calls(mocked) == [f"{MATCH_API_URL}/1"]
+
+def test_iter_xml_matches_reads_all_matches(monkeypatch):
+    monkeypatch.setattr(pro_scraper, "XML_FEED_SIZE", 16)
+    matches = list(ProScraper.iter_xml_matches(make_xml("0-0")))
+    assert [m["code"] for m in matches] == ["LAM001", "LAM002"]
+    assert matches[1] == {"code": "LAM002", "journee": "2", "date": "12-10-2024 20:00:00", "set": "0-0"}
+
+
+def make_dataproject_page(matches: list[tuple[str, str, str, str]]) -> str:
+    blocks = "".join(
+        f"""<div id="ctl00_Content_Main_1_userControl_RADLIST_Legs_ctrl0_RADLIST_Matches_ctrl{2 * i}_RPL_Match">
+          <div onclick="window.open('MatchStatistics.aspx?mID={mid}&ID=115')"></div>
+          <span id="Content_Label2">{home}</span><span id="Content_Label4">{guest}</span>
+          <span id="Content_LB_DataOra">{date}</span>
+        </div>"""
+        for i, (mid, home, guest, date) in enumerate(matches)
+    )
+    return f"""<html><body>
+      <span id="Content_Main_1_userControl_lbl_title">Calendrier</span>
+      <div id="ctl00_Content_Main_1_userControl_RADLIST_Legs_ctrl0_RPL_Leg">{blocks}</div>
+    </body></html>"""
+
+
+@pytest.mark.asyncio
+async def test_add_match_live_code_resolves_locally_and_writes_changes_only(session):
+    page_url = "http://lnv-web.dataproject.com/CompetitionMatches.aspx?ID=115"
+    teams = [
+        {"id": 1, "pool_id": POOL_ID, "team_name": "Montpellier Herault SCV", "club_id": "C1"},
+        {"id": 2, "pool_id": POOL_ID, "team_name": "TOURS Volley-Ball", "club_id": "C2"},
+    ]
+    matches = [
+        dict(make_match(10, "LAM001", datetime(2024, 10, 5, 20, 0)), live_code=555),
+        make_match(11, "LAM002", datetime(2024, 10, 12, 20, 0)),
+    ]
+    matches[1].update(team_id_a=2, team_id_b=1)
+    page = make_dataproject_page([
+        ("555", "Montpellier", "Tours", "05/10/2024 - 20:00"),
+        ("556", "Tours", "Montpellier", "12/10/2024 - 20:00"),
+    ])
+
+    with aioresponses() as mocked:
+        mocked.get(page_url, body=page)
+        mocked.get(f"http://localhost:8082/api/teams/pool/{POOL_ID}", payload=teams)
+        mocked.get(f"{MATCH_API_URL}/pool/{POOL_ID}", payload=matches)
+        mocked.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=404)
+        mocked.put(f"{MATCH_API_URL}/11", payload=dict(matches[1], live_code=556))
+
+        await ProScraper(session).add_match_live_code(page_url, POOL_ID, "M")
+
+        # Aucune recherche unitaire, et seul le code live modifié est écrit
+        assert put_calls(mocked) == [f"{MATCH_API_URL}/11"]
+        assert not any("search" in str(url) for _, url in mocked.requests)
+
+
+def test_extract_dataproject_matches_returns_records_in_page_order():
+    page = make_dataproject_page([
+        ("555", "Montpellier", "Tours", "05/10/2024 - 20:00"),
+        ("556", "Tours", "Montpellier", "12/10/2024 - 20:30"),
+    ])
+    main_id, records = extract_dataproject_matches(page)
+
+    assert main_id == "1"
+    assert records == [
+        LiveMatch("555", "Montpellier", "Tours", datetime(2024, 10, 5, 20, 0)),
+        LiveMatch("556", "Tours", "Montpellier", datetime(2024, 10, 12, 20, 30)),
+    ]
@@ -0,0 +1,143 @@
+import asyncio
+import json
+from dataclasses import replace
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from models.live_score import LiveScore
+from models.match import MatchStatus
+from services import live_score_service as live_score_module
+from services.live_score_service import LiveScoreService, apply_live_score, parse_live_scores
+from tests.utils.fake_match_factory import FakeMatchFactory
+from utils.change_outbox import change_outbox
+from utils.signalr_client import SignalRClient, hub_calls
+
+
+def test_parse_live_scores_from_nested_payload():
+    payload = json.dumps({"Data": [
+        {"ChampionshipMatchID": 8094, "WonSetHome": 1, "WonSetGuest": 1,
+         "Set1Home": 25, "Set1Guest": 20, "Set2Home": 23, "Set2Guest": 25, "Set3Home": 4, "Set3Guest": 2,
+         "Set4Home": 0, "Set4Guest": 0},
+        {"Message": "sans score"},
+    ]})
+
+    assert parse_live_scores(payload) == [LiveScore(live_code=8094, set="1-1", score="25-20,23-25,4-2")]
+
+
+def test_apply_live_score_finishes_match():
+    match = replace(FakeMatchFactory().create(MatchStatus.UPCOMING), set=None, score=None)
+
+    updated, changes = apply_live_score(match, LiveScore(8094, "3-1", "25-20,23-25,25-18,25-22"))
+
+    assert updated.status == MatchStatus.FINISHED
+    assert updated.set == "3-1"
+    assert changes == [
+        "set: 'None' -> '3-1'",
+        "score: 'None' -> '25-20,23-25,25-18,25-22'",
+        "status: UPCOMING -> FINISHED",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_point_by_point_scores_are_debounced(monkeypatch):
+    match = replace(FakeMatchFactory().create(MatchStatus.UPCOMING), live_code=8094, set=None, score=None, active=True)
+    written = []
+
+    async def fake_bulk_upsert_matches(session, matches, changes):
+        written.append((matches, changes))
+        return matches
+
+    async def fake_get_session():
+        return None
+
+    monkeypatch.setattr(live_score_module, "bulk_upsert_matches", fake_bulk_upsert_matches)
+    monkeypatch.setattr(live_score_module, "get_session", fake_get_session)
+    service = LiveScoreService(debounce=0.05)
+    service.matches = {8094: match}
+    # Changements du lot enregistrés dans l'outbox, propres à ce lot
+    saved_changes = []
+    service.save_changes = lambda: saved_changes.append([record.changes for record in change_outbox.pending.get()])
+
+    for home_points in range(1, 6):
+        service.receive({"MatchID": 8094, "WonSetHome": 0, "WonSetGuest": 0, "Set1Home": home_points, "Set1Guest": 3})
+    await asyncio.sleep(0.1)
+
+    assert len(written) == 1
+    (matches, _), = written
+    assert [m.score for m in matches] == ["5-3"]
+    assert service.matches[8094].score == "5-3"
+    assert saved_changes == [[{"set": [None, "0-0"], "score": [None, "5-3"]}]]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_subscribe_invokes_each_match_once():
+    invoked = []
+
+    class FakeClient:
+        async def invoke(self, method, *args):
+            invoked.append(args[0])
+            await asyncio.sleep(0.01)
+            return None
+
+    service = LiveScoreService()
+    service.matches = {8094: None, 8095: None}
+    service.client, service.subscribed = FakeClient(), set()
+
+    await asyncio.gather(service.subscribe(), service.subscribe())
+
+    assert sorted(invoked) == ["8094", "8095"]
+    assert service.subscribed == {8094, 8095}
+
+
+@pytest.mark.asyncio
+async def test_subscribe_without_connection_does_nothing():
+    service = LiveScoreService()
+    service.matches = {8094: None}
+
+    await service.subscribe()
+
+    assert service.subscribed == set()
+
+
+@pytest.mark.asyncio
+async def test_signalr_client_handshake_invoke_and_stream():
+    calls = []
+
+    async def negotiate(request):
+        return web.json_response({"ConnectionToken": "token", "ConnectionId": "id", "KeepAliveTimeout": 20})
+
+    async def connect(request):
+        assert request.query["connectionToken"] == "token"
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(b"data: initialized\n\n")
+        await asyncio.sleep(0.05)
+        await response.write(b"data: {}\n\n")
+        message = {"C": "d-1", "M": [{"H": "hub", "M": "updateLiveScore", "A": [{"MatchID": 8094}]}]}
+        await response.write(f"data: {json.dumps(message)}\n\n".encode())
+        return response
+
+    async def start(request):
+        return web.json_response({"Response": "started"})
+
+    async def send(request):
+        data = json.loads((await request.post())["data"])
+        calls.append((data["M"], data["A"]))
+        return web.json_response({"I": str(data["I"]), "R": {"ok": True}})
+
+    app = web.Application()
+    app.router.add_get("/signalr/negotiate", negotiate)
+    app.router.add_get("/signalr/connect", connect)
+    app.router.add_get("/signalr/start", start)
+    app.router.add_post("/signalr/send", send)
+
+    async with TestServer(app, host="127.0.0.1") as server:
+        async with aiohttp.ClientSession() as session:
+            client = SignalRClient(session, str(server.make_url("/signalr")), "hub")
+            async with client.connect(read_timeout=5) as messages:
+                assert await client.invoke("getLiveScoreListData_From_ES", "8094", "lnv") == {"ok": True}
+                received = [message async for message in messages]
+
+    assert calls == [("getLiveScoreListData_From_ES", ["8094", "lnv"])]
+    assert [hub_calls(message) for message in received] == [[("updateLiveScore", [{"MatchID": 8094}])]]
@@ -1,6 +1,8 @@
 import aiohttp
 import pytest
 from aioresponses import aioresponses
+from yarl import URL
+from api import bulk_api
 from models.match import MatchStatus
 from services.matchs_service import add_or_update_match, deactivate_matches
 from tests.utils.fake_match_factory import FakeMatchFactory
@@ -63,4 +65,21 @@ async def test_add_or_update_match_update_existing(session, mocked_aioresponses)
     result = await add_or_update_match(session, updated_match)
 
     assert result.id == existing_match.id
-    assert result.status == MatchStatus.FINISHED
\ No newline at end of file
+    assert result.status == MatchStatus.FINISHED
+
+@pytest.mark.asyncio
+async def test_deactivate_matches_uses_snapshot_and_bulk_endpoint(session, mocked_aioresponses):
+    bulk_api._bulk_support.clear()
+    factory = FakeMatchFactory()
+    kept_match = factory.create_active_match()
+    stale_matches = [factory.create_active_match() for _ in range(2)]
+
+    # Aucun GET /active : l'instantané fourni par l'appelant est utilisé
+    mocked_aioresponses.add(f"{MATCH_API_URL}/bulk/deactivate", method="OPTIONS", status=204, headers={"Allow": "PUT"})
+    mocked_aioresponses.put(f"{MATCH_API_URL}/bulk/deactivate", status=204)
+
+    await deactivate_matches(session, kept_match.pool_id, {kept_match.match_code}, [kept_match] + stale_matches)
+
+    call = mocked_aioresponses.requests[("PUT", URL(f"{MATCH_API_URL}/bulk/deactivate"))][0]
+    assert call.kwargs["json"] == [match.id for match in stale_matches]
+    bulk_api._bulk_support.clear()
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer, make_mocked_request
+from services.push_server import create_push_app
+from tests.utils.fake_match_factory import FakeMatchFactory
+from utils.change_feed import ChangeFeed
+
+
+def match_in_pool(pool_id, match_id):
+    match = FakeMatchFactory().create()
+    match.pool_id, match.id = pool_id, match_id
+    return match
+
+
+async def read_sse_events(response, count):
+    events = []
+    data = {}
+    async for raw_line in response.content:
+        line = raw_line.decode().rstrip("\n")
+        if line.startswith(("id:", "event:", "data:")):
+            key, _, value = line.partition(": ")
+            data[key] = value
+        elif not line and "data" in data:
+            events.append(data)
+            data = {}
+            if len(events) == count:
+                return events
+    return events
+
+
+def test_replay_after_last_seq_and_topic_filter():
+    feed = ChangeFeed(replay_size=2)
+    for match_id in range(1, 4):
+        feed.publish("match", "updated", match_in_pool(7, match_id), ["set: '1-0' -> '2-0'"])
+    feed.publish("match", "updated", match_in_pool(8, 4), [])
+
+    subscription = feed.subscribe({"pool:7"}, last_seq=1)
+
+    # Le tampon ne conserve que les 2 derniers événements : seul le 3e concerne la pool 7
+    assert [event.entity_id for event in list(subscription.queue._queue)] == [3]
+
+
+def test_slow_client_is_disconnected():
+    feed = ChangeFeed(replay_size=10, max_queue=1)
+    subscription = feed.subscribe()
+    feed.publish("match", "updated", match_in_pool(7, 1))
+    feed.publish("match", "updated", match_in_pool(7, 2))
+
+    assert subscription.overflowed
+
+
+@pytest.mark.asyncio
+async def test_sse_and_websocket_clients_receive_filtered_events():
+    feed = ChangeFeed()
+    async with TestServer(create_push_app(feed), host="127.0.0.1") as server:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(server.make_url("/events?pool=7")) as sse, \
+                    session.ws_connect(server.make_url("/ws?team=99")) as ws:
+                await asyncio.sleep(0.05)
+                feed.publish("match", "updated", match_in_pool(8, 1), ["score"])
+                other_pool = match_in_pool(7, 2)
+                other_pool.team_id_a = 99
+                feed.publish("match", "updated", other_pool, ["set: '0-0' -> '1-0'"])
+
+                events = await asyncio.wait_for(read_sse_events(sse, 1), 2)
+                message = await asyncio.wait_for(ws.receive_json(), 2)
+
+    assert events[0]["id"] == "2"
+    assert events[0]["event"] == "match.updated"
+    assert json.loads(events[0]["data"])["changes"] == ["set: '0-0' -> '1-0'"]
+    assert message["entity_id"] == 2
+    assert "team:99" in message["topics"]
+
+
+
+@pytest.mark.asyncio
+async def test_cancelled_sse_handler_unsubscribes_and_propagates():
+    feed = ChangeFeed()
+    app = create_push_app(feed)
+    request = make_mocked_request("GET", "/events", app=app)
+    match_info = await app.router.resolve(request)
+
+    handler = asyncio.create_task(match_info.handler(request))
+    await asyncio.sleep(0.05)
+    assert len(feed.subscriptions) == 1
+    handler.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await handler
+    assert not feed.subscriptions
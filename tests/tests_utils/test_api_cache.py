@@ -0,0 +1,128 @@
+import asyncio
+from dataclasses import replace
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+from api.teams_api import get_teams_by_pool, update_team
+from tests.utils.fake_team_factory import FakeTeamFactory
+from utils.api_cache import RunCache, api_cache
+
+TEAM_API_URL = "http://localhost:8082/api/teams"
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+async def in_run(operation):
+    """Exécute `operation` dans une tâche disposant de son propre cache de job."""
+    async def run():
+        run_cache = api_cache.start_run()
+        return run_cache, await operation()
+
+    return await asyncio.create_task(run())
+
+
+def get_calls(mocked, url):
+    return sum(len(calls) for (method, request_url), calls in mocked.requests.items() if method == "GET" and str(request_url) == url)
+
+
+@pytest.mark.asyncio
+async def test_identical_reads_are_coalesced_then_served_from_cache(session):
+    team = replace(FakeTeamFactory().create(), pool_id=5)
+
+    async def operation():
+        first = await asyncio.gather(*(get_teams_by_pool(session, 5) for _ in range(3)))
+        again = await get_teams_by_pool(session, 5)
+        return first, again
+
+    with aioresponses() as mocked:
+        mocked.get(f"{TEAM_API_URL}/pool/5", payload=[team.to_dict()], repeat=True)
+        run_cache, (first, again) = await in_run(operation)
+        assert get_calls(mocked, f"{TEAM_API_URL}/pool/5") == 1
+
+    assert [teams[0].team_name for teams in first] == [team.team_name] * 3
+    # Chaque appelant reçoit sa propre copie
+    assert first[0][0] is not first[1][0] and again[0] is not first[0][0]
+    stats = run_cache.stats["get_teams_by_pool"]
+    assert (stats.misses, stats.coalesced + stats.hits) == (1, 3)
+
+
+@pytest.mark.asyncio
+async def test_pending_read_is_shared_with_identical_requests():
+    run_cache = RunCache(ttl=60)
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch():
+        calls.append(True)
+        await release.wait()
+        return ["résultat"]
+
+    key = ("get_teams_by_pool", "team", (("pool_id", "5"),))
+    waiting = [asyncio.create_task(run_cache.get(key, {"pool_id": 5}, fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiting) == [["résultat"]] * 3
+    assert len(calls) == 1
+    assert run_cache.stats["get_teams_by_pool"].coalesced == 2
+
+
+
+@pytest.mark.asyncio
+async def test_cancelled_owner_does_not_cancel_shared_reads():
+    run_cache = RunCache(ttl=60)
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch():
+        calls.append(True)
+        await release.wait()
+        return ["résultat"]
+
+    key = ("get_teams_by_pool", "team", (("pool_id", "5"),))
+    owner = asyncio.create_task(run_cache.get(key, {"pool_id": 5}, fetch))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(run_cache.get(key, {"pool_id": 5}, fetch))
+    await asyncio.sleep(0)
+    owner.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    # La requête regroupée relance la lecture au lieu d'être annulée
+    assert await waiter == ["résultat"]
+    assert owner.cancelled()
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_reads_of_the_same_pool(session):
+    team = replace(FakeTeamFactory().create(), pool_id=5, id=50)
+    other = replace(FakeTeamFactory().create(), pool_id=6, id=60)
+
+    async def operation():
+        await get_teams_by_pool(session, 5)
+        await get_teams_by_pool(session, 6)
+        await update_team(session, replace(team, club_id="NEW"), ["club_id"])
+        return await get_teams_by_pool(session, 5), await get_teams_by_pool(session, 6)
+
+    with aioresponses() as mocked:
+        mocked.get(f"{TEAM_API_URL}/pool/5", payload=[team.to_dict()], repeat=True)
+        mocked.get(f"{TEAM_API_URL}/pool/6", payload=[other.to_dict()], repeat=True)
+        mocked.put(f"{TEAM_API_URL}/50", payload=replace(team, club_id="NEW").to_dict())
+        await in_run(operation)
+
+        assert get_calls(mocked, f"{TEAM_API_URL}/pool/5") == 2
+        assert get_calls(mocked, f"{TEAM_API_URL}/pool/6") == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_outside_a_run_are_not_cached(session):
+    with aioresponses() as mocked:
+        mocked.get(f"{TEAM_API_URL}/pool/7", payload=[], repeat=True)
+        await get_teams_by_pool(session, 7)
+        await get_teams_by_pool(session, 7)
+
+        assert get_calls(mocked, f"{TEAM_API_URL}/pool/7") == 2
@@ -0,0 +1,64 @@
+import asyncio
+from dataclasses import replace
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from models.base import Base
+from tests.utils.fake_match_factory import FakeMatchFactory
+from utils.change_outbox import ChangeOutbox, field_diffs
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_field_diffs_ignore_unchanged_and_technical_fields():
+    match = replace(FakeMatchFactory().create(), id=3, set="2-1")
+    updated = replace(match, id=None, set="3-1", last_update=None)
+
+    assert field_diffs(match, updated) == {"set": ["2-1", "3-1"]}
+    assert "venue" not in field_diffs(None, replace(match, venue=None))
+
+
+def test_records_are_read_back_after_cursor(db_session):
+    outbox = ChangeOutbox()
+    run_id = outbox.start_run()
+    match = replace(FakeMatchFactory().create(), id=12, set="0-0", active=True)
+
+    outbox.record("match", None, match, "matchs_service")
+    outbox.record("match", match, replace(match, set="1-0"), "pro_scraper")
+    outbox.record("match", match, match, "pro_scraper")  # Aucun changement : ignoré
+    outbox.record_deactivations("match", [match, match], [None, Exception("refusé")], "matchs_service")
+    outbox.save(db_session)
+    db_session.commit()
+
+    records = outbox.since(db_session)
+    assert [record.action for record in records] == ["created", "updated", "deactivated"]
+    assert [record.id for record in records] == sorted(record.id for record in records)
+    assert records[1].changes == {"set": ["0-0", "1-0"]}
+    assert records[1].source == "pro_scraper"
+    assert {record.run_id for record in records} == {run_id}
+
+    assert [record.action for record in outbox.since(db_session, records[0].id, limit=1)] == ["updated"]
+    assert outbox.since(db_session, records[-1].id) == []
+    assert outbox.pending.get() == []
+
+
+
+@pytest.mark.asyncio
+async def test_pending_changes_are_kept_per_run(db_session):
+    outbox = ChangeOutbox()
+    match = replace(FakeMatchFactory().create(), id=12, set="0-0", active=True)
+
+    async def run(set: str) -> int:
+        outbox.start_run()
+        outbox.record("match", match, replace(match, set=set), "pro_scraper")
+        await asyncio.sleep(0)
+        return outbox.save(db_session)
+
+    assert await asyncio.gather(run("1-0"), run("2-0")) == [1, 1]
+    assert outbox.record("match", match, replace(match, set="3-0"), "pro_scraper") is None  # Hors exécution
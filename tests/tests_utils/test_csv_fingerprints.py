@@ -0,0 +1,57 @@
+from tests.utils.fake_match_factory import FakeMatchFactory
+from tests.utils.fake_team_factory import FakeTeamFactory
+from utils.csv_fingerprints import CsvFingerprintStore
+from utils.scraper_logic import is_row_in_sync
+
+
+def make_row(**overrides) -> dict:
+    row = {
+        'league_code': 'ABCCS',
+        'match_code': 'EMA001',
+        'club_a_id': '0123456',
+        'club_b_id': '0654321',
+        'team_a_name': 'PARIS VOLLEY',
+        'team_b_name': 'NANTES VB',
+        'match_date': '2024-10-05',
+        'match_time': '20:00',
+        'set': None,
+        'score': None,
+        'venue': None,
+        'referee1': None,
+        'referee2': None,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_row_hash_changes_with_content():
+    row = make_row()
+    assert CsvFingerprintStore.row_hash(row) == CsvFingerprintStore.row_hash(make_row())
+    assert CsvFingerprintStore.row_hash(row) != CsvFingerprintStore.row_hash(make_row(set='3/0'))
+    assert CsvFingerprintStore.row_key(row) == 'ABCCS/EMA001'
+
+
+def test_rows_only_visible_after_commit(tmp_path):
+    store = CsvFingerprintStore(str(tmp_path / "csv_fingerprints.json"))
+    store.stage(42, {'ABCCS/EMA001': 'hash'})
+    assert store.get_rows(42) == {}
+
+    store.commit(42)
+    store.save()
+
+    assert CsvFingerprintStore(store.path).get_rows(42) == {'ABCCS/EMA001': 'hash'}
+
+
+def test_is_row_in_sync_requires_active_entities():
+    row = make_row()
+    team_a = FakeTeamFactory().create(active=True)
+    team_b = FakeTeamFactory().create(active=True)
+    match = FakeMatchFactory().create_active_match()
+    teams = {(1, 'PARIS VOLLEY'): team_a, (1, 'NANTES VB'): team_b}
+    matches = {('ABCCS', 'EMA001'): match}
+
+    assert is_row_in_sync(row, 1, teams, matches)
+
+    match.active = False
+    assert not is_row_in_sync(row, 1, teams, matches)
+    assert not is_row_in_sync(row, 1, teams, {})
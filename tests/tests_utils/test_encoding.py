@@ -0,0 +1,41 @@
+import pytest
+from utils import encoding
+from utils.encoding import decode_body, resolve_encoding
+
+LATIN_PAGE = ("<html><head><title>FFvolley</title></head><body>" + "x" * 9000 + "Régionale Élite</body></html>").encode("latin-1")
+
+
+@pytest.fixture(autouse=True)
+def clear_host_encodings():
+    encoding.host_encodings.clear()
+    yield
+    encoding.host_encodings.clear()
+
+
+def test_header_charset_wins_over_declaration():
+    raw = '<meta charset="utf-8"><p>Fréjus</p>'.encode("latin-1")
+    assert decode_body("http://a.test/page", raw, "ISO-8859-1") == '<meta charset="utf-8"><p>Fréjus</p>'
+
+
+def test_declarations_are_used_without_sniffing(monkeypatch):
+    monkeypatch.setattr(encoding.chardet, "detect", lambda _: pytest.fail("détection inattendue"))
+    xml = '<?xml version="1.0" encoding="ISO-8859-1"?><Journee>Journée 01</Journee>'.encode("latin-1")
+    html = '<html><head><meta http-equiv="Content-Type" content="text/html; charset=windows-1252"></head>é</html>'.encode("cp1252")
+    assert resolve_encoding("http://a.test/x.xml", xml) == "iso8859-1"
+    assert resolve_encoding("http://a.test/page", html) == "cp1252"
+
+
+def test_sniffed_encoding_is_learned_per_host(monkeypatch):
+    text = decode_body("http://b.test/ligue?codent=LIBR", LATIN_PAGE)
+    assert text.endswith("Régionale Élite</body></html>")
+    assert "b.test" in encoding.host_encodings
+
+    monkeypatch.setattr(encoding.chardet, "detect", lambda _: pytest.fail("détection inattendue"))
+    assert decode_body("http://b.test/ligue?codent=LIPL", LATIN_PAGE) == text
+
+
+def test_utf8_and_ascii_pages_and_entities_left_to_parser():
+    assert decode_body("http://c.test/", "Journée &amp; Set".encode("utf-8")) == "Journée &amp; Set"
+    assert resolve_encoding("http://d.test/", b"<html>ascii</html>") == "utf-8"
+    # Un document ASCII n'apprend rien sur l'hôte
+    assert "d.test" not in encoding.host_encodings
@@ -0,0 +1,21 @@
+import pytest
+from utils.file_utils import parse_csv, parse_csv_bytes
+
+CSV_CONTENT = (
+    "Entité;Code;Match;Jo;Date;Heure;EQA_no;EQA_nom;EQB_no;EQB_nom;Set;Score;Total;Salle;Arb1;Arb2\r\n"
+    "ABCCS;EMA;EMA001;01;2024-10-05;20:00;0123456;PARIS VOLLEY;0654321;NANTES VB;3/1;25:20,20:25,25:18,25:10;;Salle Pierre Charles;DUPONT;\r\n"
+    "ABCCS;EMA;EMA002;01;2024-10-05;18:00;0111111;\"SAINT-ÉTIENNE \"\"VB\"\"\";0222222;LYON VOLLEY; ;;;;;\r\n"
+)
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "ISO-8859-1"])
+def test_parse_csv_bytes_matches_parse_csv(tmp_path, encoding):
+    csv_file = tmp_path / "poule.csv"
+    csv_file.write_text(CSV_CONTENT, encoding="utf-8", newline="")
+    expected = list(parse_csv(str(csv_file)))
+
+    rows = parse_csv_bytes(CSV_CONTENT.encode(encoding))
+
+    assert rows == expected
+    assert rows[1]['team_a_name'] == 'SAINT-ÉTIENNE "VB"'
+    assert rows[1]['set'] is None
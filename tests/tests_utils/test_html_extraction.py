@@ -0,0 +1,76 @@
+import logging
+from importlib.util import find_spec
+import pytest
+from utils import html_extraction
+from utils.html_extraction import extract_league_links, extract_national_pool_links, extract_regional_pool_links
+
+NATIONAL_PAGE = """<html><body>
+<div id="header"><a href="/index.html">Accueil</a></div>
+<table><tr><td>
+  <a href="http://www.ffvb.org/data/Files/2024-2025/CHAMPIONNATS/ELITE_FEM_POULE_A_efa.htm">Elite Fém. Poule A</a>
+  <a href="http://www.ffvb.org/data/Files/2024-2025/CHAMPIONNATS/N2_MASC_POULE_B_2mb.htm">N2 Masc. Poule B</a>
+  <a href="/docs/reglement.pdf">Règlement</a>
+</td></tr></table>
+</body></html>"""
+
+REGIONAL_PAGE = """<html><body>
+<table class="tableau_bleu"><tr><td style="text-align: center;">Ligue de Bretagne</td>
+  <td><a href="https://www.ffvbbeach.org/ffvbapp/resu/vbspo_calendrier.php?codent=LIBR">Résultats</a></td></tr></table>
+<table class="tableau_rouge"><tr><td>Sans nom</td><td><a href="?codent=LIXX">Résultats</a></td></tr></table>
+<table class="tableau_violet"><tr><td style="text-align: center;">Ligue de Corse</td><td>Pas de lien</td></tr></table>
+<table class="autre"><tr><td style="text-align: center;">Ignorée</td><td><a href="?codent=LIZZ">x</a></td></tr></table>
+</body></html>"""
+
+LEAGUE_PAGE = """<html><body>
+<ul id="menu">
+  <li><a href="#">Seniors</a>
+    <ul>
+      <li><a href="#">Régionale Masculine</a>
+        <ul>
+          <li><a href="vbspo_calendrier.php?saison=2024/2025&codent=LIBR&poule=RMA">Poule A</a></li>
+          <li><a href="vbspo_calendrier.php?saison=2024/2025&codent=LIBR&poule=RMB">Poule B</a></li>
+        </ul>
+      </li>
+      <li><a href="#">Pré-Nationale Féminine</a>
+        <ul><li><a href="vbspo_calendrier.php?saison=2024/2025&codent=LIBR&poule=PNF">Poule unique</a></li></ul>
+      </li>
+    </ul>
+  </li>
+</ul>
+<ul id="autre"><li><ul><li><ul><li><a href="?poule=ZZZ">Hors menu</a></li></ul></li></ul></li></ul>
+</body></html>"""
+
+PARSERS = ["html.parser"] + (["lxml"] if find_spec("lxml") else [])
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("extract, page", [
+    (extract_national_pool_links, NATIONAL_PAGE),
+    (extract_league_links, REGIONAL_PAGE),
+    (extract_regional_pool_links, LEAGUE_PAGE),
+])
+def test_backends_match_reference_extraction(extract, page, parser):
+    # Référence : arbre complet construit par html.parser, comme avant l'introduction des backends
+    reference = extract(page, strain=False, parser="html.parser")
+    assert reference
+    assert extract(page, strain=True, parser=parser) == reference
+    assert extract(page, strain=False, parser=parser) == reference
+
+
+def test_reference_extraction_values():
+    assert extract_league_links(REGIONAL_PAGE, strain=False, parser="html.parser") == [
+        ("Ligue de Bretagne", "https://www.ffvbbeach.org/ffvbapp/resu/vbspo_calendrier.php?codent=LIBR"),
+    ]
+    pools = extract_regional_pool_links(LEAGUE_PAGE, strain=False, parser="html.parser")
+    assert [(name, division) for _, name, division in pools] == [
+        ("Poule A", "Régionale Masculine"),
+        ("Poule B", "Régionale Masculine"),
+        ("Poule unique", "Pré-Nationale Féminine"),
+    ]
+
+
+def test_parse_metrics_are_logged(monkeypatch, caplog):
+    monkeypatch.setattr(html_extraction, "HTML_PARSE_METRICS", True)
+    with caplog.at_level(logging.INFO, logger="config.logger_config"):
+        extract_national_pool_links(NATIONAL_PAGE)
+    assert any("pic mémoire" in record.getMessage() for record in caplog.records)
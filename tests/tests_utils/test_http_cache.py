@@ -0,0 +1,44 @@
+from utils.http_cache import HttpCache
+
+
+def test_conditional_headers_after_commit(tmp_path):
+    cache = HttpCache(str(tmp_path / "http_cache.json"))
+    url = "https://www.lnv.fr/xml/calendrier-LAM.xml"
+
+    # Aucune entrée : pas d'en-têtes conditionnels
+    assert cache.conditional_headers(url) == {}
+
+    body_hash = HttpCache.body_hash(b"<Calendrier/>")
+    cache.stage(url, {"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}, body_hash)
+
+    # Les validateurs en attente ne sont pas encore utilisés
+    assert cache.conditional_headers(url) == {}
+    assert not cache.is_unchanged(url, body_hash)
+
+    cache.commit(url)
+
+    assert cache.conditional_headers(url) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+    assert cache.is_unchanged(url, body_hash)
+    assert not cache.is_unchanged(url, HttpCache.body_hash(b"<Calendrier><Match/></Calendrier>"))
+
+
+def test_cache_survives_reload(tmp_path):
+    path = str(tmp_path / "cache" / "http_cache.json")
+    cache = HttpCache(path)
+    cache.stage("key", {}, HttpCache.body_hash(b"body"))
+    cache.commit("key")
+    cache.save()
+
+    reloaded = HttpCache(path)
+    assert reloaded.is_unchanged("key", HttpCache.body_hash(b"body"))
+
+
+def test_corrupted_cache_starts_cold(tmp_path):
+    path = tmp_path / "http_cache.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    cache = HttpCache(str(path))
+    assert cache.entries == {}
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from utils import http_client
+from utils import retry_policy
+from utils.http_client import close_session, get_session, start_connection_stats, warm_up
+
+
+async def ok(request):
+    return web.Response(text="ok")
+
+
+@pytest.fixture
+async def server():
+    app = web.Application()
+    app.router.add_route("*", "/", ok)
+    async with TestServer(app, host="127.0.0.1") as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+async def reset_session(monkeypatch):
+    monkeypatch.setattr(http_client, "TEAM_API_URL", None)
+    monkeypatch.setattr(http_client, "MATCH_API_URL", None)
+    monkeypatch.setattr(http_client, "POOL_API_URL", None)
+    monkeypatch.setattr(retry_policy, "circuit_breakers", {})
+    yield
+    await close_session()
+
+
+@pytest.mark.asyncio
+async def test_session_is_shared_and_reuses_connections(server):
+    stats = start_connection_stats()
+    session = await get_session()
+    assert await get_session() is session
+
+    await warm_up(session, [str(server.make_url("/"))])
+    for _ in range(3):
+        async with session.get(server.make_url("/"), ssl=False) as response:
+            assert await response.text() == "ok"
+
+    # Une seule connexion ouverte au préchauffage, puis réutilisée
+    assert (stats.created, stats.reused) == (1, 3)
+
+    await close_session()
+    assert session.closed
+    assert await get_session() is not session
+
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_does_not_open_the_circuit():
+    session = await get_session()
+    unreachable = "http://127.0.0.1:1/"
+    for _ in range(retry_policy.CIRCUIT_FAILURE_THRESHOLD):
+        await warm_up(session, [unreachable])
+
+    breaker = retry_policy.get_circuit_breaker("127.0.0.1")
+    assert (breaker.failures, breaker.opened_at) == (0, None)
+
+
+@pytest.mark.asyncio
+async def test_connection_stats_are_kept_per_job(server):
+    session = await get_session()
+
+    async def job(requests: int):
+        stats = start_connection_stats()
+        for _ in range(requests):
+            async with session.get(server.make_url("/"), ssl=False) as response:
+                await response.read()
+            await asyncio.sleep(0)
+        return stats.created + stats.reused
+
+    assert await asyncio.gather(job(2), job(3)) == [2, 3]
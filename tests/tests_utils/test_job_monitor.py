@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import pytest
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from models.accumulating_handler import AccumulatingHandler
+from utils import job_monitor
+from utils.job_monitor import JOB_EVENTS, has_lost_runs, on_job_event, parse_job_intervals, report_job_stats
+
+
+def test_parse_job_intervals():
+    assert parse_job_intervals("pro=30, national=60,,regional=120") == {"pro": 30, "national": 60, "regional": 120}
+
+
+@pytest.mark.asyncio
+async def test_overlapping_runs_are_skipped_and_counted(monkeypatch):
+    monkeypatch.setattr(job_monitor, "job_stats", {})
+    running = 0
+    max_running = 0
+
+    async def slow_job():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.5)
+        running -= 1
+
+    scheduler = AsyncIOScheduler()
+    scheduler.add_listener(on_job_event, JOB_EVENTS)
+    scheduler.add_job(slow_job, 'interval', id="pro", seconds=0.1, max_instances=1, coalesce=True)
+    scheduler.start()
+    await asyncio.sleep(0.8)
+    scheduler.shutdown(wait=False)
+
+    assert max_running == 1
+    assert has_lost_runs("pro")
+    stats = report_job_stats("pro")
+    assert stats.overruns >= 2
+    assert not has_lost_runs("pro")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_jobs_keep_their_own_logs():
+    handler = AccumulatingHandler()
+    test_logger = logging.getLogger("test_job_logs")
+    test_logger.addHandler(handler)
+    test_logger.setLevel(logging.INFO)
+
+    async def job(name):
+        handler.start_job()
+        for step in range(3):
+            test_logger.info(f"{name} {step}")
+            await asyncio.sleep(0)
+        return list(handler.get_logs())
+
+    try:
+        pro_logs, national_logs = await asyncio.gather(job("pro"), job("national"))
+    finally:
+        test_logger.removeHandler(handler)
+
+    assert pro_logs == ["pro 0", "pro 1", "pro 2"]
+    assert national_logs == ["national 0", "national 1", "national 2"]
+    assert handler.get_logs() == []
+
+
+def test_logs_outside_a_job_are_not_accumulated():
+    handler = AccumulatingHandler()
+    test_logger = logging.getLogger("test_untracked_logs")
+    test_logger.addHandler(handler)
+    test_logger.setLevel(logging.INFO)
+    try:
+        test_logger.info("hors job")
+    finally:
+        test_logger.removeHandler(handler)
+
+    assert handler.get_logs() == []
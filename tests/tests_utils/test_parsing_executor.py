@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import os
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config.logger_config import logger
+from tests.tests_utils.test_file_utils import CSV_CONTENT
+from utils import parsing_executor
+from utils.file_utils import parse_csv_bytes
+from utils.parsing_executor import parsing_stats, run_parser, shutdown_parsing_executor
+
+
+@pytest.fixture(autouse=True)
+def reset_executor():
+    shutdown_parsing_executor()
+    parsing_stats.clear()
+    yield
+    shutdown_parsing_executor()
+    parsing_stats.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["inline", "process"])
+async def test_run_parser_returns_records_and_records_stats(monkeypatch, mode):
+    monkeypatch.setattr(parsing_executor, "PARSING_EXECUTOR", mode)
+    body = CSV_CONTENT.encode("utf-8")
+
+    rows = await run_parser("csv", parse_csv_bytes, body)
+
+    assert rows == parse_csv_bytes(body)
+    assert parsing_stats["csv"].count == 1
+    assert parsing_stats["csv"].parse > 0
+    assert (parsing_executor._executor is not None) == (mode == "process")
+
+
+@pytest.mark.asyncio
+async def test_report_resets_stats(monkeypatch):
+    monkeypatch.setattr(parsing_executor, "PARSING_EXECUTOR", "inline")
+    await run_parser("csv", parse_csv_bytes, CSV_CONTENT.encode("utf-8"))
+
+    parsing_executor.report_parsing_stats()
+
+    assert not parsing_stats
+
+
+def log_and_return(value):
+    logger.info(f"Parsing de {value}")
+    return value
+
+
+def crash(_):
+    os._exit(1)
+
+
+@pytest.mark.asyncio
+async def test_worker_logs_are_replayed_in_the_main_process(monkeypatch, caplog):
+    monkeypatch.setattr(parsing_executor, "PARSING_EXECUTOR", "process")
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        assert await run_parser("test", log_and_return, "page") == "page"
+
+    assert "Parsing de page" in caplog.messages
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_only_drops_the_failed_executor(monkeypatch):
+    monkeypatch.setattr(parsing_executor, "PARSING_EXECUTOR", "process")
+    broken = parsing_executor.get_executor()
+    replacement = ProcessPoolExecutor(max_workers=1)
+
+    async def replace_executor():
+        # Un autre appel a déjà remplacé le pool en échec
+        await asyncio.sleep(0)
+        parsing_executor._executor = replacement
+
+    with pytest.raises(BrokenProcessPool):
+        await asyncio.gather(run_parser("test", crash, None), replace_executor())
+
+    assert parsing_executor._executor is replacement
+    assert await run_parser("test", log_and_return, "page") == "page"
@@ -0,0 +1,73 @@
+from dataclasses import replace
+from datetime import datetime
+import pytest
+from models.match import MatchStatus
+from tests.utils.fake_match_factory import FakeMatchFactory
+from utils.pool_scheduler import PoolScheduler, poll_interval
+from config.env_config import (
+    MATCH_WINDOW_BEFORE, POLL_FINISHED_INTERVAL, POLL_IDLE_INTERVAL, POLL_LIVE_INTERVAL, POLL_RECENT_INTERVAL,
+    POOL_DISCOVERY_INTERVAL,
+)
+
+NOW = 1_700_000_000.0
+HOUR = 3600
+
+
+def test_poll_interval_by_match_window():
+    # Match en cours
+    assert poll_interval([NOW - HOUR], None, NOW) == POLL_LIVE_INTERVAL
+    # Match joué hier, score toujours attendu
+    assert poll_interval([NOW - 20 * HOUR], None, NOW) == POLL_RECENT_INTERVAL
+    # Prochain match dans une semaine
+    assert poll_interval([NOW + 7 * 24 * HOUR], NOW - 7 * 24 * HOUR, NOW) == POLL_IDLE_INTERVAL
+    # Plus aucun match à venir
+    assert poll_interval([], NOW - 30 * 24 * HOUR, NOW) == POLL_FINISHED_INTERVAL
+    assert poll_interval([], None, NOW) == POLL_FINISHED_INTERVAL
+
+
+def test_poll_interval_wakes_up_for_next_match():
+    next_match = NOW + 2 * HOUR
+    assert poll_interval([next_match], None, NOW) == next_match - MATCH_WINDOW_BEFORE - NOW
+
+
+def test_register_and_reschedule_from_observed_matches(tmp_path):
+    scheduler = PoolScheduler(str(tmp_path / "pool_schedule.json"))
+    assert scheduler.discovery_due('national', NOW)
+
+    scheduler.register(1, 'national', {"league_code": "ABCCS", "pool_code": "EMA", "season": "2024/2025"}, now=NOW)
+    scheduler.discovery_done('national', NOW)
+    assert not scheduler.discovery_due('national', NOW + 1)
+    assert scheduler.discovery_due('regional', NOW + 1)
+    assert scheduler.discovery_due('national', NOW + POOL_DISCOVERY_INTERVAL)
+    assert [pool_id for pool_id, _ in scheduler.due_pools('national', NOW)] == [1]
+
+    factory = FakeMatchFactory()
+    finished = replace(factory.create(MatchStatus.FINISHED), match_date=datetime.fromtimestamp(NOW - 48 * HOUR), active=True)
+    upcoming = replace(factory.create(MatchStatus.UPCOMING), match_date=datetime.fromtimestamp(NOW + 7 * 24 * HOUR), active=True)
+    scheduler.observe_matches(1, [finished, upcoming])
+
+    assert scheduler.reschedule(1, now=NOW) == POLL_IDLE_INTERVAL
+    assert scheduler.due_pools('national', NOW + 1) == []
+
+    # Une pool redécouverte conserve son échéance
+    scheduler.register(1, 'national', {"league_code": "ABCCS", "pool_code": "EMA", "season": "2024/2025"}, now=NOW + 1)
+    assert scheduler.due_pools('national', NOW + 1) == []
+
+
+@pytest.mark.asyncio
+async def test_run_due_reschedules_failed_pools(tmp_path):
+    scheduler = PoolScheduler(str(tmp_path / "pool_schedule.json"))
+    scheduler.register(1, 'national', {}, now=0)
+    scheduler.register(2, 'national', {}, now=0)
+    scheduler.register(3, 'regional', {}, now=0)
+    processed = []
+
+    async def process(pool_id, entry):
+        processed.append((pool_id, entry['scraper']))
+        if pool_id == 2:
+            raise Exception("CSV indisponible")
+
+    assert await scheduler.run_due('national', process) == 2
+    assert sorted(processed) == [(1, 'national'), (2, 'national')]
+    assert scheduler.due_pools('national') == []
+    assert [pool_id for pool_id, _ in scheduler.due_pools('regional')] == [3]
@@ -0,0 +1,63 @@
+import asyncio
+import time
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from utils import rate_limiter as rate_limiter_module
+from utils.rate_limiter import HostLimiter, RateLimiter, rate_limit_trace_config
+
+
+def test_hosts_are_grouped_by_suffix():
+    limiter = RateLimiter({"ffvb.org": (5, 5), "ffvbbeach.org": (5, 10)}, (10, 10))
+
+    assert limiter.for_host("www.ffvb.org") is limiter.for_host("ffvb.org")
+    assert limiter.for_host("www.ffvbbeach.org").name == "ffvbbeach.org"
+    assert limiter.for_host("lnv-web.dataproject.com").name == "lnv-web.dataproject.com"
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    limiter = HostLimiter("test", rate=100, max_in_flight=100)
+
+    start = time.monotonic()
+    for _ in range(120):
+        await limiter.acquire()
+        limiter.release()
+
+    # 100 jetons disponibles d'emblée, puis 20 au rythme de 100/s
+    assert time.monotonic() - start >= 0.15
+    assert limiter.stats.count == 120
+
+
+@pytest.mark.asyncio
+async def test_session_requests_respect_max_in_flight(monkeypatch):
+    in_flight = 0
+    max_seen = 0
+
+    async def handler(request):
+        nonlocal in_flight, max_seen
+        in_flight += 1
+        max_seen = max(max_seen, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    limiter = RateLimiter({"127.0.0.1": (0, 2)}, (0, 100))
+    monkeypatch.setattr(rate_limiter_module, "rate_limiter", limiter)
+
+    async with TestServer(app, host="127.0.0.1") as server:
+        async with aiohttp.ClientSession(trace_configs=[rate_limit_trace_config()]) as session:
+            async def get():
+                async with session.get(server.make_url("/")) as response:
+                    return await response.text()
+
+            assert await asyncio.gather(*(get() for _ in range(6))) == ["ok"] * 6
+
+    host_limiter = limiter.for_host("127.0.0.1")
+    assert max_seen == 2
+    assert host_limiter.stats.count == 6
+    # Toutes les places ont été rendues une fois les corps lus
+    assert host_limiter.slots._value == 2
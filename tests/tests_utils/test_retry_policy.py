@@ -0,0 +1,182 @@
+import asyncio
+import time
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from aioresponses import aioresponses
+from utils import retry_policy
+from utils.handlers.api_handler import handle_api_response
+from utils.retry_policy import (
+    CircuitBreaker, CircuitOpenError, RetryPolicy, circuit_breaker_trace_config, parse_retry_after,
+)
+
+API_URL = "http://localhost:8083/api/matches/1"
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(retry_policy, "default_retry_policy", RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.05))
+    monkeypatch.setattr(retry_policy, "circuit_breakers", {})
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("invalide") is None
+    assert parse_retry_after(None) is None
+
+
+def test_delay_honours_retry_after_within_max_delay():
+    policy = RetryPolicy(max_attempts=3, base_delay=1, max_delay=10)
+
+    assert 0.5 <= policy.delay(1) <= 1
+    assert 2 <= policy.delay(3) <= 4
+    assert policy.delay(1, retry_after=7) == 7
+    assert policy.delay(1, retry_after=60) == 10
+
+
+@pytest.mark.asyncio
+async def test_api_get_is_retried_on_503():
+    @handle_api_response()
+    async def get_match(session):
+        return await session.get(API_URL)
+
+    with aioresponses() as m:
+        m.get(API_URL, status=503, payload={"message": "Indisponible"}, headers={"Retry-After": "0"})
+        m.get(API_URL, payload={"id": 1})
+        async with aiohttp.ClientSession() as session:
+            assert await get_match(session) == {"id": 1}
+
+
+@pytest.mark.asyncio
+async def test_api_post_is_not_retried_on_502():
+    @handle_api_response()
+    async def create_match(session):
+        return await session.post(API_URL)
+
+    with aioresponses() as m:
+        m.post(API_URL, status=502, payload={"message": "Bad Gateway"})
+        m.post(API_URL, payload={"id": 1})
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(Exception, match="Erreur API 502: Bad Gateway"):
+                await create_match(session)
+
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [asyncio.TimeoutError(), aiohttp.ServerDisconnectedError()])
+async def test_idempotent_api_call_is_retried_on_timeout_or_disconnect(error):
+    @handle_api_response(idempotent=True)
+    async def get_match(session):
+        return await session.get(API_URL)
+
+    @handle_api_response()
+    async def create_match(session):
+        return await session.post(API_URL)
+
+    with aioresponses() as m:
+        m.get(API_URL, exception=error)
+        m.get(API_URL, payload={"id": 1})
+        m.post(API_URL, exception=error)
+        m.post(API_URL, payload={"id": 1})
+        async with aiohttp.ClientSession() as session:
+            assert await get_match(session) == {"id": 1}
+            # Le POST a pu être traité : il n'est pas renvoyé
+            with pytest.raises(type(error)):
+                await create_match(session)
+
+@pytest.mark.asyncio
+async def test_api_error_is_raised_after_last_attempt():
+    @handle_api_response()
+    async def get_match(session):
+        return await session.get(API_URL)
+
+    with aioresponses() as m:
+        m.get(API_URL, status=429, payload={"message": "Trop de requêtes"}, repeat=True)
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(Exception, match="Erreur API 429: Trop de requêtes"):
+                await get_match(session)
+        assert len(m.requests[("GET", aiohttp.client.URL(API_URL))]) == 3
+
+
+def test_circuit_opens_then_lets_one_probe_through(monkeypatch):
+    breaker = CircuitBreaker("example.org", failure_threshold=2, cooldown=60)
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    # Après la pause, un seul essai passe ; son succès referme le circuit
+    breaker.opened_at -= 60
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    breaker.before_request()
+
+
+def test_lost_probe_does_not_block_the_host():
+    breaker = CircuitBreaker("example.org", failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+    breaker.before_request()
+
+    # Essai dont aucun résultat n'est remonté : un nouvel essai passe après la pause
+    breaker.probe_started -= 60
+    breaker.before_request()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_the_circuit():
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+
+    async with TestServer(app, host="127.0.0.1") as server:
+        breaker = retry_policy.get_circuit_breaker(server.host)
+        breaker.cooldown = 0
+        breaker.opened_at = time.monotonic() - 120
+
+        async with aiohttp.ClientSession(trace_configs=[circuit_breaker_trace_config()]) as session:
+            probe = asyncio.create_task(session.get(server.make_url("/")))
+            await asyncio.sleep(0.05)
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+
+            breaker.cooldown = 60  # Seule la place d'essai libérée permet la requête suivante
+            release.set()
+            async with session.get(server.make_url("/")) as response:
+                assert response.status == 200
+
+    assert breaker.opened_at is None
+
+
+@pytest.mark.asyncio
+async def test_session_circuit_breaker_stops_calls_to_failing_host():
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        return web.Response(status=500)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+
+    async with TestServer(app, host="127.0.0.1") as server:
+        async with aiohttp.ClientSession(trace_configs=[circuit_breaker_trace_config()]) as session:
+            for _ in range(retry_policy.CIRCUIT_FAILURE_THRESHOLD):
+                async with session.get(server.make_url("/")) as response:
+                    assert response.status == 500
+            with pytest.raises(CircuitOpenError):
+                await session.get(server.make_url("/"))
+
+    assert calls == retry_policy.CIRCUIT_FAILURE_THRESHOLD
@@ -0,0 +1,82 @@
+import json
+import aiohttp
+import pytest
+from aioresponses import CallbackResult, aioresponses
+from api import bulk_api
+from tests.tests_utils.test_csv_fingerprints import make_row
+from utils.scraper_logic import parse_and_add_matches_from_csv
+from utils.world_state import world_state
+
+MATCH_API_URL = "http://localhost:8083/api/matches"
+TEAM_API_URL = "http://localhost:8082/api/teams"
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+@pytest.fixture
+def mocked_aioresponses():
+    bulk_api._bulk_support.clear()
+    world_state.clear()
+    with aioresponses() as m:
+        yield m
+    bulk_api._bulk_support.clear()
+    world_state.clear()
+
+
+def created(url, **kwargs):
+    """Réponse simulée d'une création : renvoie le corps envoyé avec un id."""
+    created.next_id += 1
+    body = dict(kwargs["json"], id=created.next_id)
+    return CallbackResult(status=201, body=json.dumps(body), content_type="application/json")
+
+
+created.next_id = 0
+
+
+@pytest.mark.asyncio
+async def test_parse_and_add_matches_upserts_each_team_once(session, mocked_aioresponses):
+    pool_id = 7001
+    rows = [
+        make_row(match_code='EMA001', team_a_name='PARIS VOLLEY', team_b_name='NANTES VB'),
+        make_row(match_code='EMA002', team_a_name='NANTES VB', team_b_name='PARIS VOLLEY',
+                 club_a_id='0654321', club_b_id='0123456'),
+    ]
+
+    mocked_aioresponses.get(f"{MATCH_API_URL}/pool/{pool_id}", status=204)
+    mocked_aioresponses.get(f"{TEAM_API_URL}/pool/{pool_id}", status=204)
+    mocked_aioresponses.add(f"{TEAM_API_URL}/bulk", method="OPTIONS", status=404)
+    mocked_aioresponses.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=404)
+    mocked_aioresponses.post(TEAM_API_URL, callback=created, repeat=True)
+    mocked_aioresponses.post(MATCH_API_URL, callback=created, repeat=True)
+
+    await parse_and_add_matches_from_csv(session, pool_id, rows)
+
+    posts = {
+        str(url): len(calls)
+        for (method, url), calls in mocked_aioresponses.requests.items()
+        if method == "POST"
+    }
+    assert posts == {TEAM_API_URL: 2, MATCH_API_URL: 2}
+
+
+@pytest.mark.asyncio
+async def test_parse_and_add_matches_tolerates_unsaved_match(session, mocked_aioresponses):
+    pool_id = 7002
+    rows = [make_row(match_code='EMA003', team_a_name='PARIS VOLLEY', team_b_name='NANTES VB')]
+
+    mocked_aioresponses.get(f"{MATCH_API_URL}/pool/{pool_id}", status=204)
+    mocked_aioresponses.get(f"{TEAM_API_URL}/pool/{pool_id}", status=204)
+    mocked_aioresponses.add(f"{TEAM_API_URL}/bulk", method="OPTIONS", status=404)
+    mocked_aioresponses.add(f"{MATCH_API_URL}/bulk", method="OPTIONS", status=404)
+    mocked_aioresponses.post(TEAM_API_URL, callback=created, repeat=True)
+    # Création sans corps : aucun match renvoyé
+    mocked_aioresponses.post(MATCH_API_URL, status=204)
+
+    await parse_and_add_matches_from_csv(session, pool_id, rows)
+
+    posts = [method for (method, _), _ in mocked_aioresponses.requests.items()]
+    assert "PATCH" not in posts and "DELETE" not in posts
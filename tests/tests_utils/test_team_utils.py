@@ -0,0 +1,83 @@
+import json
+import os
+from utils import team_utils
+from utils.json_store import JsonStore
+from utils.team_utils import FuzzyTeamMatcher, TeamAliasIndex, get_full_team_name
+
+TEAM_ALIASES = {
+    "teams": [
+        {"full": "Frejus Var Volley", "short": "Fréjus", "aliases": ["Fréjus Var Volley", "FVV"], "gender": "M"},
+        {"full": "Volero Le Cannet", "short": "Le Cannet", "aliases": ["RC Cannes", "Le Cannet"], "gender": "F"},
+    ]
+}
+
+
+def write_aliases(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_index_matches_aliases_full_and_short_names(tmp_path):
+    path = tmp_path / "team_aliases.json"
+    write_aliases(path, TEAM_ALIASES)
+    index = TeamAliasIndex(str(path))
+
+    assert index.get("frejus var volley", "M") == "Frejus Var Volley"
+    assert index.get("FRÉJUS", "M") == "Frejus Var Volley"
+    assert index.get("fvv", "M") == "Frejus Var Volley"
+    assert index.get("Le Cannet", "F") == "Volero Le Cannet"
+    # Le genre fait partie de la clé
+    assert index.get("Le Cannet", "M") is None
+    assert "rc cannes" in index
+    assert "Inconnu" not in index
+
+
+def test_index_reloads_when_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(team_utils, "RELOAD_CHECK_INTERVAL", 0)
+    path = tmp_path / "team_aliases.json"
+    write_aliases(path, TEAM_ALIASES)
+    index = TeamAliasIndex(str(path))
+    assert index.get("Fréjus VB", "M") is None
+
+    updated = json.loads(json.dumps(TEAM_ALIASES))
+    updated["teams"][0]["aliases"].append("Fréjus VB")
+    write_aliases(path, updated)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert index.get("Fréjus VB", "M") == "Frejus Var Volley"
+
+
+def test_get_full_team_name_uses_repository_aliases():
+    assert get_full_team_name("Montpellier", "M") == "Montpellier Herault SCV"
+    assert get_full_team_name("Montpellier", "F") is None
+
+
+def test_fuzzy_matcher_resolves_close_names_and_memoizes(tmp_path, monkeypatch):
+    path = tmp_path / "team_aliases.json"
+    write_aliases(path, TEAM_ALIASES)
+    store = JsonStore(str(tmp_path / "team_name_matches.json"))
+    matcher = FuzzyTeamMatcher(TeamAliasIndex(str(path)), store, threshold=0.6)
+
+    assert matcher.resolve("Frejus Var-Volley", "M") == "Frejus Var Volley"
+    # Le genre limite les candidats
+    assert matcher.resolve("Volero Cannet", "M") is None
+    assert matcher.resolve("Volero Cannet", "F") == "Volero Le Cannet"
+    assert matcher.resolve("Sans rapport", "F") is None
+
+    # Les résultats, y compris les échecs, sont persistés
+    store.save()
+    reloaded = JsonStore(str(tmp_path / "team_name_matches.json"))
+    assert reloaded.entries["matches"]["M|FREJUS VAR-VOLLEY"] == "Frejus Var Volley"
+    assert reloaded.entries["matches"]["F|SANS RAPPORT"] is None
+
+    matcher = FuzzyTeamMatcher(TeamAliasIndex(str(path)), reloaded, threshold=0.6)
+    searches = []
+    search = matcher._search
+    monkeypatch.setattr(matcher, "_search", lambda name, gender: searches.append(name) or search(name, gender))
+    assert matcher.resolve("Frejus Var-Volley", "M") == "Frejus Var Volley"
+    assert matcher.resolve("Sans rapport", "F") is None
+    # Résultats mémorisés : aucune recherche
+    assert searches == []
+    # Un nom inconnu donne lieu à une recherche
+    matcher.resolve("Volero Le Canet", "F")
+    assert searches == ["Volero Le Canet"]
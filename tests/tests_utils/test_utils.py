@@ -0,0 +1,34 @@
+import logging
+from utils import utils
+from utils.utils import build_division_index, report_unknown_divisions, standardize_division_name
+
+DIVISIONS = {
+    "Pré-Nationale": {"F": ["PRÉ-NATIONALE FÉMININE"], "M": ["Pré-Nationale Masc."]},
+    "Élite": {"M": ["Elite Masc."]},
+}
+
+
+def test_division_index_normalizes_variations(monkeypatch):
+    monkeypatch.setattr(utils, "division_index", build_division_index(DIVISIONS))
+
+    expected = {"division": "Pré-Nationale", "gender": "F"}
+    assert standardize_division_name("PRE-NATIONALE FÉMININE") == expected
+    assert standardize_division_name("PRÉ-NATIONALE FEMININE") == expected
+    assert standardize_division_name("  pré nationale   féminine ") == expected
+    assert standardize_division_name("Elite masc") == {"division": "Élite", "gender": "M"}
+
+
+def test_unknown_divisions_are_reported_once(monkeypatch, caplog):
+    monkeypatch.setattr(utils, "division_index", build_division_index(DIVISIONS))
+    monkeypatch.setattr(utils, "unknown_divisions", utils.Counter())
+
+    for _ in range(3):
+        assert standardize_division_name(" Coupe Inconnue ") == {"division": "Coupe Inconnue", "gender": None}
+
+    with caplog.at_level(logging.INFO, logger="config.logger_config"):
+        report_unknown_divisions()
+        report_unknown_divisions()
+
+    reports = [r for r in caplog.records if "non standardisée" in r.getMessage()]
+    assert len(reports) == 1
+    assert "Coupe Inconnue (3)" in reports[0].getMessage()
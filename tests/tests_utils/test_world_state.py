@@ -0,0 +1,113 @@
+from dataclasses import replace
+import pytest
+from models.match import MatchStatus
+from tests.utils.fake_match_factory import FakeMatchFactory
+from utils.world_state import WorldState
+
+POOL_ID = 42
+
+
+def make_matches(count: int) -> list:
+    factory = FakeMatchFactory()
+    return [
+        replace(factory.create(MatchStatus.UPCOMING), id=match_id, pool_id=POOL_ID, active=True)
+        for match_id in range(1, count + 1)
+    ]
+
+
+def loader(responses: list):
+    calls = []
+
+    async def load():
+        calls.append(True)
+        return responses[min(len(calls), len(responses)) - 1]
+
+    load.calls = calls
+    return load
+
+
+@pytest.mark.asyncio
+async def test_scope_is_loaded_once_and_kept_in_sync_by_writes(tmp_path):
+    state = WorldState(str(tmp_path / "world_state.sqlite"))
+    matches = make_matches(2)
+    load = loader([matches])
+
+    assert [match.id for match in await state.matches(POOL_ID, load)] == [1, 2]
+    state.put("match", replace(matches[0], set="1-0"))
+    state.put("match", replace(matches[0], id=3, match_code="NEW"))
+    state.deactivate("match", [2, 3], [None, Exception("refusé")])
+    resident = await state.matches(POOL_ID, load)
+
+    assert len(load.calls) == 1
+    assert [(match.id, match.set, match.active) for match in resident] == [(1, "1-0", True), (2, matches[1].set, False), (3, matches[0].set, True)]
+    # Les entités retournées sont des copies
+    resident[0].set = "2-0"
+    assert (await state.matches(POOL_ID, load))[0].set == "1-0"
+
+
+@pytest.mark.asyncio
+async def test_scope_is_reconciled_with_the_api(tmp_path):
+    state = WorldState(str(tmp_path / "world_state.sqlite"), reconcile_interval=0)
+    matches = make_matches(3)
+    load = loader([matches, [replace(matches[0], venue="Gymnase"), matches[1]]])
+
+    await state.matches(POOL_ID, load)
+    resident = await state.matches(POOL_ID, load)
+
+    assert [(match.id, match.venue) for match in resident] == [(1, "Gymnase"), (2, matches[1].venue)]
+    assert 3 not in state.entities["match"]
+
+
+@pytest.mark.asyncio
+async def test_entities_written_during_a_load_are_kept(tmp_path):
+    state = WorldState(str(tmp_path / "world_state.sqlite"), reconcile_interval=0)
+    matches = make_matches(2)
+    await state.matches(POOL_ID, loader([matches]))
+
+    async def stale_load():
+        # Écritures pendant que la requête est en cours : création et mise à jour
+        state.put("match", replace(matches[0], id=3, match_code="NEW"))
+        state.put("match", replace(matches[1], set="2-0"))
+        return matches
+
+    resident = await state.matches(POOL_ID, stale_load)
+
+    assert [(match.id, match.set) for match in resident] == [(1, matches[0].set), (2, "2-0"), (3, matches[0].set)]
+    assert state.loading == {}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_restores_a_warm_state(tmp_path):
+    path = str(tmp_path / "cache" / "world_state.sqlite")
+    state = WorldState(path)
+    matches = make_matches(2)
+    await state.matches(POOL_ID, loader([matches]))
+    await state.save()
+
+    restarted = WorldState(path)
+    load = loader([[]])
+    assert await restarted.matches(POOL_ID, load) == matches
+    assert load.calls == []
+
+
+
+@pytest.mark.asyncio
+async def test_save_writes_only_changed_entities(tmp_path):
+    path = str(tmp_path / "world_state.sqlite")
+    state = WorldState(path, reconcile_interval=0)
+    matches = make_matches(3)
+    load = loader([matches, matches, [replace(matches[0], set="3-0"), matches[1]]])
+    await state.matches(POOL_ID, load)
+    await state.save()
+
+    # Rechargement sans écart : rien à écrire
+    await state.matches(POOL_ID, load)
+    assert not state.dirty
+
+    await state.matches(POOL_ID, load)
+    assert state.changed["match"] == {1} and state.removed["match"] == {3}
+    await state.save()
+    assert not state.dirty
+
+    restarted = WorldState(path)
+    assert sorted((match.id, match.set) for match in restarted.entities["match"].values()) == [(1, "3-0"), (2, matches[1].set)]
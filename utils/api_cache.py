@@ -0,0 +1,158 @@
+import asyncio
+import copy
+import time
+import weakref
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+from config.env_config import API_CACHE_TTL
+from config.logger_config import logger
+
+# Arguments des lectures API identifiant le périmètre d'une entrée, et attribut correspondant des entités
+SCOPE_ARGUMENTS = {"pool_id": "pool_id", "league_code": "league_code"}
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0  # Requêtes identiques simultanées regroupées en un seul appel
+
+
+def copy_result(value: Any) -> Any:
+    """
+    Copie d'un résultat de lecture (entité ou liste d'entités), modifiable par l'appelant.
+    """
+    if isinstance(value, list):
+        return [copy.copy(item) for item in value]
+    return copy.copy(value)
+
+
+def entity_scope(kind: str, entity) -> dict:
+    scope = {argument: getattr(entity, attribute, None) for argument, attribute in SCOPE_ARGUMENTS.items()}
+    if kind == "pool":
+        scope["pool_id"] = entity.id
+    return scope
+
+
+class RunCache:
+    """
+    Lectures API mises en cache pendant une exécution (job).
+    """
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.entries: dict[tuple, tuple[float, str, dict, Any]] = {}  # clé -> (expiration, type, périmètre, résultat)
+        self.inflight: dict[tuple, asyncio.Future] = {}
+        self.generation = 0  # Incrémenté à chaque invalidation
+        self.stats: dict[str, CacheStats] = {}
+
+    def invalidate(self, kind: str, entity=None) -> None:
+        """
+        Retire les lectures du type `kind` pouvant contenir `entity` (toutes sans entité).
+        Une lecture dont le périmètre (pool, ligue) diffère de celui de l'entité est conservée.
+        """
+        scope = entity_scope(kind, entity) if entity is not None else {}
+
+        def affected(entry_kind: str, entry_scope: dict) -> bool:
+            return entry_kind == kind and all(
+                scope.get(argument) is None or value is None or str(scope[argument]) == str(value)
+                for argument, value in entry_scope.items()
+            )
+
+        for key in [key for key, (_, entry_kind, entry_scope, _) in self.entries.items() if affected(entry_kind, entry_scope)]:
+            del self.entries[key]
+        for key in [key for key in self.inflight if key[1] == kind]:
+            del self.inflight[key]
+        self.generation += 1
+
+    async def get(self, key: tuple, scope: dict, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        name, kind = key[0], key[1]
+        stats = self.stats.setdefault(name, CacheStats())
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            stats.hits += 1
+            return copy_result(entry[3])
+
+        future = self.inflight.get(key)
+        if future is not None:
+            stats.coalesced += 1
+            try:
+                return copy_result(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            # Lecture partagée annulée avec la requête qui l'a lancée : nouvelle lecture
+            return await self.get(key, scope, fetch)
+
+        stats.misses += 1
+        generation = self.generation
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Exception transmise aux requêtes regroupées, pas à la boucle
+            raise
+        finally:
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+        future.set_result(result)
+        # Un résultat lu avant une écriture concurrente n'est pas conservé
+        if generation == self.generation:
+            self.entries[key] = (time.monotonic() + self.ttl, kind, scope, copy_result(result))
+        return result
+
+
+class ApiCache:
+    """
+    Cache en lecture des appels GET de l'API, propre à chaque exécution.
+
+    `start_run` ouvre un cache pour le job courant (et les tâches qu'il crée) : les lectures
+    identiques y sont servies pendant API_CACHE_TTL secondes au plus, et les lectures
+    identiques simultanées ne donnent lieu qu'à un appel. En dehors d'un job, les lectures
+    ne sont pas mises en cache. Les écritures acceptées par l'API invalident les lectures
+    concernées dans les caches de tous les jobs en cours (`invalidate`).
+    """
+    def __init__(self, ttl: float = API_CACHE_TTL):
+        self.ttl = ttl
+        self.current: ContextVar[Optional[RunCache]] = ContextVar('api_cache', default=None)
+        self.runs: weakref.WeakSet[RunCache] = weakref.WeakSet()
+
+    def start_run(self) -> RunCache:
+        run_cache = RunCache(self.ttl)
+        self.current.set(run_cache)
+        self.runs.add(run_cache)
+        return run_cache
+
+    async def get(self, key: tuple, scope: dict, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        run_cache = self.current.get()
+        if run_cache is None or self.ttl <= 0:
+            return await fetch()
+        return await run_cache.get(key, scope, fetch)
+
+    def invalidate(self, kind: str, entity=None) -> None:
+        for run_cache in list(self.runs):
+            run_cache.invalidate(kind, entity)
+
+    def report(self) -> None:
+        """
+        Journalise le taux de succès du cache par lecture pour le job courant, puis remet les compteurs à zéro.
+        """
+        run_cache = self.current.get()
+        if run_cache is None:
+            return
+        for name, stats in sorted(run_cache.stats.items()):
+            total = stats.hits + stats.misses + stats.coalesced
+            if total:
+                logger.debug(
+                    f"Cache API '{name}': {total} lectures, {stats.hits} en cache, {stats.coalesced} regroupées "
+                    f"(taux de succès {(stats.hits + stats.coalesced) / total:.0%})"
+                )
+        run_cache.stats = {}
+
+
+api_cache = ApiCache()
@@ -0,0 +1,108 @@
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from config.env_config import PUSH_CLIENT_QUEUE, PUSH_REPLAY_SIZE
+from config.logger_config import logger
+from models.change_event import ChangeEvent
+
+
+def entity_topics(kind: str, entity) -> list[str]:
+    """
+    Sujets d'un changement, pour le filtrage par pool, ligue ou équipe.
+    """
+    topics = []
+    pool_id = entity.id if kind == "pool" else getattr(entity, "pool_id", None)
+    if pool_id:
+        topics.append(f"pool:{pool_id}")
+    if getattr(entity, "league_code", None):
+        topics.append(f"league:{entity.league_code}")
+    if kind == "team" and entity.id:
+        topics.append(f"team:{entity.id}")
+    for team_id in (getattr(entity, "team_id_a", None), getattr(entity, "team_id_b", None)):
+        if team_id:
+            topics.append(f"team:{team_id}")
+    return topics
+
+
+class Subscription:
+    """
+    Abonnement d'un client : file bornée des événements correspondant à ses sujets
+    (tous les événements si aucun sujet). Un client trop lent est déconnecté (`overflowed`).
+    """
+    def __init__(self, topics: set[str], max_queue: int):
+        self.topics = topics
+        self.queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(max_queue)
+        self.overflowed = False
+
+    def matches(self, event: ChangeEvent) -> bool:
+        return not self.topics or not self.topics.isdisjoint(event.topics)
+
+    def offer(self, event: ChangeEvent) -> None:
+        if self.overflowed or not self.matches(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def next(self) -> Optional[ChangeEvent]:
+        """
+        Prochain événement, ou None si le client a été déconnecté pour cause de retard.
+        """
+        if self.overflowed:
+            return None
+        return await self.queue.get()
+
+
+class ChangeFeed:
+    """
+    Diffusion en mémoire des changements d'entités enregistrés par le scraper.
+
+    Chaque événement reçoit un numéro croissant et est conservé dans un tampon borné
+    (`replay_size`), ce qui permet à un client de reprendre après le dernier événement
+    reçu. La publication ne bloque jamais : les clients dont la file est pleine sont
+    déconnectés et reprendront via le tampon.
+    """
+    def __init__(self, replay_size: int = PUSH_REPLAY_SIZE, max_queue: int = PUSH_CLIENT_QUEUE):
+        self.replay: deque[ChangeEvent] = deque(maxlen=replay_size)
+        self.max_queue = max_queue
+        self.subscriptions: set[Subscription] = set()
+        self.seq = 0
+
+    def publish(self, kind: str, action: str, entity, changes: Optional[list[str]] = None) -> ChangeEvent:
+        self.seq += 1
+        event = ChangeEvent(
+            seq=self.seq,
+            type=f"{kind}.{action}",
+            entity_id=entity.id,
+            changes=list(changes or []),
+            data=entity.to_dict(),
+            topics=entity_topics(kind, entity),
+            timestamp=datetime.now(timezone.utc).isoformat(),
+        )
+        self.replay.append(event)
+        for subscription in self.subscriptions:
+            subscription.offer(event)
+        return event
+
+    def subscribe(self, topics: Iterable[str] = (), last_seq: Optional[int] = None) -> Subscription:
+        """
+        Abonne un client. Avec `last_seq`, les événements suivants encore présents dans le
+        tampon sont rejoués avant les nouveaux.
+        """
+        subscription = Subscription(set(topics), self.max_queue)
+        if last_seq is not None:
+            if self.replay and self.replay[0].seq > last_seq + 1:
+                logger.debug(f"Flux de changements : reprise après {last_seq} incomplète, tampon dépassé")
+            for event in self.replay:
+                if event.seq > last_seq:
+                    subscription.offer(event)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+
+change_feed = ChangeFeed()
@@ -0,0 +1,129 @@
+import uuid
+from contextvars import ContextVar
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from config.env_config import OUTBOX_READ_LIMIT
+from config.logger_config import logger
+from models.change_record import ChangeRecord
+
+IGNORED_FIELDS = {'id', 'last_update'}
+
+
+def field_diffs(before, after) -> dict:
+    """
+    Champs modifiés entre deux versions d'une entité : {champ: [ancienne valeur, nouvelle valeur]}.
+    Sans version précédente (création), seuls les champs renseignés sont retenus.
+    """
+    old = before.to_dict() if before is not None else {}
+    new = after.to_dict()
+    return {
+        field: [old.get(field), value]
+        for field, value in new.items()
+        if field not in IGNORED_FIELDS and old.get(field) != value and (before is not None or value is not None)
+    }
+
+
+class ChangeOutbox:
+    """
+    Journal en ajout seul des modifications d'entités (matchs, équipes, pools).
+
+    Les services et le ProScraper y enregistrent chaque écriture acceptée par l'API
+    (`record`), avec les champs modifiés, leur source et l'identifiant de l'exécution
+    (`start_run`). Les enregistrements sont conservés en mémoire, propres à chaque
+    exécution comme son identifiant, puis écrits en base (`save`) à la fin du job, dans
+    la transaction de son log d'exécution. Une écriture hors exécution n'est pas enregistrée.
+
+    L'identifiant auto-incrémenté de la table sert de curseur : un consommateur relit
+    les changements suivant le dernier curseur traité (`since`) plutôt que des pools
+    entières. Les écritures ont lieu dans l'unique thread de la boucle asyncio, sans
+    point d'attente entre l'insertion et le commit : l'ordre des curseurs est celui
+    des commits.
+    """
+    def __init__(self):
+        self.pending: ContextVar[Optional[list[ChangeRecord]]] = ContextVar('outbox_pending', default=None)
+        self.run_id: ContextVar[Optional[str]] = ContextVar('run_id', default=None)
+
+    def start_run(self) -> str:
+        """
+        Attribue un identifiant et une liste de changements en attente à l'exécution
+        courante (et aux tâches qu'elle crée).
+        """
+        run_id = uuid.uuid4().hex
+        self.run_id.set(run_id)
+        self.pending.set([])
+        return run_id
+
+    def record(self, entity_type: str, before, after, source: str) -> Optional[ChangeRecord]:
+        """
+        Enregistre l'écriture d'une entité : création si `before` est None, sinon mise à jour
+        (désactivation si l'entité n'est plus active). Une écriture sans changement est ignorée.
+        """
+        pending = self.pending.get()
+        if pending is None:
+            logger.warning(f"Outbox : écriture de {entity_type} {after.id} hors exécution, non enregistrée")
+            return None
+        changes = field_diffs(before, after)
+        if before is not None and not changes:
+            return None
+        if before is None:
+            action = "created"
+        elif before.active and after.active is False:
+            action = "deactivated"
+        else:
+            action = "updated"
+
+        record = ChangeRecord(
+            entity_type=entity_type,
+            entity_id=after.id,
+            action=action,
+            changes=changes,
+            source=source,
+            run_id=self.run_id.get(),
+            created_at=datetime.now(timezone.utc),
+        )
+        pending.append(record)
+        return record
+
+    def record_all(self, entity_type: str, befores: Iterable, afters: Iterable, source: str) -> None:
+        """
+        Enregistre les écritures d'un `bulk_upsert_*` ; une entité None (écriture en échec) est ignorée.
+        """
+        for before, after in zip(befores, afters):
+            if after is not None:
+                self.record(entity_type, before, after, source)
+
+    def record_deactivations(self, entity_type: str, entities: Iterable, errors: Iterable, source: str) -> None:
+        """
+        Enregistre les désactivations réussies d'un appel `bulk_deactivate_*`.
+        """
+        for entity, error in zip(entities, errors):
+            if not error:
+                self.record(entity_type, entity, replace(entity, active=False), source)
+
+    def save(self, session: Session) -> int:
+        """
+        Ajoute à la session les changements en attente de l'exécution courante. Retourne leur nombre.
+        """
+        # Liste vidée sur place : elle est partagée avec les tâches créées par l'exécution
+        buffer = self.pending.get() or []
+        pending = list(buffer)
+        buffer.clear()
+        session.add_all(pending)
+        if pending:
+            logger.debug(f"Outbox : {len(pending)} changements enregistrés")
+        return len(pending)
+
+    @staticmethod
+    def since(session: Session, cursor: int = 0, limit: int = OUTBOX_READ_LIMIT) -> list[ChangeRecord]:
+        """
+        Changements enregistrés après `cursor`, dans l'ordre. Le curseur du dernier élément
+        retourné est à passer à l'appel suivant.
+        """
+        query = select(ChangeRecord).where(ChangeRecord.id > cursor).order_by(ChangeRecord.id).limit(limit)
+        return list(session.scalars(query))
+
+
+change_outbox = ChangeOutbox()
@@ -0,0 +1,29 @@
+from config.env_config import CSV_FINGERPRINTS_PATH
+from utils.fingerprint_store import FingerprintStore
+
+
+class CsvFingerprintStore(FingerprintStore):
+    """
+    Empreintes des lignes des CSV de pools, persistées entre les exécutions.
+
+    Pour chaque pool, associe la clé `Entité/Match` de chaque ligne à l'empreinte
+    de son contenu. Une ligne dont l'empreinte n'a pas changé n'a pas besoin de
+    repasser par `add_or_update_team` / `add_or_update_match`. Le fichier entier
+    est, lui, filtré en amont par le cache HTTP (`csv_cache_key`).
+    """
+    @staticmethod
+    def row_key(row: dict) -> str:
+        return f"{row.get('league_code')}/{row.get('match_code')}"
+
+    @staticmethod
+    def row_hash(row: dict) -> str:
+        return FingerprintStore.fingerprint(row)
+
+    def get_rows(self, pool_id: int) -> dict:
+        """
+        Retourne les empreintes validées des lignes d'une pool.
+        """
+        return self.get(pool_id)
+
+
+csv_fingerprints = CsvFingerprintStore(CSV_FINGERPRINTS_PATH)
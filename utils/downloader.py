@@ -1,70 +1,88 @@
+import hashlib
 import aiohttp
-import asyncio
+from typing import Optional
 from config.logger_config import logger
+from utils.file_utils import parse_csv_bytes
+from utils.http_cache import http_cache
+from utils.parsing_executor import run_parser
+from utils.retry_policy import RETRY_STATUSES, RetryableResponse, parse_retry_after, with_retry
 
-MAX_RETRIES = 3       # Nombre maximum de tentatives de téléchargement
-RETRY_DELAY = 2       # Délai en secondes entre chaque tentative en cas d'échec
 TIMEOUT = aiohttp.ClientTimeout(total=30)  # Timeout de 30 secondes pour chaque requête
-SEM = asyncio.Semaphore(10)  # Limiter à 20 téléchargements simultanés
+CHUNK_SIZE = 16 * 1024  # Taille des morceaux lus sur la réponse CSV
+DOWNLOAD_URL = "http://www.ffvbbeach.org/ffvbapp/resu/vbspo_calendrier_export.php"
 
-async def download_csv(
+
+def csv_cache_key(league_code: str, pool_code: str, raw_season: str) -> str:
+    """
+    Clé du cache HTTP pour le CSV d'une pool (la requête est un POST sur une URL commune).
+    """
+    return f"{DOWNLOAD_URL}#{raw_season}/{league_code}/{pool_code}"
+
+
+async def download_csv_rows(
     session: aiohttp.ClientSession,
     league_code: str,
     pool_code: str,
     raw_season: str,
-    folder: str
-) -> str:
+    skip_unchanged: bool = False
+) -> Optional[list[dict]]:
     """
-    Télécharge un fichier CSV contenant les données spécifiques d'une pool.
+    Télécharge le CSV d'une pool en mémoire et le parse dans l'exécuteur de parsing, sans fichier temporaire.
+    Un CSV inchangé n'est pas parsé.
 
     Parameters:
     - session (aiohttp.ClientSession): La session aiohttp active.
     - league_code (str): Le code de la ligue.
     - pool_code (str): Le code de la pool.
-    - season (str): La saison.
-    - folder (str): Le dossier où le fichier CSV sera sauvegardé.
+    - raw_season (str): La saison.
+    - skip_unchanged (bool): Si True, retourne None lorsque le CSV est identique au dernier
+      CSV traité (validé via `http_cache.commit(csv_cache_key(...))`).
 
     Returns:
-    - str: Le chemin du fichier CSV téléchargé, ou None en cas d'échec.
+    - Optional[list[dict]]: Les lignes du CSV (format de `parse_csv`), ou None si le contenu est inchangé.
+
+    Raises:
+    - Exception: Si le téléchargement échoue (erreurs transitoires retentées via `with_retry`).
     """
-    download_url = "http://www.ffvbbeach.org/ffvbapp/resu/vbspo_calendrier_export.php"
     data = {
         'cal_saison': raw_season,
         'cal_codent': league_code,
         'cal_codpoule': pool_code,
     }
-    filename = f"{folder}/poule_{league_code}_{pool_code}.csv"
+    cache_key = csv_cache_key(league_code, pool_code, raw_season)
+    headers = http_cache.conditional_headers(cache_key) if skip_unchanged else {}
+
+    async def download() -> Optional[list[dict]]:
+        # Les téléchargements simultanés sont limités par le limiteur de l'hôte (`rate_limiter`)
+        async with session.post(DOWNLOAD_URL, data=data, headers=headers, timeout=TIMEOUT, ssl=False) as response:
+            if skip_unchanged and response.status == 304:
+                logger.debug(f"CSV non modifié (304) pour {league_code}_{pool_code}")
+                return None
+            if response.status in RETRY_STATUSES:
+                # L'export est une lecture : le POST peut être rejoué
+                raise RetryableResponse(response.status, parse_retry_after(response.headers.get('Retry-After')))
+            if response.status != 200:
+                raise Exception(f"Statut HTTP {response.status}")
 
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            # Limiter les téléchargements simultanés avec le sémaphore
-            async with SEM:
-                async with session.post(download_url, data=data, timeout=TIMEOUT) as response:
-                    if response.status == 200:
-                        content = await response.read()
-                        # Tenter de décoder le contenu
-                        try:
-                            content = content.decode('utf-8')
-                        except UnicodeDecodeError:
-                            content = content.decode('ISO-8859-1')
-                        # Écrire le contenu dans le fichier
-                        with open(filename, 'w', encoding='utf-8', errors='replace') as f:
-                            f.write(content)
-                        logger.debug(f"CSV téléchargé avec succès: {filename}")
-                        return filename  # Retourner le chemin du fichier après téléchargement réussi
-                    else:
-                        logger.warning(f"Tentative {attempt}/{MAX_RETRIES}: Échec du téléchargement pour {league_code}_{pool_code}, statut HTTP: {response.status}")
-        except asyncio.TimeoutError:
-            logger.error(f"Tentative {attempt}/{MAX_RETRIES}: Timeout lors du téléchargement pour {league_code}_{pool_code}")
-        except aiohttp.ClientError as e:
-            logger.error(f"Tentative {attempt}/{MAX_RETRIES}: Erreur réseau pour {league_code}_{pool_code} - {e}")
-        except Exception as e:
-            logger.error(f"Tentative {attempt}/{MAX_RETRIES}: Erreur inattendue pour {league_code}_{pool_code} - {e}")
+            digest = hashlib.sha256()
+            chunks = []
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                digest.update(chunk)
+                chunks.append(chunk)
 
-        if attempt < MAX_RETRIES:
-            logger.debug(f"Attente de {RETRY_DELAY} secondes avant la prochaine tentative...")
-            await asyncio.sleep(RETRY_DELAY)  # Attendre avant de réessayer
-        else:
-            logger.error(f"Échec du téléchargement pour {league_code}_{pool_code} après {MAX_RETRIES} tentatives.")
+        # Le corps est conservé en mémoire : une réponse interrompue est rejouée en entier
+        body_hash = digest.hexdigest()
+        if skip_unchanged:
+            if http_cache.is_unchanged(cache_key, body_hash):
+                logger.debug(f"CSV identique au dernier traitement pour {league_code}_{pool_code}")
+                return None
+            http_cache.stage(cache_key, response.headers, body_hash)
+        rows = await run_parser("csv", parse_csv_bytes, b''.join(chunks))
+        logger.debug(f"CSV téléchargé avec succès: {league_code}_{pool_code} ({len(rows)} lignes)")
+        return rows
 
-    return None
\ No newline at end of file
+    try:
+        return await with_retry(download, f"le CSV {league_code}_{pool_code}")
+    except Exception as e:
+        logger.error(f"Échec du téléchargement pour {league_code}_{pool_code} : {e!r}")
+        raise Exception(f"Échec du téléchargement du CSV pour Pool Code: {pool_code}") from e
@@ -0,0 +1,91 @@
+import codecs
+import re
+from typing import Optional
+from urllib.parse import urlsplit
+import chardet
+from config.logger_config import logger
+
+DECLARATION_BYTES = 2048  # Zone lue pour trouver <meta charset> ou la déclaration XML
+SNIFF_BYTES = 16 * 1024   # Taille maximale de l'échantillon analysé par détection
+DEFAULT_ENCODING = 'utf-8'
+
+XML_DECLARATION = re.compile(rb'<\?xml[^>]*encoding\s*=\s*["\']([\w.:-]+)', re.IGNORECASE)
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+NON_ASCII = re.compile(rb'[\x80-\xff]')
+
+# Encodage appris par hôte lorsqu'il a fallu le détecter
+host_encodings: dict[str, str] = {}
+
+
+def normalize_encoding(encoding: Optional[str]) -> Optional[str]:
+    """
+    Retourne le nom canonique d'un encodage, ou None s'il est inconnu de Python.
+    """
+    if not encoding:
+        return None
+    try:
+        return codecs.lookup(encoding.strip()).name
+    except LookupError:
+        return None
+
+
+def encoding_from_declaration(raw: bytes) -> Optional[str]:
+    """
+    Lit l'encodage déclaré en tête de document (déclaration XML ou balise <meta>).
+    """
+    head = raw[:DECLARATION_BYTES]
+    for pattern in (XML_DECLARATION, META_CHARSET):
+        match = pattern.search(head)
+        if match:
+            encoding = normalize_encoding(match.group(1).decode('ascii'))
+            if encoding:
+                return encoding
+    return None
+
+
+def sniff_encoding(raw: bytes) -> str:
+    """
+    Détecte l'encodage sur un échantillon borné, commençant au premier octet non ASCII.
+    Un document entièrement ASCII est traité comme de l'UTF-8.
+    """
+    first_non_ascii = NON_ASCII.search(raw)
+    if not first_non_ascii:
+        return DEFAULT_ENCODING
+    sample = raw[first_non_ascii.start():first_non_ascii.start() + SNIFF_BYTES]
+    try:
+        # Une séquence multi-octets peut être coupée en fin d'échantillon
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return DEFAULT_ENCODING
+    except UnicodeDecodeError:
+        pass
+    return normalize_encoding(chardet.detect(sample)['encoding']) or 'windows-1252'
+
+
+def resolve_encoding(url: str, raw: bytes, header_charset: Optional[str] = None) -> str:
+    """
+    Détermine l'encodage d'une réponse : en-tête Content-Type, puis déclaration du
+    document, puis encodage appris pour l'hôte, puis détection sur un échantillon.
+    """
+    encoding = normalize_encoding(header_charset) or encoding_from_declaration(raw)
+    if encoding:
+        return encoding
+
+    host = urlsplit(url).netloc
+    encoding = host_encodings.get(host)
+    if encoding:
+        return encoding
+
+    encoding = sniff_encoding(raw)
+    # Un document ASCII ne renseigne pas sur l'encodage de l'hôte
+    if NON_ASCII.search(raw):
+        host_encodings[host] = encoding
+        logger.debug(f"Encodage détecté pour l'hôte {host}: {encoding}")
+    return encoding
+
+
+def decode_body(url: str, raw: bytes, header_charset: Optional[str] = None) -> str:
+    """
+    Décode le corps d'une réponse selon `resolve_encoding`.
+    Les entités HTML/XML sont laissées au parser.
+    """
+    return raw.decode(resolve_encoding(url, raw, header_charset), errors='replace')
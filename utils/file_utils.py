@@ -1,25 +1,39 @@
-from datetime import datetime, timezone
-import os
-import shutil
 import csv
+import io
 from typing import Iterator
 from config.logger_config import logger
 
-def delete_output_directory(folder_path: str) -> None:
+CSV_ENCODING = 'utf-8'
+CSV_FALLBACK_ENCODING = 'ISO-8859-1'
+
+
+def parse_csv_row(row: dict) -> dict:
     """
-    Supprime un répertoire de sortie et tout son contenu.
+    Convertit une ligne brute du CSV FFVB en dictionnaire de match.
 
     Parameters:
-    - folder_path (str): Le chemin du répertoire à supprimer.
+    - row (dict): La ligne telle que lue par `csv.DictReader`.
+
+    Returns:
+    - dict: Un dictionnaire représentant une ligne du CSV.
     """
-    
-    if os.path.exists(folder_path):
-        shutil.rmtree(folder_path)
-        logger.debug(f"Répertoire supprimé: {folder_path}")
-    else:
-        logger.warning(f"Tentative de suppression : le répertoire {folder_path} n'existe pas.")
+    return {
+        'league_code': row['Entité'],
+        'match_code': row['Match'],
+        'club_a_id': row['EQA_no'],
+        'club_b_id': row['EQB_no'],
+        'team_a_name': row['EQA_nom'],
+        'team_b_name': row['EQB_nom'],
+        'match_date': row['Date'],
+        'match_time': row['Heure'],
+        'set': row['Set'].strip() or None,
+        'score': row['Score'] or None,
+        'venue': row['Salle'] or None,
+        'referee1': row['Arb1'] or None,
+        'referee2': row['Arb2'] or None,
+    }
+
 
-    
 def parse_csv(file_path: str) -> Iterator[dict]:
     """
     Parse un fichier CSV et génère chaque ligne sous forme de dictionnaire.
@@ -34,37 +48,26 @@ def parse_csv(file_path: str) -> Iterator[dict]:
     with open(file_path, encoding='utf-8') as file:
         reader = csv.DictReader(file, delimiter=';')
         for row in reader:
-            yield {
-                'league_code': row['Entité'],
-                'match_code': row['Match'],
-                'club_a_id': row['EQA_no'],
-                'club_b_id': row['EQB_no'],
-                'team_a_name': row['EQA_nom'],
-                'team_b_name': row['EQB_nom'],
-                'match_date': row['Date'],
-                'match_time': row['Heure'],
-                'set': row['Set'].strip() or None,
-                'score': row['Score'] or None,
-                'venue': row['Salle'] or None,
-                'referee1': row['Arb1'] or None,
-                'referee2': row['Arb2'] or None,
-            }
-            
-def create_output_directory(league: str) -> str:
+            yield parse_csv_row(row)
+
+
+def parse_csv_bytes(body: bytes) -> list[dict]:
     """
-    Crée un répertoire de sortie sous la structure CSV/league, 
-    nommé avec la date et l'heure actuelles.
+    Parse un CSV complet reçu en mémoire. Fonction exécutable dans l'exécuteur de parsing.
+
+    Le contenu est décodé en UTF-8, ou en ISO-8859-1 s'il n'est pas de l'UTF-8 valide.
+    Les fins de ligne sont normalisées comme à la lecture d'un fichier texte.
 
     Parameters:
-    - league (str): Le nom de la ligue.
+    - body (bytes): Le corps de la réponse.
 
     Returns:
-    - str: Le chemin du répertoire créé.
+    - list[dict]: Les lignes du CSV (même format que `parse_csv`).
     """
-    now = datetime.now(timezone.utc)
-    folder_name = now.strftime(f"CSV/{league}/%Y%m%d_%H%M%S")
-    os.makedirs(folder_name, exist_ok=True)
-    logger.debug(f"Répertoire de sortie créé: {folder_name}")
-    return folder_name
-
-
+    try:
+        text = body.decode(CSV_ENCODING)
+    except UnicodeDecodeError:
+        logger.debug(f"CSV non UTF-8, décodage en {CSV_FALLBACK_ENCODING}")
+        text = body.decode(CSV_FALLBACK_ENCODING)
+    reader = csv.DictReader(io.StringIO(text, newline=None), delimiter=';')
+    return [parse_csv_row(row) for row in reader]
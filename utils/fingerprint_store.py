@@ -0,0 +1,48 @@
+import hashlib
+import json
+from config.env_config import XML_FINGERPRINTS_PATH
+from utils.json_store import JsonStore
+
+
+class FingerprintStore(JsonStore):
+    """
+    Empreintes de contenus déjà traités, regroupées par clé (ex. une pool) et
+    persistées entre les exécutions.
+
+    Les nouvelles empreintes sont mises en attente (`stage`) et ne sont validées
+    (`commit`) qu'une fois le traitement réussi, pour qu'un échec soit rejoué au
+    tick suivant.
+    """
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.pending = {}
+
+    @staticmethod
+    def fingerprint(payload) -> str:
+        serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(serialized.encode('utf-8')).hexdigest()
+
+    def get(self, key) -> dict:
+        """
+        Retourne les empreintes validées pour une clé.
+        """
+        return self.entries.get(str(key), {})
+
+    def stage(self, key, fingerprints: dict) -> None:
+        """
+        Met en attente les empreintes de la dernière version traitée pour une clé.
+        """
+        self.pending[str(key)] = fingerprints
+
+    def commit(self, key) -> None:
+        """
+        Valide les empreintes en attente une fois le traitement réussi.
+        """
+        fingerprints = self.pending.pop(str(key), None)
+        if fingerprints is not None:
+            self.entries[str(key)] = fingerprints
+            self.dirty = True
+
+
+# Empreintes des journées des calendriers XML de la LNV, par pool
+xml_fingerprints = FingerprintStore(XML_FINGERPRINTS_PATH)
@@ -5,53 +5,83 @@ from enum import Enum
 from dataclasses import fields
 import aiohttp
 from config.logger_config import logger
+from utils.retry_policy import (
+    RetryableResponse, is_retryable_api_error, is_retryable_status, parse_retry_after, with_retry,
+)
 
-def handle_api_response(response_type: Optional[Type] = None):
+def handle_api_response(response_type: Optional[Type] = None, idempotent: bool = False):
     """
     Décorateur pour analyser les réponses API et convertir en dataclass
     avec prise en charge des énumérations et datetime.
+
+    Les erreurs transitoires (connexion impossible, 429/503, 502/504 pour une méthode
+    idempotente) sont retentées selon la politique de `with_retry`. Les timeouts et
+    connexions fermées par le serveur ne le sont que si l'appel est déclaré `idempotent`
+    (GET, PUT) : un POST a pu être traité malgré l'erreur.
     """
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Optional[Union[dict, object]]:
-            response = await func(*args, **kwargs)
+            try:
+                return await with_retry(
+                    lambda: parse_api_response(func, response_type, *args, **kwargs),
+                    func.__name__,
+                    retry_on=lambda error: is_retryable_api_error(error, idempotent),
+                )
+            except RetryableResponse as e:
+                logger.error(str(e))
+                raise Exception(str(e))
 
-            # Vérifier les statuts HTTP
-            if response.status in {200, 201}:
-                if response.content_type == "application/json":
-                    json_data = await response.json()
+        return wrapper
+    return decorator
 
-                    if response_type:
-                        # Gérer les listes
-                        if get_origin(response_type) is list:
-                            item_type = get_args(response_type)[0]
-                            return [convert_to_dataclass(item, item_type) for item in json_data]
 
-                        # Gérer un seul objet
-                        return convert_to_dataclass(json_data, response_type)
+async def parse_api_response(func, response_type: Optional[Type], *args, **kwargs) -> Optional[Union[dict, object]]:
+    """
+    Exécute une tentative de l'appel API et analyse sa réponse.
+    Lève `RetryableResponse` pour une erreur transitoire, Exception pour les autres erreurs.
+    """
+    response = await func(*args, **kwargs)
 
-                    return json_data
-                return None  # Pas de contenu JSON
+    # Vérifier les statuts HTTP
+    if response.status in {200, 201}:
+        if response.content_type == "application/json":
+            json_data = await response.json()
 
-            elif response.status == 204:
-                # Retourner une liste vide si le type attendu est une liste
+            if response_type:
+                # Gérer les listes
                 if get_origin(response_type) is list:
-                    return []
+                    item_type = get_args(response_type)[0]
+                    return [convert_to_dataclass(item, item_type) for item in json_data]
 
-                return None
+                # Gérer un seul objet
+                return convert_to_dataclass(json_data, response_type)
 
-            # Traiter les erreurs API
-            else:
-                try:
-                    error_data = await response.json()
-                except aiohttp.ContentTypeError:
-                    error_data = {"message": await response.text()}
-                error_message = error_data.get("message", "Erreur non spécifiée par l'API")
-                logger.error(f"Erreur API {response.status}: {error_message}")
-                raise Exception(f"Erreur API {response.status}: {error_message}")
+            return json_data
+        return None  # Pas de contenu JSON
 
-        return wrapper
-    return decorator
+    elif response.status == 204:
+        # Retourner une liste vide si le type attendu est une liste
+        if get_origin(response_type) is list:
+            return []
+
+        return None
+
+    # Traiter les erreurs API
+    else:
+        try:
+            error_data = await response.json()
+        except aiohttp.ContentTypeError:
+            error_data = {"message": await response.text()}
+        error_message = error_data.get("message", "Erreur non spécifiée par l'API")
+        if is_retryable_status(response.status, getattr(response, "method", None)):
+            raise RetryableResponse(
+                response.status,
+                parse_retry_after(response.headers.get("Retry-After")),
+                f"Erreur API {response.status}: {error_message}",
+            )
+        logger.error(f"Erreur API {response.status}: {error_message}")
+        raise Exception(f"Erreur API {response.status}: {error_message}")
 
 
 def convert_to_dataclass(data: dict, cls: Type) -> object:
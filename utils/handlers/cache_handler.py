@@ -0,0 +1,25 @@
+import inspect
+from functools import wraps
+from utils.api_cache import SCOPE_ARGUMENTS, api_cache
+
+def cached_response(kind: str):
+    """
+    Décorateur mettant en cache, pour le job courant, le résultat d'une lecture de l'API
+    (`get_*(session, ...)`) portant sur des entités du type `kind`. La clé est formée des
+    arguments de l'appel hors session ; `pool_id` et `league_code` délimitent les
+    écritures qui invalident l'entrée.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            params = {name: value for name, value in arguments.arguments.items() if name != "session"}
+            key = (func.__name__, kind, tuple(sorted((name, str(value)) for name, value in params.items())))
+            scope = {name: params[name] for name in SCOPE_ARGUMENTS if name in params}
+            return await api_cache.get(key, scope, lambda: func(*args, **kwargs))
+
+        return wrapper
+    return decorator
@@ -0,0 +1,25 @@
+from functools import wraps
+from utils.api_cache import api_cache
+from utils.change_feed import change_feed
+from utils.world_state import world_state
+
+def publish_changes(kind: str, action: str):
+    """
+    Décorateur publiant dans `change_feed` l'entité enregistrée par une fonction de création
+    ou de mise à jour de l'API (`create_*(session, entity)`, `update_*(session, entity, changes)`),
+    la reportant dans `world_state` et invalidant les lectures concernées de `api_cache`. L'événement n'est publié qu'une fois la réponse de l'API validée.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(session, entity, changes=None, *args, **kwargs):
+            if action == "created":
+                saved = await func(session, entity, *args, **kwargs)
+            else:
+                saved = await func(session, entity, changes or [], *args, **kwargs)
+            change_feed.publish(kind, action, saved or entity, changes)
+            world_state.put(kind, saved or entity)
+            api_cache.invalidate(kind, saved or entity)
+            return saved
+
+        return wrapper
+    return decorator
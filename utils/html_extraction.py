@@ -0,0 +1,153 @@
+import re
+import time
+import tracemalloc
+from datetime import datetime
+from importlib.util import find_spec
+from typing import Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from config.env_config import HTML_PARSE_METRICS, HTML_PARSER, HTML_STRAINER
+from config.logger_config import logger
+from models.live_match import LiveMatch
+
+LEAGUE_TABLE_CLASSES = ["tableau_bleu", "tableau_rouge", "tableau_violet"]
+REGIONAL_POOL_LINKS_SELECTOR = 'ul#menu > li > ul > li > ul > li > a[href*="poule="]'
+MAIN_ID_SPAN = re.compile(r"Content_Main_(\d+)_userControl_lbl_title")
+MATCH_BLOCK_ID = re.compile(r"^ctl00_Content_Main_(\d+)_userControl_RADLIST_Legs_ctrl(\d+)_RADLIST_Matches_ctrl(\d+)_RPL_Match$")
+HOME_TEAM_ID = re.compile("Label2|Label6")
+GUEST_TEAM_ID = re.compile("Label4|Label7")
+
+
+def resolve_parser(parser: str = HTML_PARSER) -> str:
+    """
+    Retourne le parser BeautifulSoup à utiliser : lxml s'il est installé en mode 'auto',
+    sinon le parser de la bibliothèque standard.
+    """
+    if parser == 'auto':
+        return 'lxml' if find_spec('lxml') else 'html.parser'
+    return parser
+
+
+def parse_html(html: str, parse_only: Optional[SoupStrainer] = None, label: str = "", parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Construit l'arbre d'une page, restreint aux éléments retenus par `parse_only`.
+    Avec HTML_PARSE_METRICS, journalise le temps de parsing et le pic mémoire.
+    """
+    parser = resolve_parser(parser or HTML_PARSER)
+    if not HTML_PARSE_METRICS:
+        return BeautifulSoup(html, parser, parse_only=parse_only)
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        return BeautifulSoup(html, parser, parse_only=parse_only)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        if not tracing:
+            tracemalloc.stop()
+        logger.info(
+            f"Parsing HTML {label}: {parser}{' (filtré)' if parse_only else ''}, "
+            f"{len(html) // 1024} Ko, {duration_ms:.1f} ms, pic mémoire {peak // 1024} Ko"
+        )
+
+
+def extract_national_pool_links(html: str, strain: bool = HTML_STRAINER, parser: Optional[str] = None) -> list[tuple[str, str]]:
+    """
+    Extrait les liens `*.htm` des poules nationales sous forme de couples (href, nom de la poule).
+    """
+    is_pool_link = lambda href: href and href.endswith('.htm')
+    soup = parse_html(html, SoupStrainer('a', href=is_pool_link) if strain else None, "nationales", parser)
+    return [(a_tag['href'], a_tag.get_text(strip=True)) for a_tag in soup.find_all('a', href=is_pool_link)]
+
+
+def extract_league_links(html: str, strain: bool = HTML_STRAINER, parser: Optional[str] = None) -> list[tuple[str, str]]:
+    """
+    Extrait les ligues régionales sous forme de couples (nom de la ligue, lien `codent=`).
+    Les tableaux sans nom ou sans lien sont ignorés.
+    """
+    soup = parse_html(html, SoupStrainer('table', class_=LEAGUE_TABLE_CLASSES) if strain else None, "régionales", parser)
+    leagues = []
+    for table in soup.find_all('table', class_=LEAGUE_TABLE_CLASSES):
+        league_name_tag = table.find('td', style="text-align: center;")
+        if not league_name_tag:
+            continue
+        a_tag = table.find('a', href=lambda href: href and 'codent=' in href)
+        if a_tag:
+            leagues.append((league_name_tag.get_text(strip=True), a_tag['href']))
+    return leagues
+
+
+def extract_regional_pool_links(html: str, strain: bool = HTML_STRAINER, parser: Optional[str] = None) -> list[tuple[str, str, str]]:
+    """
+    Extrait les liens `poule=` du menu d'une ligue sous forme de triplets
+    (href, nom de la poule, nom brut de la division).
+    """
+    soup = parse_html(html, SoupStrainer('ul', id='menu') if strain else None, "ligue", parser)
+    pool_links = []
+    for a_tag in soup.select(REGIONAL_POOL_LINKS_SELECTOR):
+        raw_division_tag = a_tag.find_parent('ul').find_previous_sibling('a')
+        raw_division_name = raw_division_tag.get_text(strip=True) if raw_division_tag else ""
+        pool_links.append((a_tag['href'], a_tag.get_text(strip=True), raw_division_name))
+    return pool_links
+
+
+def extract_dataproject_matches(html: str, parser: Optional[str] = None) -> tuple[Optional[str], list[LiveMatch]]:
+    """
+    Extrait d'une page CompetitionMatches de dataproject l'identifiant principal et tous les
+    matchs, en un seul parcours de l'arbre.
+
+    Les blocs sont repérés par leur id (`..._Legs_ctrl{journée}_RADLIST_Matches_ctrl{match}_RPL_Match`,
+    indices pairs) puis triés dans l'ordre de la page.
+    """
+    soup = parse_html(html, label="dataproject", parser=parser)
+    title = soup.find("span", id=MAIN_ID_SPAN)
+    if not title:
+        return None, []
+    main_id = MAIN_ID_SPAN.search(title["id"]).group(1)
+
+    blocks = []
+    for block in soup.find_all(id=MATCH_BLOCK_ID):
+        block_main_id, day_index, match_index = MATCH_BLOCK_ID.match(block["id"]).groups()
+        day_index, match_index = int(day_index), int(match_index)
+        if block_main_id != main_id or day_index % 2 or match_index % 2:
+            continue
+        blocks.append(((day_index, match_index), block))
+
+    live_matches = []
+    for _, block in sorted(blocks, key=lambda item: item[0]):
+        live_match = parse_match_block(block)
+        if live_match:
+            live_matches.append(live_match)
+    return main_id, live_matches
+
+
+def parse_match_block(match_block) -> Optional[LiveMatch]:
+    """
+    Lit l'identifiant dataproject, les équipes et la date d'un bloc de match en un seul parcours.
+    """
+    mID = home_team_name = guest_team_name = match_date = None
+    for element in match_block.find_all(True):
+        element_id = element.get("id") or ""
+        if element.name == "div" and mID is None and element.has_attr("onclick"):
+            mID_match = re.search(r"mID=(\d+)", element["onclick"])
+            mID = mID_match.group(1) if mID_match else ""
+        elif element.name == "span" and element_id:
+            if home_team_name is None and HOME_TEAM_ID.search(element_id):
+                home_team_name = element.get_text(strip=True)
+            elif guest_team_name is None and GUEST_TEAM_ID.search(element_id):
+                guest_team_name = element.get_text(strip=True)
+            elif match_date is None and "LB_DataOra" in element_id:
+                match_date = element.get_text(strip=True)
+
+    if not (mID and home_team_name and guest_team_name and match_date):
+        logger.debug(f"Bloc de match incomplet ignoré: {match_block.get('id')}")
+        return None
+    return LiveMatch(
+        mID=mID,
+        home_team_name=home_team_name,
+        guest_team_name=guest_team_name,
+        match_date=datetime.strptime(match_date, "%d/%m/%Y - %H:%M"),
+    )
@@ -0,0 +1,65 @@
+import hashlib
+from typing import Mapping
+from config.env_config import HTTP_CACHE_PATH
+from utils.json_store import JsonStore
+
+
+class HttpCache(JsonStore):
+    """
+    Cache HTTP persistant sur disque, partagé par `Scraper.fetch` et `download_csv_rows`.
+
+    Pour chaque clé (URL), conserve l'ETag, le Last-Modified et l'empreinte SHA-256
+    du dernier corps traité avec succès. Les nouvelles valeurs sont d'abord mises
+    en attente (`stage`) et ne sont validées (`commit`) qu'une fois le parsing
+    terminé, pour qu'un traitement en échec soit rejoué au tick suivant.
+    """
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.pending = {}
+
+    @staticmethod
+    def body_hash(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()
+
+    def conditional_headers(self, key: str) -> dict:
+        """
+        Construit les en-têtes If-None-Match / If-Modified-Since pour une clé connue.
+        """
+        entry = self.entries.get(key)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, key: str, body_hash: str) -> bool:
+        """
+        Indique si l'empreinte du corps reçu est celle du dernier corps validé pour cette clé.
+        """
+        entry = self.entries.get(key)
+        return bool(entry) and entry.get('body_hash') == body_hash
+
+    def stage(self, key: str, headers: Mapping[str, str], body_hash: str) -> None:
+        """
+        Met en attente les validateurs d'une réponse jusqu'à l'appel de `commit`.
+        """
+        self.pending[key] = {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'body_hash': body_hash,
+        }
+
+    def commit(self, key: str) -> None:
+        """
+        Valide les validateurs en attente une fois le contenu traité avec succès.
+        """
+        entry = self.pending.pop(key, None)
+        if entry:
+            self.entries[key] = entry
+            self.dirty = True
+
+
+http_cache = HttpCache(HTTP_CACHE_PATH)
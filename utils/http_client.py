@@ -0,0 +1,153 @@
+import asyncio
+from contextvars import ContextVar
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+import aiohttp
+from config.env_config import (
+    HTTP_CONNECT_TIMEOUT, HTTP_DNS_TTL, HTTP_KEEPALIVE_TIMEOUT, HTTP_LIMIT, HTTP_LIMIT_PER_HOST,
+    HTTP_READ_TIMEOUT, HTTP_TOTAL_TIMEOUT, MATCH_API_URL, POOL_API_URL, TEAM_API_URL,
+)
+from config.logger_config import logger
+from utils.rate_limiter import rate_limit_trace_config
+from utils.retry_policy import WARM_UP_CTX, circuit_breaker_trace_config
+
+# aiohttp ne décode le brotli que si l'un de ces paquets est installé
+ACCEPT_ENCODING = "gzip, deflate, br" if find_spec("brotli") or find_spec("brotlicffi") else "gzip, deflate"
+WARMUP_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+@dataclass
+class ConnectionStats:
+    created: int = 0
+    reused: int = 0
+
+
+# Compteurs du job courant (et des tâches qu'il crée) : les jobs partagent la session
+connection_stats: ContextVar[Optional[ConnectionStats]] = ContextVar('connection_stats', default=None)
+
+
+def start_connection_stats() -> ConnectionStats:
+    """
+    Démarre le suivi des connexions propre au job courant.
+    """
+    stats = ConnectionStats()
+    connection_stats.set(stats)
+    return stats
+
+
+def connection_trace_config() -> aiohttp.TraceConfig:
+    """
+    Compte les connexions ouvertes et réutilisées par la session partagée, pour le job à l'origine de la requête.
+    """
+    async def on_connection_create_end(session, context, params):
+        stats = connection_stats.get()
+        if stats is not None:
+            stats.created += 1
+
+    async def on_connection_reuseconn(session, context, params):
+        stats = connection_stats.get()
+        if stats is not None:
+            stats.reused += 1
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace_config
+
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Crée une session configurée : connecteur avec limites par hôte, keep-alive et cache DNS,
+    compression acceptée, timeouts explicites, disjoncteur par hôte, limiteur de débit et suivi des connexions.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_LIMIT,
+        limit_per_host=HTTP_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=HTTP_DNS_TTL,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=HTTP_TOTAL_TIMEOUT,
+        sock_connect=HTTP_CONNECT_TIMEOUT,
+        sock_read=HTTP_READ_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+        trace_configs=[circuit_breaker_trace_config(), rate_limit_trace_config(), connection_trace_config()],
+    )
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Retourne la session HTTP du processus, créée au premier appel et conservée entre les exécutions.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = create_session()
+        logger.debug("Session HTTP partagée créée")
+    return _session
+
+
+async def close_session() -> None:
+    """
+    Ferme la session partagée et ses connexions.
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.debug("Session HTTP partagée fermée")
+    _session = None
+
+
+def warmup_urls(site_urls: Iterable[str]) -> list[tuple[str, bool]]:
+    """
+    URLs sollicitées avant une exécution, avec le paramètre `ssl` de leurs appelants
+    (il fait partie de la clé des connexions réutilisables) : sites scrapés par le job
+    (`ssl=False`, comme `Scraper.fetch` et `download_csv_rows`) et racines des API BlockOut.
+    """
+    urls = [(url, False) for url in site_urls]
+    for api_url in (TEAM_API_URL, MATCH_API_URL, POOL_API_URL):
+        if api_url:
+            parts = urlsplit(api_url)
+            urls.append((f"{parts.scheme}://{parts.netloc}/", True))
+    return list(dict.fromkeys(urls))
+
+
+async def warm_up(session: aiohttp.ClientSession, site_urls: Iterable[str]) -> None:
+    """
+    Ouvre (ou rafraîchit) une connexion vers chaque hôte du job avant le tick, par une requête HEAD.
+    Les échecs sont ignorés : l'exécution ouvrira ses connexions normalement. Ils ne comptent
+    pas dans le disjoncteur de l'hôte (`WARM_UP_CTX`).
+    """
+    async def head(url: str, ssl: bool) -> None:
+        try:
+            async with session.head(url, timeout=WARMUP_TIMEOUT, ssl=ssl, allow_redirects=False, trace_request_ctx=WARM_UP_CTX):
+                pass
+        except Exception as e:
+            logger.debug(f"Préchauffage impossible pour {url}: {e}")
+
+    await asyncio.gather(*(head(url, ssl) for url, ssl in warmup_urls(site_urls)))
+
+
+def report_connection_stats() -> None:
+    """
+    Journalise une fois par exécution le taux de réutilisation des connexions du job courant,
+    puis remet ses compteurs à zéro.
+    """
+    stats = connection_stats.get()
+    if stats is None:
+        return
+    total = stats.created + stats.reused
+    if total:
+        logger.debug(
+            f"Connexions HTTP: {stats.created} ouvertes, {stats.reused} réutilisées "
+            f"(réutilisation {stats.reused / total:.0%})"
+        )
+    stats.created = stats.reused = 0
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED, JobEvent
+from config.env_config import SCRAPER_INTERVALS
+from config.logger_config import logger
+
+
+def parse_job_intervals(value: str) -> dict[str, int]:
+    """
+    Lit les intervalles des jobs au format "pro=30,national=60,regional=120" (secondes).
+    """
+    intervals = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        name, _, seconds = item.partition('=')
+        intervals[name.strip()] = int(seconds)
+    return intervals
+
+
+@dataclass
+class JobStats:
+    """
+    Compteurs d'un job depuis sa dernière exécution.
+    """
+    overruns: int = 0   # Déclenchements ignorés : l'exécution précédente n'était pas terminée (max_instances)
+    missed: int = 0     # Déclenchements manqués au-delà du délai de grâce (misfire_grace_time)
+    scheduled_run_time: Optional[datetime] = None
+
+
+job_stats: dict[str, JobStats] = {}
+
+
+def on_job_event(event: JobEvent) -> None:
+    """
+    Listener APScheduler comptabilisant les déclenchements ignorés et manqués d'un job.
+    """
+    stats = job_stats.setdefault(event.job_id, JobStats())
+    if event.code == EVENT_JOB_MAX_INSTANCES:
+        stats.overruns += 1
+        logger.debug(f"Job {event.job_id} encore en cours, déclenchement ignoré")
+    elif event.code == EVENT_JOB_MISSED:
+        stats.missed += 1
+    elif event.code == EVENT_JOB_SUBMITTED:
+        # Avec coalesce, les déclenchements en retard sont soumis en une seule heure prévue
+        stats.scheduled_run_time = max(event.scheduled_run_times)
+
+
+JOB_EVENTS = EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED | EVENT_JOB_SUBMITTED
+
+
+def has_lost_runs(job_id: str) -> bool:
+    """
+    Indique si des déclenchements du job ont été ignorés ou manqués depuis sa dernière exécution.
+    """
+    stats = job_stats.get(job_id)
+    return stats is not None and bool(stats.overruns or stats.missed)
+
+
+def report_job_stats(job_id: str) -> JobStats:
+    """
+    Journalise le retard de démarrage et les déclenchements perdus d'un job depuis sa dernière
+    exécution, puis remet ses compteurs à zéro. À appeler au début de l'exécution du job.
+    """
+    stats = job_stats.pop(job_id, None) or JobStats()
+    lag = 0.0
+    if stats.scheduled_run_time is not None:
+        lag = max(0.0, (datetime.now(timezone.utc) - stats.scheduled_run_time).total_seconds())
+    message = (
+        f"Job {job_id}: retard de démarrage {lag:.1f} s, {stats.overruns} déclenchements ignorés (exécution en cours), "
+        f"{stats.missed} manqués"
+    )
+    if stats.overruns or stats.missed:
+        logger.warning(message)
+    else:
+        logger.info(message)
+    return stats
+
+
+job_intervals = parse_job_intervals(SCRAPER_INTERVALS)
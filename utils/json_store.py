@@ -0,0 +1,40 @@
+import json
+import os
+from config.logger_config import logger
+
+
+class JsonStore:
+    """
+    Dictionnaire persisté dans un fichier JSON, chargé au démarrage et réécrit
+    de manière atomique par `save` lorsqu'il a été modifié.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = self._load()
+        self.dirty = False
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Fichier {self.path} illisible, démarrage à froid : {e}")
+            return {}
+
+    def save(self) -> None:
+        """
+        Écrit le contenu sur disque de manière atomique s'il a été modifié.
+        """
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+        logger.debug(f"{self.path} sauvegardé: {len(self.entries)} entrées")
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+from config.env_config import PARSING_EXECUTOR, PARSING_WORKERS
+from config.logger_config import logger
+
+T = TypeVar("T")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+@dataclass
+class ParsingStats:
+    count: int = 0
+    wait: float = 0.0   # Attente cumulée dans la file de l'exécuteur (s)
+    parse: float = 0.0  # Durée cumulée de parsing (s)
+    max_wait: float = 0.0
+
+
+parsing_stats: dict[str, ParsingStats] = defaultdict(ParsingStats)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Retourne le pool de processus de parsing, créé au premier usage.
+    Les processus sont démarrés en mode 'spawn' pour ne pas dupliquer l'état de la boucle asyncio.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PARSING_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+        logger.debug(f"Exécuteur de parsing démarré ({PARSING_WORKERS} processus)")
+    return _executor
+
+
+def shutdown_parsing_executor() -> None:
+    """
+    Arrête le pool de processus de parsing s'il a été démarré.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+class _RecordCollector(logging.Handler):
+    """
+    Conserve les logs émis dans un processus de parsing, pour les rejouer dans le processus principal.
+    """
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Message formaté avant transfert : les arguments ne sont pas forcément picklables
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+
+def _timed_call(func: Callable[..., T], args: tuple, submitted_at: float) -> tuple[T, float, float]:
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at - submitted_at, time.time() - started_at
+
+
+def _worker_call(func: Callable[..., T], args: tuple, submitted_at: float) -> tuple[tuple[T, float, float], list[logging.LogRecord]]:
+    """
+    `_timed_call` dans un processus de parsing : les logs émis sont retournés avec le résultat
+    au lieu d'être écrits par le processus.
+    """
+    collector = _RecordCollector()
+    handlers, propagate = logger.handlers, logger.propagate
+    logger.handlers, logger.propagate = [collector], False
+    try:
+        return _timed_call(func, args, submitted_at), collector.records
+    finally:
+        logger.handlers, logger.propagate = handlers, propagate
+
+
+async def run_parser(label: str, func: Callable[..., T], *args) -> T:
+    """
+    Exécute une fonction de parsing (module-level, arguments et résultat picklables) dans le
+    pool de processus, ou directement sur la boucle si PARSING_EXECUTOR vaut 'inline'.
+    L'attente en file et la durée de parsing sont cumulées par `label`.
+    Les logs émis par le parsing sont rejoués dans le processus principal, donc rattachés au job courant.
+    """
+    global _executor
+    submitted_at = time.time()
+    if PARSING_EXECUTOR == 'inline':
+        result, wait, duration = _timed_call(func, args, submitted_at)
+    else:
+        executor = get_executor()
+        try:
+            (result, wait, duration), records = await asyncio.get_running_loop().run_in_executor(
+                executor, _worker_call, func, args, submitted_at
+            )
+        except BrokenProcessPool:
+            # Un processus est mort : le pool sera recréé au prochain appel. Seul le pool en échec
+            # est abandonné (un autre appel a pu le remplacer), sans attendre ses processus.
+            logger.error(f"Exécuteur de parsing interrompu pendant '{label}', redémarrage au prochain appel")
+            if _executor is executor:
+                _executor = None
+            executor.shutdown(wait=False)
+            raise
+        for record in records:
+            logger.handle(record)
+
+    stats = parsing_stats[label]
+    stats.count += 1
+    stats.wait += wait
+    stats.parse += duration
+    stats.max_wait = max(stats.max_wait, wait)
+    return result
+
+
+def report_parsing_stats() -> None:
+    """
+    Journalise une fois par exécution l'attente et la durée de parsing par type de contenu, puis les remet à zéro.
+    """
+    for label, stats in sorted(parsing_stats.items()):
+        logger.debug(
+            f"Parsing '{label}' ({PARSING_EXECUTOR}): {stats.count} appels, "
+            f"attente moy. {stats.wait / stats.count * 1000:.1f} ms (max {stats.max_wait * 1000:.1f} ms), "
+            f"parsing moy. {stats.parse / stats.count * 1000:.1f} ms"
+        )
+    parsing_stats.clear()
@@ -0,0 +1,184 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+from config.env_config import (
+    MATCH_WINDOW_AFTER, MATCH_WINDOW_BEFORE, POLL_FINISHED_INTERVAL, POLL_IDLE_INTERVAL, POLL_LIVE_INTERVAL,
+    POLL_RECENT_INTERVAL, POOL_DISCOVERY_INTERVAL, POOL_FORGET_AFTER, POOL_SCHEDULE_PATH,
+)
+from config.logger_config import logger
+from models.match import Match, MatchStatus
+from utils.json_store import JsonStore
+
+RECENT_WINDOW = 24 * 3600  # Un match joué depuis moins de 24 h peut encore recevoir son score
+
+
+def in_match_window(date: float, now: float) -> bool:
+    """
+    Indique si un match prévu à `date` est dans sa fenêtre (de MATCH_WINDOW_BEFORE avant à MATCH_WINDOW_AFTER après).
+    """
+    return now - MATCH_WINDOW_AFTER <= date <= now + MATCH_WINDOW_BEFORE
+
+
+def poll_interval(pending: list[float], last_match: Optional[float], now: float) -> float:
+    """
+    Délai avant le prochain traitement d'une pool, d'après l'heure de ses matchs non terminés
+    (`pending`, triés) et celle de son dernier match joué (`last_match`) :
+    - un match dans sa fenêtre (de MATCH_WINDOW_BEFORE avant à MATCH_WINDOW_AFTER après) : POLL_LIVE_INTERVAL ;
+    - un match joué dans les dernières 24 h : POLL_RECENT_INTERVAL ;
+    - plus aucun match à venir : POLL_FINISHED_INTERVAL ;
+    - sinon POLL_IDLE_INTERVAL, écourté pour reprendre au début de la fenêtre du prochain match.
+    """
+    if any(in_match_window(date, now) for date in pending):
+        return POLL_LIVE_INTERVAL
+
+    played = [date for date in pending if date <= now]
+    if last_match is not None and last_match <= now:
+        played.append(last_match)
+    upcoming = [date for date in pending if date > now]
+
+    if played and now - max(played) <= RECENT_WINDOW:
+        interval = POLL_RECENT_INTERVAL
+    elif not upcoming:
+        return POLL_FINISHED_INTERVAL
+    else:
+        interval = POLL_IDLE_INTERVAL
+    if upcoming:
+        interval = min(interval, upcoming[0] - MATCH_WINDOW_BEFORE - now)
+    return max(POLL_LIVE_INTERVAL, interval)
+
+
+class PoolScheduler(JsonStore):
+    """
+    Planning de traitement des pools, persisté entre les exécutions.
+
+    La découverte des pools (pages des championnats, pools LNV) de chaque scraper a lieu
+    toutes les POOL_DISCOVERY_INTERVAL secondes : le scraper y enregistre ses pools (`register`)
+    avec les paramètres nécessaires à leur traitement. À chaque exécution du job d'un scraper,
+    seules ses pools dont l'échéance est atteinte sont traitées (`run_due`), puis replanifiées selon les
+    dates et statuts de leurs matchs (`observe_matches`, `poll_interval`).
+    """
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.entries.setdefault('pools', {})
+        if not isinstance(self.entries.get('discovered_at'), dict):
+            self.entries['discovered_at'] = {}
+
+    @property
+    def pools(self) -> dict:
+        return self.entries['pools']
+
+    def discovery_due(self, scraper_type: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self.entries['discovered_at'].get(scraper_type, 0) >= POOL_DISCOVERY_INTERVAL
+
+    def discovery_done(self, scraper_type: str, now: Optional[float] = None) -> None:
+        """
+        Valide la découverte d'un scraper et retire du planning ses pools qui n'ont plus été
+        vues depuis POOL_FORGET_AFTER.
+        """
+        now = time.time() if now is None else now
+        self.entries['discovered_at'][scraper_type] = now
+        forgotten = [
+            pool_id for pool_id, entry in self.pools.items()
+            if entry['scraper'] == scraper_type and now - entry['discovered_at'] > POOL_FORGET_AFTER
+        ]
+        for pool_id in forgotten:
+            del self.pools[pool_id]
+        if forgotten:
+            logger.info(f"{len(forgotten)} pools {scraper_type} retirées du planning (non redécouvertes)")
+        self.dirty = True
+
+    def register(self, pool_id: int, scraper_type: str, params: dict, now: Optional[float] = None) -> None:
+        """
+        Enregistre une pool découverte. Une nouvelle pool est à traiter immédiatement ;
+        une pool connue conserve son échéance.
+        """
+        now = time.time() if now is None else now
+        entry = self.pools.setdefault(str(pool_id), {'next_due': now, 'pending': None, 'last_match': None})
+        entry.update({'scraper': scraper_type, 'params': params, 'discovered_at': now})
+        self.dirty = True
+
+    def has_matches(self, pool_id: int) -> bool:
+        """
+        Indique si les dates des matchs de la pool sont connues du planning.
+        """
+        entry = self.pools.get(str(pool_id))
+        return entry is None or entry['pending'] is not None
+
+    def observe_matches(self, pool_id: int, matches: Iterable[Match]) -> None:
+        """
+        Mémorise les dates des matchs actifs d'une pool, utilisées pour calculer son échéance.
+        """
+        entry = self.pools.get(str(pool_id))
+        if entry is None:
+            return
+        now = time.time()
+        pending, last_match = [], None
+        for match in matches:
+            if not match or match.active is False or not match.match_date:
+                continue
+            date = match.match_date.timestamp()
+            if match.status != MatchStatus.FINISHED:
+                pending.append(date)
+            elif date <= now and (last_match is None or date > last_match):
+                last_match = date
+        entry['pending'] = sorted(pending)
+        entry['last_match'] = last_match
+        self.dirty = True
+
+    def due_pools(self, scraper_type: str, now: Optional[float] = None) -> list[tuple[int, dict]]:
+        now = time.time() if now is None else now
+        return [
+            (int(pool_id), entry) for pool_id, entry in self.pools.items()
+            if entry['scraper'] == scraper_type and entry['next_due'] <= now
+        ]
+
+    def live_pools(self, scraper_type: str, now: Optional[float] = None) -> list[int]:
+        """
+        Pools d'un scraper ayant un match non terminé dans sa fenêtre.
+        """
+        now = time.time() if now is None else now
+        return [
+            int(pool_id) for pool_id, entry in self.pools.items()
+            if entry['scraper'] == scraper_type and any(in_match_window(date, now) for date in entry['pending'] or [])
+        ]
+
+    def reschedule(self, pool_id: int, now: Optional[float] = None) -> float:
+        """
+        Calcule la prochaine échéance d'une pool. Sans dates de matchs connues, la pool est
+        replanifiée à POLL_RECENT_INTERVAL.
+        """
+        now = time.time() if now is None else now
+        entry = self.pools.get(str(pool_id))
+        if entry is None:
+            return 0
+        if entry['pending'] is None:
+            interval = POLL_RECENT_INTERVAL
+        else:
+            interval = poll_interval(entry['pending'], entry['last_match'], now)
+        entry['next_due'] = now + interval
+        self.dirty = True
+        return interval
+
+    async def run_due(self, scraper_type: str, process: Callable[[int, dict], Awaitable[None]]) -> int:
+        """
+        Traite en parallèle les pools d'un scraper arrivées à échéance, puis les replanifie
+        (même en cas d'échec). Retourne le nombre de pools traitées.
+        """
+        due = self.due_pools(scraper_type)
+
+        async def run(pool_id: int, entry: dict) -> None:
+            try:
+                await process(pool_id, entry)
+            except Exception as e:
+                logger.error(f"Erreur lors du traitement de la pool {pool_id} : {e}")
+            finally:
+                self.reschedule(pool_id)
+
+        await asyncio.gather(*(run(pool_id, entry) for pool_id, entry in due))
+        if due:
+            logger.info(f"{len(due)} pools {scraper_type} traitées")
+        return len(due)
+
+
+pool_scheduler = PoolScheduler(POOL_SCHEDULE_PATH)
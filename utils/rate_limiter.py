@@ -0,0 +1,156 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+import aiohttp
+from config.env_config import MATCH_API_URL, POOL_API_URL, RATE_LIMIT_API, RATE_LIMIT_DEFAULT, RATE_LIMITS, TEAM_API_URL
+from config.logger_config import logger
+
+
+def parse_limit(value: str) -> tuple[float, int]:
+    """
+    Lit une limite "requêtes par seconde/requêtes simultanées".
+    """
+    rate, max_in_flight = value.split('/')
+    return float(rate), int(max_in_flight)
+
+
+@dataclass
+class LimiterStats:
+    count: int = 0
+    wait: float = 0.0  # Attente cumulée avant envoi (s)
+    max_wait: float = 0.0
+
+
+class HostLimiter:
+    """
+    Limite les requêtes vers un hôte : seau à jetons de `rate` requêtes par seconde
+    (rafale d'une seconde) et au plus `max_in_flight` requêtes en cours.
+    """
+    def __init__(self, name: str, rate: float, max_in_flight: int):
+        self.name = name
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.lock = asyncio.Lock()
+        self.stats = LimiterStats()
+
+    async def acquire(self) -> None:
+        """
+        Attend une place libre et un jeton, puis comptabilise l'attente.
+        """
+        start = time.monotonic()
+        await self.slots.acquire()
+        try:
+            if self.rate > 0:
+                async with self.lock:
+                    while True:
+                        now = time.monotonic()
+                        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                        self.updated = now
+                        if self.tokens >= 1:
+                            self.tokens -= 1
+                            break
+                        await asyncio.sleep((1 - self.tokens) / self.rate)
+        except BaseException:
+            self.slots.release()
+            raise
+        wait = time.monotonic() - start
+        self.stats.count += 1
+        self.stats.wait += wait
+        self.stats.max_wait = max(self.stats.max_wait, wait)
+
+    def release(self) -> None:
+        self.slots.release()
+
+
+class RateLimiter:
+    """
+    Registre des limiteurs par hôte. Un hôte est rattaché à la première règle dont le
+    suffixe correspond (ex. 'ffvb.org' pour 'www.ffvb.org'), sinon à son propre limiteur
+    avec la limite par défaut.
+    """
+    def __init__(self, rules: dict[str, tuple[float, int]], default: tuple[float, int]):
+        self.rules = rules
+        self.default = default
+        self.limiters: dict[str, HostLimiter] = {}
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        rules = {}
+        for api_url in (TEAM_API_URL, MATCH_API_URL, POOL_API_URL):
+            host = urlsplit(api_url or '').hostname
+            if host:
+                rules[host] = parse_limit(RATE_LIMIT_API)
+        for rule in filter(None, (rule.strip() for rule in RATE_LIMITS.split(','))):
+            host, limit = rule.split('=')
+            rules[host.strip().lower()] = parse_limit(limit.strip())
+        return cls(rules, parse_limit(RATE_LIMIT_DEFAULT))
+
+    def for_host(self, host: str) -> HostLimiter:
+        host = (host or '').lower()
+        key = next((suffix for suffix in self.rules if host == suffix or host.endswith(f".{suffix}")), host)
+        limiter = self.limiters.get(key)
+        if limiter is None:
+            rate, max_in_flight = self.rules.get(key, self.default)
+            limiter = self.limiters[key] = HostLimiter(key, rate, max_in_flight)
+        return limiter
+
+    def reset(self) -> None:
+        """
+        Oublie les limiteurs créés (liés à la boucle asyncio en cours).
+        """
+        self.limiters.clear()
+
+    def report(self) -> None:
+        """
+        Journalise une fois par exécution l'attente imposée par hôte, puis remet les compteurs à zéro.
+        """
+        for key, limiter in sorted(self.limiters.items()):
+            stats = limiter.stats
+            if stats.count:
+                logger.debug(
+                    f"Limiteur '{key}': {stats.count} requêtes, attente moy. {stats.wait / stats.count * 1000:.1f} ms "
+                    f"(max {stats.max_wait * 1000:.1f} ms)"
+                )
+            limiter.stats = LimiterStats()
+
+
+rate_limiter = RateLimiter.from_env()
+
+
+def rate_limit_trace_config() -> aiohttp.TraceConfig:
+    """
+    TraceConfig à passer à `aiohttp.ClientSession(trace_configs=[...])` pour que toutes les
+    requêtes de la session passent par `rate_limiter`. La place de l'hôte est libérée
+    quand la connexion l'est, c'est-à-dire une fois le corps de la réponse lu.
+    """
+    async def on_request_start(session, context, params):
+        host_limiter = rate_limiter.for_host(params.url.host)
+        await host_limiter.acquire()
+        context.host_limiter = host_limiter
+
+    def release(context) -> None:
+        host_limiter = getattr(context, 'host_limiter', None)
+        if host_limiter is not None:
+            context.host_limiter = None
+            host_limiter.release()
+
+    async def on_request_end(session, context, params):
+        connection: Optional[aiohttp.connector.Connection] = params.response.connection
+        if connection is None:
+            release(context)
+        else:
+            connection.add_callback(lambda: release(context))
+
+    async def on_request_exception(session, context, params):
+        release(context)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
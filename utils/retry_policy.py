@@ -0,0 +1,239 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional, TypeVar
+import aiohttp
+from config.env_config import (
+    CIRCUIT_COOLDOWN, CIRCUIT_FAILURE_THRESHOLD, RETRY_BASE_DELAY, RETRY_MAX_ATTEMPTS, RETRY_MAX_DELAY,
+)
+from config.logger_config import logger
+
+T = TypeVar("T")
+
+# Statuts transitoires : surcharge ou indisponibilité (une erreur 500 relève d'un bug, pas d'un nouvel essai)
+RETRY_STATUSES = {429, 502, 503, 504}
+# Statuts pour lesquels le serveur n'a pas traité la requête : un nouvel essai est sûr même pour un POST
+NOT_PROCESSED_STATUSES = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# `trace_request_ctx` des requêtes de préchauffage, ignorées par le disjoncteur
+WARM_UP_CTX = {"warm_up": True}
+
+
+class CircuitOpenError(Exception):
+    """
+    Levée sans envoyer la requête lorsque le circuit de l'hôte est ouvert.
+    """
+
+
+class RetryableResponse(Exception):
+    """
+    Réponse HTTP transitoire à retenter (voir `is_retryable_status`).
+    """
+    def __init__(self, status: int, retry_after: Optional[float] = None, message: Optional[str] = None):
+        super().__init__(message or f"Erreur HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def is_retryable_status(status: int, method: Optional[str]) -> bool:
+    """
+    Indique si une réponse peut être retentée : 429/503 (requête non traitée) pour toute
+    méthode, 502/504 uniquement pour une méthode idempotente.
+    """
+    if status in NOT_PROCESSED_STATUSES:
+        return True
+    return status in RETRY_STATUSES and method in IDEMPOTENT_METHODS
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Convertit un en-tête Retry-After (secondes ou date HTTP) en délai en secondes.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un hôte : après `failure_threshold` échecs consécutifs (erreur réseau,
+    timeout ou statut 5xx), les requêtes échouent immédiatement pendant `cooldown` secondes.
+    Une seule requête d'essai passe ensuite ; son succès referme le circuit. Un essai annulé
+    libère sa place, et un essai resté sans résultat pendant `cooldown` secondes (exception
+    levée avant l'envoi, par exemple) est considéré perdu : un nouvel essai peut passer.
+    """
+    def __init__(self, host: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, cooldown: float = CIRCUIT_COOLDOWN):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.probe_started: Optional[float] = None
+
+    def before_request(self) -> None:
+        if self.opened_at is None:
+            return
+        now = time.monotonic()
+        if self.probing and now - self.probe_started < self.cooldown:
+            raise CircuitOpenError(f"Circuit ouvert pour l'hôte {self.host}, requête abandonnée")
+        if not self.probing and now - self.opened_at < self.cooldown:
+            raise CircuitOpenError(f"Circuit ouvert pour l'hôte {self.host}, requête abandonnée")
+        self.probing = True
+        self.probe_started = now
+
+    def record_cancel(self) -> None:
+        """
+        Libère la place d'essai d'une requête annulée, sans compter d'échec.
+        """
+        self.probing = False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info(f"Circuit refermé pour l'hôte {self.host}")
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+            logger.warning(f"Circuit ouvert pour l'hôte {self.host} ({self.failures} échecs consécutifs), pause de {self.cooldown:.0f} s")
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+
+circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    host = (host or '').lower()
+    breaker = circuit_breakers.get(host)
+    if breaker is None:
+        breaker = circuit_breakers[host] = CircuitBreaker(host)
+    return breaker
+
+
+def circuit_breaker_trace_config() -> aiohttp.TraceConfig:
+    """
+    TraceConfig appliquant le disjoncteur de l'hôte à toutes les requêtes d'une session.
+    """
+    async def on_request_start(session, context, params):
+        context.circuit_breaker = None
+        breaker = get_circuit_breaker(params.url.host)
+        if (context.trace_request_ctx or {}).get("warm_up"):
+            # Préchauffage : ni essai ni échec compté, et rien n'est envoyé à un hôte en pause
+            if breaker.opened_at is not None:
+                raise CircuitOpenError(f"Circuit ouvert pour l'hôte {breaker.host}, préchauffage ignoré")
+            return
+        breaker.before_request()
+        context.circuit_breaker = breaker
+
+    async def on_request_end(session, context, params):
+        breaker = context.circuit_breaker
+        if breaker is None:
+            return
+        if params.response.status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    async def on_request_exception(session, context, params):
+        breaker = getattr(context, 'circuit_breaker', None)
+        if breaker is None:
+            return
+        if isinstance(params.exception, asyncio.CancelledError):
+            breaker.record_cancel()
+        else:
+            breaker.record_failure()
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Erreurs transitoires d'une requête idempotente : réseau, timeout ou statut de `RETRY_STATUSES`.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, RetryableResponse):
+        return True
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRY_STATUSES
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+def is_retryable_api_error(error: BaseException, idempotent: bool = False) -> bool:
+    """
+    Erreurs retentables d'un appel API : réponse jugée transitoire par `is_retryable_status`,
+    ou connexion impossible (la requête n'est pas partie). Pour un appel idempotent, un timeout
+    ou une connexion fermée par le serveur (la requête a pu être traitée) le sont aussi.
+    """
+    if isinstance(error, (RetryableResponse, aiohttp.ClientConnectorError)):
+        return True
+    return idempotent and isinstance(error, (asyncio.TimeoutError, aiohttp.ServerDisconnectedError))
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Backoff exponentiel avec gigue (entre la moitié et la totalité du délai), au moins égal
+        au Retry-After demandé par le serveur, dans la limite de `max_delay`.
+        """
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        backoff = random.uniform(backoff / 2, backoff)
+        if retry_after is not None:
+            backoff = max(backoff, retry_after)
+        return min(self.max_delay, backoff)
+
+
+default_retry_policy = RetryPolicy()
+
+
+def retry_after_of(error: BaseException) -> Optional[float]:
+    if isinstance(error, RetryableResponse):
+        return error.retry_after
+    if isinstance(error, aiohttp.ClientResponseError) and error.headers:
+        return parse_retry_after(error.headers.get('Retry-After'))
+    return None
+
+
+async def with_retry(
+    operation: Callable[[], Awaitable[T]],
+    description: str,
+    retry_on: Callable[[BaseException], bool] = is_retryable,
+    policy: Optional[RetryPolicy] = None,
+) -> T:
+    """
+    Exécute `operation` et la relance selon `policy` tant que l'erreur est transitoire (`retry_on`).
+    Un circuit ouvert n'est jamais retenté. La dernière erreur est propagée.
+    """
+    policy = policy or default_retry_policy
+    for attempt in range(1, policy.max_attempts + 1):
+        try:
+            return await operation()
+        except Exception as e:
+            if attempt >= policy.max_attempts or not retry_on(e):
+                raise
+            delay = policy.delay(attempt, retry_after_of(e))
+            logger.warning(f"Tentative {attempt}/{policy.max_attempts} échouée pour {description} ({e!r}), nouvel essai dans {delay:.1f} s")
+            await asyncio.sleep(delay)
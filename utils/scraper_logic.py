@@ -1,14 +1,17 @@
 import asyncio
 from api.matches_api import get_matches_by_pool
 from api.teams_api import get_teams_by_pool
-from utils.downloader import download_csv
+from utils.downloader import csv_cache_key, download_csv_rows
 from models.match import Match, MatchStatus
 from models.team import Team
-from services.matchs_service import add_or_update_match, deactivate_matches
-from services.teams_service import add_or_update_team, deactivate_teams
+from services.matchs_service import add_or_update_matches, deactivate_matches
+from services.teams_service import add_or_update_teams, deactivate_teams
+from utils.csv_fingerprints import csv_fingerprints
 from utils.date_utils import parse_date
-from utils.file_utils import parse_csv
 from utils.handlers.error_handler import handle_errors
+from utils.http_cache import http_cache
+from utils.pool_scheduler import pool_scheduler
+from utils.world_state import world_state
 from config.logger_config import logger
 
 @handle_errors
@@ -17,45 +20,52 @@ async def handle_csv_download_and_parse(
     pool_id: int,
     league_code: str,
     pool_code: str,
-    season: str,
-    folder: str
+    season: str
 ) -> None:
     """
     Gère le téléchargement et le parsing du CSV de manière asynchrone.
     """
     
     logger.debug(f"Téléchargement du CSV pour Pool ID: {pool_id}, League Code: {league_code}, Pool Code: {pool_code}")
-    csv_path = await download_csv(http_session, league_code, pool_code, season, folder)
+    csv_rows = await download_csv_rows(http_session, league_code, pool_code, season, skip_unchanged=True)
 
-    if not csv_path:
-        raise Exception(f"Échec du téléchargement du CSV pour Pool Code: {pool_code}")
+    if csv_rows is None:
+        logger.debug(f"CSV inchangé pour Pool Code: {pool_code}, parsing ignoré.")
+        if not pool_scheduler.has_matches(pool_id):
+            # Dates des matchs nécessaires à la planification de la pool
+            matches = await world_state.matches(pool_id, lambda: get_matches_by_pool(http_session, pool_id))
+            pool_scheduler.observe_matches(pool_id, matches)
+        return
 
-    logger.debug(f"CSV téléchargé avec succès: {csv_path}")
-    await parse_and_add_matches_from_csv(http_session, pool_id, csv_path)
+    await parse_and_add_matches_from_csv(http_session, pool_id, csv_rows)
+    http_cache.commit(csv_cache_key(league_code, pool_code, season))
+    csv_fingerprints.commit(pool_id)
 
 @handle_errors
-async def parse_and_add_matches_from_csv(http_session, pool_id: int, csv_path: str) -> None:
+async def parse_and_add_matches_from_csv(http_session, pool_id: int, csv_rows: list[dict]) -> None:
     """
-    Parse le fichier CSV et ajoute les matchs et les équipes via des appels API REST.
+    Traite les lignes du CSV et ajoute les matchs et les équipes via des appels API REST.
     """
-    logger.debug(f"Parsing et ajout des matchs depuis le CSV: {csv_path}")
+    logger.debug(f"Ajout des matchs depuis le CSV de la pool {pool_id} ({len(csv_rows)} lignes)")
 
     # Récupérer tous les matchs existants pour la poule
-    existing_matches = await get_matches_by_pool(http_session, pool_id) or []
+    existing_matches = await world_state.matches(pool_id, lambda: get_matches_by_pool(http_session, pool_id))
     existing_matches_dict = {(match.league_code, match.match_code): match for match in existing_matches}
 
     # Récupération des équipes existantes
-    existing_teams = await get_teams_by_pool(http_session, pool_id) or []
+    existing_teams = await world_state.teams(pool_id, lambda: get_teams_by_pool(http_session, pool_id))
     existing_teams_dict = {(team.pool_id, team.team_name): team for team in existing_teams}
 
     scraped_team_names = set()
     scraped_match_codes = set()
 
-    parsed_data = parse_csv(csv_path)
-    if not parsed_data:
-        raise ValueError(f"Le fichier CSV {csv_path} ne contient pas de données valides.")
+    # Empreintes des lignes déjà traitées lors d'une exécution précédente
+    previous_rows = csv_fingerprints.get_rows(pool_id)
+    current_rows = {}
+    skipped_rows = 0
+    rows_to_upsert = []
 
-    for data in parsed_data:
+    for data in csv_rows:
         club_a_id = data.get('club_a_id')
         club_b_id = data.get('club_b_id')
 
@@ -68,72 +78,88 @@ async def parse_and_add_matches_from_csv(http_session, pool_id: int, csv_path: s
             logger.debug(f"Date invalide pour le match {data.get('match_code')}. Match ignoré.")
             continue
 
-        # Ajouter ou mettre à jour les équipes
-        team_a_data = {
-            "team_name": data.get('team_a_name'),
-            "club_id": club_a_id,
-            "pool_id": pool_id
-        }
-        team_b_data = {
-            "team_name": data.get('team_b_name'),
-            "club_id": club_b_id,
-            "pool_id": pool_id
-        }
+        row_key = csv_fingerprints.row_key(data)
+        row_hash = csv_fingerprints.row_hash(data)
+        current_rows[row_key] = row_hash
+
+        # Ligne inchangée et entités toujours actives en base : pas d'appel d'écriture
+        if previous_rows.get(row_key) == row_hash and is_row_in_sync(
+            data, pool_id, existing_teams_dict, existing_matches_dict
+        ):
+            scraped_team_names.add(data.get('team_a_name'))
+            scraped_team_names.add(data.get('team_b_name'))
+            scraped_match_codes.add(data.get('match_code'))
+            skipped_rows += 1
+            continue
+
+        rows_to_upsert.append((data, match_datetime))
+
+    # Phase 1 : équipes distinctes du CSV (la dernière ligne rencontrée fait foi pour le club_id)
+    scraped_teams = {}
+    for data, _ in rows_to_upsert:
+        for name_field, club_field in (('team_a_name', 'club_a_id'), ('team_b_name', 'club_b_id')):
+            team = Team(team_name=data.get(name_field), club_id=data.get(club_field), pool_id=pool_id)
+            scraped_teams[(team.pool_id, team.team_name)] = team
+
+    new_teams = await add_or_update_teams(
+        http_session, [(team, existing_teams_dict.get(key)) for key, team in scraped_teams.items()]
+    )
+    for key, new_team in zip(scraped_teams, new_teams):
+        existing_teams_dict[key] = new_team
+        if new_team:
+            scraped_team_names.add(new_team.team_name)
+
+    # Phase 2 : matchs construits à partir des ids d'équipes résolus
+    scraped_matches = {}
+    for data, match_datetime in rows_to_upsert:
+        new_team_a = existing_teams_dict.get((pool_id, data.get('team_a_name')))
+        new_team_b = existing_teams_dict.get((pool_id, data.get('team_b_name')))
+        if not new_team_a or not new_team_b:
+            continue
 
-        team_a = Team(**team_a_data)
-        team_b = Team(**team_b_data)
-
-        team_a_key = (team_a.pool_id, team_a.team_name)
-        team_b_key = (team_b.pool_id, team_b.team_name)
-
-        existing_team_a = existing_teams_dict.get(team_a_key)
-        existing_team_b = existing_teams_dict.get(team_b_key)
-
-        new_team_a = await add_or_update_team(http_session, team_a, existing_team_a)
-        if team_a_key not in existing_teams_dict:
-            existing_teams.append(new_team_a)
-        existing_teams_dict[team_a_key] = new_team_a
-        scraped_team_names.add(new_team_a.team_name)
-
-        # Ajouter ou mettre à jour l'équipe B
-        new_team_b = await add_or_update_team(http_session, team_b, existing_team_b)
-        if team_b_key not in existing_teams_dict:
-            existing_teams.append(new_team_b)
-        existing_teams_dict[team_b_key] = new_team_b
-        scraped_team_names.add(new_team_b.team_name)
-
-        if new_team_a and new_team_b:
-            scraped_team_names.add(new_team_a.team_name)
-            scraped_team_names.add(new_team_b.team_name)
-
-            # Ajouter ou mettre à jour le match
-            match_data = {
-                "match_code": data.get('match_code'),
-                "league_code": data.get('league_code'),
-                "pool_id": pool_id,
-                "team_id_a": new_team_a.id,
-                "team_id_b": new_team_b.id,
-                "match_date": match_datetime,
-                "set": None if not data.get('set') else data['set'].replace('/', '-'),
-                "score": None if not data.get('score') else data['score'],
-                "status": MatchStatus.FINISHED if data.get('set') and data.get('score') else MatchStatus.UPCOMING,
-                "venue": data.get('venue'),
-                "referee1": data.get('referee1'),
-                "referee2": data.get('referee2')
-            }
-            match = Match(**match_data)
-
-            match_key = (match.league_code, match.match_code)
-            existing_match = existing_matches_dict.get(match_key)
-
-            new_match = await add_or_update_match(http_session, match, existing_match)
-            if match_key not in existing_matches_dict:
-                existing_matches.append(new_match)
-            existing_matches_dict[match_key] = new_match
-            scraped_match_codes.add(new_match.match_code)
+        match_data = {
+            "match_code": data.get('match_code'),
+            "league_code": data.get('league_code'),
+            "pool_id": pool_id,
+            "team_id_a": new_team_a.id,
+            "team_id_b": new_team_b.id,
+            "match_date": match_datetime,
+            "set": None if not data.get('set') else data['set'].replace('/', '-'),
+            "score": None if not data.get('score') else data['score'],
+            "status": MatchStatus.FINISHED if data.get('set') and data.get('score') else MatchStatus.UPCOMING,
+            "venue": data.get('venue'),
+            "referee1": data.get('referee1'),
+            "referee2": data.get('referee2')
+        }
+        match = Match(**match_data)
+        scraped_matches[(match.league_code, match.match_code)] = match
 
+    new_matches = await add_or_update_matches(
+        http_session, [(match, existing_matches_dict.get(key)) for key, match in scraped_matches.items()]
+    )
+    for (key, match), new_match in zip(scraped_matches.items(), new_matches):
+        # Le code scrapé reste connu même si l'écriture a échoué : le match n'est pas désactivé à tort
+        scraped_match_codes.add(match.match_code)
+        if new_match:
+            existing_matches_dict[key] = new_match
+
+    # Les états récupérés en début de traitement, mis à jour par les upserts, servent d'instantané actif
+    active_teams = [team for team in existing_teams_dict.values() if team and team.active is not False]
+    active_matches = [match for match in existing_matches_dict.values() if match and match.active is not False]
     await asyncio.gather(
-        deactivate_teams(http_session, pool_id, scraped_team_names),
-        deactivate_matches(http_session, pool_id, scraped_match_codes)
+        deactivate_teams(http_session, pool_id, scraped_team_names, active_teams),
+        deactivate_matches(http_session, pool_id, scraped_match_codes, active_matches)
     )
-    logger.debug(f"Terminé l'ajout des matchs depuis le CSV: {csv_path}")        
+    csv_fingerprints.stage(pool_id, current_rows)
+    pool_scheduler.observe_matches(pool_id, active_matches)
+    logger.debug(f"Terminé l'ajout des matchs depuis le CSV de la pool {pool_id} ({skipped_rows}/{len(current_rows)} lignes inchangées)")
+
+
+def is_row_in_sync(data: dict, pool_id: int, existing_teams_dict: dict, existing_matches_dict: dict) -> bool:
+    """
+    Vérifie que le match et les deux équipes d'une ligne CSV existent et sont actifs en base.
+    """
+    team_a = existing_teams_dict.get((pool_id, data.get('team_a_name')))
+    team_b = existing_teams_dict.get((pool_id, data.get('team_b_name')))
+    match = existing_matches_dict.get((data.get('league_code'), data.get('match_code')))
+    return all(entity is not None and entity.active for entity in (team_a, team_b, match))        
@@ -0,0 +1,138 @@
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+import aiohttp
+from config.logger_config import logger
+
+CLIENT_PROTOCOL = "1.5"
+TRANSPORT = "serverSentEvents"
+
+
+class SignalRClient:
+    """
+    Client asyncio minimal d'un hub ASP.NET SignalR (protocole 1.5) en Server-Sent Events.
+
+    Une connexion : `negotiate` (jeton de connexion), ouverture du flux `connect`, attente
+    du message `initialized`, puis `start`. Les appels au hub (`invoke`) passent par
+    `send` sur la même connexion ; leurs résultats sont retournés par la requête, les
+    messages poussés par le serveur arrivent sur le flux.
+
+    Exemple:
+        client = SignalRClient(session, SIGNALR_URL, "signalrlivehubfederations")
+        async with client.connect(read_timeout=60) as messages:
+            await client.invoke("getLiveScoreListData_From_ES", "8094", "lnv")
+            async for message in messages:
+                ...
+    """
+    def __init__(self, session: aiohttp.ClientSession, base_url: str, hub: str, headers: Optional[dict] = None):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.hub = hub
+        self.headers = headers or {}
+        self.connection_data = json.dumps([{"name": hub}])
+        self.connection_token: Optional[str] = None
+        self.keep_alive_timeout: Optional[float] = None
+        self.invocation_id = 0
+
+    def params(self, **extra) -> dict:
+        params = {
+            "transport": TRANSPORT,
+            "clientProtocol": CLIENT_PROTOCOL,
+            "connectionToken": self.connection_token,
+            "connectionData": self.connection_data,
+        }
+        params.update(extra)
+        return params
+
+    async def negotiate(self) -> None:
+        params = {
+            "clientProtocol": CLIENT_PROTOCOL,
+            "connectionData": self.connection_data,
+            "_": str(int(time.time() * 1000)),
+        }
+        async with self.session.get(f"{self.base_url}/negotiate", params=params, headers=self.headers) as response:
+            response.raise_for_status()
+            negotiation = await response.json(content_type=None)
+        self.connection_token = negotiation["ConnectionToken"]
+        self.keep_alive_timeout = negotiation.get("KeepAliveTimeout")
+        logger.debug(f"SignalR: connexion négociée ({negotiation.get('ConnectionId')})")
+
+    @asynccontextmanager
+    async def connect(self, read_timeout: float) -> AsyncIterator[AsyncIterator[dict]]:
+        """
+        Négocie, ouvre le flux et démarre la connexion. Fournit un itérateur des messages reçus.
+        Un flux silencieux pendant `read_timeout` secondes (keep-alive compris) est considéré coupé.
+        """
+        await self.negotiate()
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=read_timeout, sock_read=read_timeout)
+        async with self.session.get(
+            f"{self.base_url}/connect", params=self.params(tid="1"), headers=self.headers, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            events = self.iter_events(response)
+            first = await anext(events, None)
+            if first != "initialized":
+                raise ConnectionError(f"SignalR: initialisation inattendue ({first!r})")
+            await self.start()
+            yield self.iter_messages(events)
+
+    async def start(self) -> None:
+        params = self.params(_=str(int(time.time() * 1000)))
+        async with self.session.get(f"{self.base_url}/start", params=params, headers=self.headers) as response:
+            response.raise_for_status()
+            started = await response.json(content_type=None)
+        if started.get("Response") != "started":
+            raise ConnectionError(f"SignalR: démarrage refusé ({started})")
+
+    async def invoke(self, method: str, *args: Any) -> Any:
+        """
+        Appelle une méthode du hub et retourne son résultat (`R`).
+        """
+        payload = json.dumps({"H": self.hub, "M": method, "A": list(args), "I": self.invocation_id})
+        self.invocation_id += 1
+        async with self.session.post(
+            f"{self.base_url}/send", params=self.params(), data={"data": payload}, headers=self.headers
+        ) as response:
+            response.raise_for_status()
+            result = await response.json(content_type=None)
+        if result and result.get("E"):
+            raise Exception(f"SignalR: erreur du hub pour {method}: {result['E']}")
+        return result.get("R") if result else None
+
+    @staticmethod
+    async def iter_events(response: aiohttp.ClientResponse) -> AsyncIterator[str]:
+        """
+        Données des événements SSE du flux (lignes `data:` consécutives).
+        """
+        data = []
+        async for raw_line in response.content:
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+            if line.startswith("data:"):
+                data.append(line[5:].lstrip())
+            elif not line and data:
+                yield "\n".join(data)
+                data = []
+        if data:
+            yield "\n".join(data)
+
+    @staticmethod
+    async def iter_messages(events: AsyncIterator[str]) -> AsyncIterator[dict]:
+        """
+        Messages JSON du flux, sans les keep-alive (`{}`).
+        """
+        async for event in events:
+            try:
+                message = json.loads(event)
+            except ValueError:
+                logger.debug(f"SignalR: événement ignoré ({event[:100]!r})")
+                continue
+            if message:
+                yield message
+
+
+def hub_calls(message: dict) -> list[tuple[str, list]]:
+    """
+    Appels poussés par le hub dans un message du flux : liste de (méthode, arguments).
+    """
+    return [(call.get("M"), call.get("A") or []) for call in message.get("M") or [] if isinstance(call, dict)]
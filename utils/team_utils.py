@@ -1,28 +1,17 @@
+import hashlib
 import json
+import os
+import re
+import time
+from collections import defaultdict
 from typing import Optional
 import unicodedata
+from config.env_config import TEAM_FUZZY_THRESHOLD, TEAM_NAME_MATCHES_PATH
 from config.logger_config import logger
+from utils.json_store import JsonStore
 
-# Chargement du fichier JSON contenant les alias
-try:
-    with open('config/mapping/team_aliases.json', 'r', encoding='utf-8') as f:
-        team_aliases = json.load(f)
-except Exception as e:
-    logger.error(f"Erreur lors du chargement de 'team_aliases': {e}")
-    team_aliases = {}
-
-def is_name_in_aliases(name: str) -> bool:
-    """
-    Vérifie si un nom d'équipe est présent dans les alias définis pour les équipes.
-    """
-    
-    for team in team_aliases.get('teams', []):  # Utilise `.get` pour éviter KeyError
-        all_aliases = [team['full']] + team.get('aliases', [])  # Gère l'absence de 'aliases'
-        if name in all_aliases:
-            logger.debug(f"Nom trouvé dans les alias: {name}")
-            return True
-    logger.debug(f"Nom non trouvé dans les alias: {name}")
-    return False
+TEAM_ALIASES_PATH = 'config/mapping/team_aliases.json'
+RELOAD_CHECK_INTERVAL = 5  # Délai minimal en secondes entre deux vérifications du fichier d'alias
 
 
 def remove_accents(text: str) -> str:
@@ -33,19 +22,195 @@ def remove_accents(text: str) -> str:
         c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn'
     )
 
+
+def normalize_team_name(name: str) -> str:
+    """
+    Normalise un nom d'équipe pour la recherche (sans accents, en majuscules).
+    """
+    return remove_accents(name).strip().upper()
+
+
+class TeamAliasIndex:
+    """
+    Index des alias d'équipes construit une seule fois à partir de `team_aliases.json`.
+
+    Associe (genre, nom normalisé) au nom complet de l'équipe, pour les alias, le nom
+    complet et le nom court. Le fichier est relu automatiquement lorsqu'il est modifié.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = None
+        self.next_check = 0.0
+        self.index: dict[tuple[str, str], str] = {}
+        self.names: set[str] = set()
+        self.version = None  # Empreinte du contenu chargé, pour invalider les index dérivés
+        self.reload_if_changed()
+
+    def reload_if_changed(self) -> None:
+        """
+        Reconstruit l'index si le fichier a changé depuis le dernier chargement.
+        """
+        now = time.monotonic()
+        if now < self.next_check:
+            return
+        self.next_check = now + RELOAD_CHECK_INTERVAL
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self.mtime:
+                return
+            with open(self.path, 'rb') as f:
+                content = f.read()
+            team_aliases = json.loads(content.decode('utf-8'))
+        except Exception as e:
+            # En cas d'erreur, l'index précédent reste utilisé
+            logger.error(f"Erreur lors du chargement de 'team_aliases': {e}")
+            return
+
+        self.index, self.names = self.build(team_aliases)
+        self.version = hashlib.sha1(content).hexdigest()
+        if self.mtime is not None:
+            logger.info(f"Alias d'équipes rechargés depuis {self.path} ({len(self.index)} entrées)")
+        self.mtime = mtime
+
+    @staticmethod
+    def build(team_aliases: dict) -> tuple[dict[tuple[str, str], str], set[str]]:
+        index = {}
+        names = set()
+        teams = team_aliases.get('teams', [])
+        # Les alias sont prioritaires, puis le nom complet et le nom court ;
+        # en cas de doublon, la première équipe du fichier l'emporte.
+        for fields in (('aliases',), ('full', 'short')):
+            for team in teams:
+                for field in fields:
+                    values = team.get(field) or []
+                    for value in ([values] if isinstance(values, str) else values):
+                        normalized = normalize_team_name(value)
+                        names.add(normalized)
+                        index.setdefault((team.get('gender'), normalized), team['full'])
+        return index, names
+
+    def get(self, name: str, gender: str) -> Optional[str]:
+        self.reload_if_changed()
+        return self.index.get((gender, normalize_team_name(name)))
+
+    def __contains__(self, name: str) -> bool:
+        self.reload_if_changed()
+        return normalize_team_name(name) in self.names
+
+
+def name_trigrams(name: str) -> set[str]:
+    """
+    Trigrammes de caractères d'un nom, sans accents ni ponctuation.
+    """
+    cleaned = re.sub(r'[^A-Z0-9]+', ' ', normalize_team_name(name)).strip()
+    padded = f"  {cleaned} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyTeamMatcher:
+    """
+    Résolution approchée des noms d'équipes absents de l'index exact.
+
+    Les noms connus (alias, noms complets et courts) sont indexés par trigrammes,
+    par genre. Un nom inconnu est associé à l'équipe la plus proche (coefficient de
+    Dice sur les trigrammes) si le score atteint `threshold` et qu'aucune autre équipe
+    n'obtient un score équivalent. Les résultats, y compris les échecs, sont mémorisés
+    et persistés : la recherche n'a lieu qu'une fois par orthographe inconnue.
+    """
+    AMBIGUITY_MARGIN = 0.05
+
+    def __init__(self, alias_index: TeamAliasIndex, store: JsonStore, threshold: float):
+        self.alias_index = alias_index
+        self.store = store
+        self.threshold = threshold
+        self.version = None
+        self.trigram_index: dict[tuple[str, str], set[str]] = {}
+        self.name_trigrams: dict[tuple[str, str], set[str]] = {}
+
+    def _refresh(self) -> None:
+        self.alias_index.reload_if_changed()
+        if self.version == self.alias_index.version:
+            return
+        trigram_index = defaultdict(set)
+        trigrams_by_name = {}
+        for (gender, normalized) in self.alias_index.index:
+            trigrams = name_trigrams(normalized)
+            trigrams_by_name[(gender, normalized)] = trigrams
+            for trigram in trigrams:
+                trigram_index[(gender, trigram)].add(normalized)
+        self.trigram_index = dict(trigram_index)
+        self.name_trigrams = trigrams_by_name
+        self.version = self.alias_index.version
+
+        # Les correspondances mémorisées ne valent que pour une version du fichier d'alias
+        if self.store.entries.get('version') != self.version:
+            self.store.entries = {'version': self.version, 'matches': {}}
+            self.store.dirty = True
+
+    def resolve(self, name: str, gender: str) -> Optional[str]:
+        self._refresh()
+        key = f"{gender}|{normalize_team_name(name)}"
+        matches = self.store.entries.setdefault('matches', {})
+        if key in matches:
+            return matches[key]
+
+        full_name = self._search(name, gender)
+        matches[key] = full_name
+        self.store.dirty = True
+        return full_name
+
+    def _search(self, name: str, gender: str) -> Optional[str]:
+        trigrams = name_trigrams(name)
+        shared = defaultdict(int)
+        for trigram in trigrams:
+            for candidate in self.trigram_index.get((gender, trigram), ()):
+                shared[candidate] += 1
+
+        # Meilleur score par équipe (nom complet)
+        scores = {}
+        for candidate, count in shared.items():
+            score = 2 * count / (len(trigrams) + len(self.name_trigrams[(gender, candidate)]))
+            full_name = self.alias_index.index[(gender, candidate)]
+            scores[full_name] = max(score, scores.get(full_name, 0.0))
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if not ranked or ranked[0][1] < self.threshold:
+            return None
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < self.AMBIGUITY_MARGIN:
+            logger.warning(f"Nom d'équipe ambigu '{name}' ({gender}) : {ranked[0][0]} / {ranked[1][0]}")
+            return None
+        return ranked[0][0]
+
+
+team_alias_index = TeamAliasIndex(TEAM_ALIASES_PATH)
+team_name_matches = JsonStore(TEAM_NAME_MATCHES_PATH)
+fuzzy_team_matcher = FuzzyTeamMatcher(team_alias_index, team_name_matches, TEAM_FUZZY_THRESHOLD)
+
+
+def is_name_in_aliases(name: str) -> bool:
+    """
+    Vérifie si un nom d'équipe est présent dans les alias définis pour les équipes.
+    """
+    if name in team_alias_index:
+        logger.debug(f"Nom trouvé dans les alias: {name}")
+        return True
+    logger.debug(f"Nom non trouvé dans les alias: {name}")
+    return False
+
+
 def get_full_team_name(name: str, gender: str) -> Optional[str]:
     """
     Récupère le nom complet de l'équipe correspondant au nom donné en tenant compte du genre.
     """
+    full_name = team_alias_index.get(name, gender)
+    if full_name:
+        logger.debug(f"Nom complet trouvé : {full_name} pour {name}")
+        return full_name
+
+    full_name = fuzzy_team_matcher.resolve(name, gender)
+    if full_name:
+        logger.debug(f"Nom complet approché : {full_name} pour {name} (alias à ajouter dans {TEAM_ALIASES_PATH})")
+        return full_name
 
-    name_normalized = remove_accents(name).upper()
-    logger.debug(f"Recherche du nom complet pour '{name_normalized}' avec genre '{gender}'")
-    
-    for team in team_aliases.get('teams', []):
-        if team.get('gender') == gender:
-            aliases_normalized = [remove_accents(alias).upper() for alias in team.get('aliases', [])]
-            if name_normalized in aliases_normalized:
-                logger.debug(f"Nom complet trouvé : {team['full']} pour {name_normalized}")
-                return team['full']
-    
     logger.warning(f"Aucun alias trouvé pour '{name}' avec le genre '{gender}'")
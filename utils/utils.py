@@ -1,7 +1,9 @@
 import json
 import re
+from collections import Counter
 from typing import Optional
 from config.logger_config import logger
+from utils.team_utils import remove_accents
 
 try:
     with open('config/mapping/standardized_divisions.json', 'r', encoding='utf-8') as f:
@@ -10,21 +12,52 @@ except Exception as e:
     logger.error(f"Erreur lors du chargement de 'standardized_divisions.json': {e}")
     standardized_divisions = {}
 
+def normalize_division_key(division_name: str) -> str:
+    """
+    Normalise un nom de division pour la recherche (casse, accents, espaces et ponctuation).
+    """
+    return ' '.join(re.sub(r'[^A-Z0-9]+', ' ', remove_accents(division_name).upper()).split())
+
+def build_division_index(divisions: dict) -> dict[str, dict]:
+    """
+    Construit l'index inversé variation normalisée -> {"division", "gender"}.
+    """
+    index = {}
+    for category, genders in divisions.items():
+        for gender, variations in genders.items():
+            for variation in variations:
+                key = normalize_division_key(variation)
+                existing = index.setdefault(key, {"division": category, "gender": gender})
+                if existing != {"division": category, "gender": gender}:
+                    logger.warning(f"Variation de division en conflit: '{variation}' ({category}, {gender}) déjà associée à {existing}")
+    return index
+
+division_index = build_division_index(standardized_divisions)
+unknown_divisions: Counter = Counter()
+
 def standardize_division_name(division_name: str) -> dict:
     """
     Standardise le nom d'une division en fonction des variations prédéfinies.
+    Les divisions inconnues sont comptées et signalées par `report_unknown_divisions`.
     """
     try:
-        for category, genders in standardized_divisions.items():
-            for gender, variations in genders.items():
-                if division_name in variations:
-                    logger.debug(f"Division standardisée trouvée: {division_name} -> {category}, Genre: {gender}")
-                    return {"division": category, "gender": gender}
-        logger.debug(f"Division non standardisée: {division_name}")
+        standardized = division_index.get(normalize_division_key(division_name))
+        if standardized:
+            return dict(standardized)
+        unknown_divisions[division_name.strip()] += 1
         return {"division": division_name.strip(), "gender": None}
     except Exception as e:
         logger.error(f"[standardize_division_name] Erreur lors de la standardisation de '{division_name}': {e}")
         raise 
+
+def report_unknown_divisions() -> None:
+    """
+    Journalise une seule fois par exécution les divisions non standardisées, puis remet le compteur à zéro.
+    """
+    if unknown_divisions:
+        details = ', '.join(f"{name} ({count})" for name, count in unknown_divisions.most_common())
+        logger.info(f"{len(unknown_divisions)} division(s) non standardisée(s): {details}")
+        unknown_divisions.clear()
     
 def parse_season(season_str: str) -> int:
     """
@@ -0,0 +1,230 @@
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import replace
+from typing import Awaitable, Callable, Iterable, Optional
+from config.env_config import WORLD_STATE_PATH, WORLD_STATE_RECONCILE_INTERVAL
+from config.logger_config import logger
+from models.match import Match
+from models.pool import Pool
+from models.team import Team
+from utils.handlers.api_handler import convert_to_dataclass
+
+ENTITY_TYPES = {"pool": Pool, "team": Team, "match": Match}
+POOL_CONTENT_SCOPES = {"team": "teams", "match": "matches"}
+
+
+def scope_of(kind: str, entity) -> str:
+    """
+    Périmètre de chargement d'une entité : pools d'une ligue et d'une saison,
+    équipes ou matchs d'une pool.
+    """
+    if kind == "pool":
+        return f"pools:{entity.league_code}:{entity.season}"
+    return f"{POOL_CONTENT_SCOPES[kind]}:{entity.pool_id}"
+
+
+class WorldState:
+    """
+    État résident des pools, équipes et matchs, indexé par périmètre de chargement.
+
+    Un périmètre (`pools:<ligue>:<saison>`, `teams:<pool>`, `matches:<pool>`) est chargé
+    depuis l'API à la première lecture, puis servi depuis la mémoire. Les écritures
+    acceptées par l'API y sont reportées (`put`, `deactivate`) depuis la couche `api/*`.
+    Chaque périmètre est rechargé et rapproché de l'API toutes les
+    WORLD_STATE_RECONCILE_INTERVAL secondes, pour corriger les écarts dus aux
+    modifications faites hors du scraper. Les entités écrites pendant un chargement sont
+    plus récentes que sa réponse : elles sont conservées telles quelles.
+
+    L'état est enregistré dans un instantané SQLite (`save`) et rechargé au démarrage :
+    un redémarrage repart des données connues. Seules les entités et périmètres modifiés
+    depuis le dernier enregistrement y sont écrits, hors de la boucle asyncio.
+    """
+    def __init__(self, path: str, reconcile_interval: float = WORLD_STATE_RECONCILE_INTERVAL):
+        self.path = path
+        self.reconcile_interval = reconcile_interval
+        self.clear()
+        self._load()
+
+    def clear(self) -> None:
+        """
+        Vide l'état résident : chaque périmètre sera rechargé depuis l'API.
+        """
+        self.entities: dict[str, dict[int, object]] = {kind: {} for kind in ENTITY_TYPES}
+        self.index: dict[str, set[int]] = {}     # Ids des entités de chaque périmètre
+        self.loaded_at: dict[str, float] = {}    # Dernier chargement depuis l'API, par périmètre
+        self.loading: dict[str, list[set[int]]] = {}  # Ids écrits pendant chaque chargement en cours, par périmètre
+        self._reset_changes()
+        self.save_lock = asyncio.Lock()
+
+    def _reset_changes(self) -> None:
+        # Modifications à reporter dans l'instantané au prochain `save`
+        self.changed: dict[str, set[int]] = {kind: set() for kind in ENTITY_TYPES}
+        self.removed: dict[str, set[int]] = {kind: set() for kind in ENTITY_TYPES}
+        self.changed_scopes: set[str] = set()
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.changed_scopes) or any(self.changed.values()) or any(self.removed.values())
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with closing(sqlite3.connect(self.path)) as connection:
+                entities = connection.execute("SELECT kind, data FROM entities").fetchall()
+                scopes = connection.execute("SELECT scope, loaded_at FROM scopes").fetchall()
+            for kind, data in entities:
+                self._store(kind, convert_to_dataclass(json.loads(data), ENTITY_TYPES[kind]))
+            self.loaded_at = dict(scopes)
+        except Exception as e:
+            logger.warning(f"Instantané {self.path} illisible, démarrage à froid : {e}")
+            self.clear()
+            return
+        self._reset_changes()
+        logger.debug(f"État résident chargé : {sum(map(len, self.entities.values()))} entités")
+
+    async def save(self) -> None:
+        """
+        Reporte dans l'instantané SQLite les entités et périmètres modifiés depuis le dernier
+        enregistrement. L'écriture a lieu dans un thread, sur une copie des lignes modifiées.
+        """
+        async with self.save_lock:
+            if not self.dirty:
+                return
+            changed, removed, changed_scopes = self.changed, self.removed, self.changed_scopes
+            self._reset_changes()
+            upserts = [
+                (kind, entity_id, json.dumps(self.entities[kind][entity_id].to_dict()))
+                for kind, ids in changed.items() for entity_id in ids if entity_id in self.entities[kind]
+            ]
+            deletes = [(kind, entity_id) for kind, ids in removed.items() for entity_id in ids]
+            scopes = [(scope, self.loaded_at[scope]) for scope in changed_scopes if scope in self.loaded_at]
+            try:
+                await asyncio.to_thread(self._write, upserts, deletes, scopes)
+            except Exception:
+                # Modifications reprises au prochain enregistrement
+                for kind in ENTITY_TYPES:
+                    self.changed[kind] |= changed[kind] - self.removed[kind]
+                    self.removed[kind] |= removed[kind] - self.changed[kind]
+                self.changed_scopes |= changed_scopes
+                raise
+            logger.debug(f"{self.path} sauvegardé: {len(upserts)} entités écrites, {len(deletes)} supprimées")
+
+    def _write(self, upserts: list[tuple], deletes: list[tuple], scopes: list[tuple]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS entities (kind TEXT, id INTEGER, data TEXT, PRIMARY KEY (kind, id))")
+            connection.execute("CREATE TABLE IF NOT EXISTS scopes (scope TEXT PRIMARY KEY, loaded_at REAL)")
+            connection.executemany("INSERT OR REPLACE INTO entities VALUES (?, ?, ?)", upserts)
+            connection.executemany("DELETE FROM entities WHERE kind = ? AND id = ?", deletes)
+            connection.executemany("INSERT OR REPLACE INTO scopes VALUES (?, ?)", scopes)
+
+    def _store(self, kind: str, entity) -> None:
+        previous = self.entities[kind].get(entity.id)
+        if previous is not None and scope_of(kind, previous) != scope_of(kind, entity):
+            self.index.get(scope_of(kind, previous), set()).discard(entity.id)
+        self.entities[kind][entity.id] = entity
+        self.index.setdefault(scope_of(kind, entity), set()).add(entity.id)
+        self.changed[kind].add(entity.id)
+        self.removed[kind].discard(entity.id)
+
+    def _written(self, kind: str, entity) -> None:
+        for written in self.loading.get(scope_of(kind, entity), ()):
+            written.add(entity.id)
+
+    def put(self, kind: str, entity) -> None:
+        """
+        Reporte une entité enregistrée par l'API.
+        """
+        if entity is None or not entity.id:
+            return
+        self._store(kind, copy.copy(entity))
+        self._written(kind, entity)
+
+    def deactivate(self, kind: str, ids: Iterable[int], errors: Optional[Iterable] = None) -> None:
+        """
+        Reporte les désactivations réussies (`errors` : résultat d'un `bulk_deactivate_*`).
+        """
+        errors = errors if errors is not None else [None for _ in ids]
+        for entity_id, error in zip(ids, errors):
+            entity = self.entities[kind].get(entity_id)
+            if entity is not None and not error:
+                self.entities[kind][entity_id] = replace(entity, active=False)
+                self.changed[kind].add(entity_id)
+                self._written(kind, entity)
+
+    async def load(self, kind: str, scope: str, loader: Callable[[], Awaitable[Optional[list]]]) -> list:
+        """
+        Entités d'un périmètre, depuis la mémoire ou depuis l'API (`loader`) si le périmètre
+        n'a pas été chargé depuis WORLD_STATE_RECONCILE_INTERVAL secondes.
+        Les entités retournées sont des copies, modifiables par l'appelant.
+        """
+        if time.time() - self.loaded_at.get(scope, 0) >= self.reconcile_interval:
+            written: set[int] = set()
+            self.loading.setdefault(scope, []).append(written)
+            try:
+                fetched = await loader() or []
+            finally:
+                loads = [other for other in self.loading.get(scope, ()) if other is not written]
+                if loads:
+                    self.loading[scope] = loads
+                else:
+                    self.loading.pop(scope, None)
+            self.reconcile(kind, scope, fetched, keep=written)
+        entities = self.entities[kind]
+        return [copy.copy(entities[entity_id]) for entity_id in sorted(self.index.get(scope, ())) if entity_id in entities]
+
+    def reconcile(self, kind: str, scope: str, fetched: list, keep: Iterable[int] = ()) -> int:
+        """
+        Remplace le contenu d'un périmètre par la réponse de l'API, sauf les entités `keep`
+        (écrites après l'envoi de la requête). Retourne le nombre d'écarts corrigés.
+        """
+        keep = set(keep)
+        resident = {
+            entity_id: self.entities[kind][entity_id]
+            for entity_id in self.index.get(scope, ()) if entity_id in self.entities[kind] and entity_id not in keep
+        }
+        fetched = {entity.id: entity for entity in fetched if entity.id and entity.id not in keep}
+        gaps = len(resident.keys() ^ fetched.keys()) + sum(
+            1 for entity_id, entity in fetched.items()
+            if entity_id in resident and resident[entity_id].to_dict() != entity.to_dict()
+        )
+
+        for entity_id in resident.keys() - fetched.keys():
+            del self.entities[kind][entity_id]
+            self.changed[kind].discard(entity_id)
+            self.removed[kind].add(entity_id)
+        self.index[scope] = {entity_id for entity_id in self.index.get(scope, ()) if entity_id in keep}
+        for entity_id, entity in fetched.items():
+            if entity_id in resident and resident[entity_id].to_dict() == entity.to_dict():
+                # Entité inchangée : rien à écrire dans l'instantané
+                self.index[scope].add(entity_id)
+            else:
+                self._store(kind, entity)
+        if scope in self.loaded_at and gaps:
+            logger.info(f"État résident : {gaps} écarts corrigés pour {scope}")
+        # Sans écart, la date de chargement n'est pas réécrite : après un redémarrage,
+        # le périmètre est au pire rechargé plus tôt
+        if scope not in self.loaded_at or gaps:
+            self.changed_scopes.add(scope)
+        self.loaded_at[scope] = time.time()
+        return gaps
+
+    async def pools(self, league_code: str, season: int, loader: Callable[[], Awaitable[Optional[list[Pool]]]]) -> list[Pool]:
+        return await self.load("pool", f"pools:{league_code}:{season}", loader)
+
+    async def teams(self, pool_id: int, loader: Callable[[], Awaitable[Optional[list[Team]]]]) -> list[Team]:
+        return await self.load("team", f"teams:{pool_id}", loader)
+
+    async def matches(self, pool_id: int, loader: Callable[[], Awaitable[Optional[list[Match]]]]) -> list[Match]:
+        return await self.load("match", f"matches:{pool_id}", loader)
+
+
+world_state = WorldState(WORLD_STATE_PATH)